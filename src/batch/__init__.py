@@ -0,0 +1,3 @@
+from src.batch.batch_runner import BatchRunner
+from src.batch.batch_runner import read_manifest
+from src.batch.batch_runner import run_job
@@ -0,0 +1,132 @@
+import json, os, time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from src.common import basis_set_library
+from src.common import logger
+
+
+class BatchRunner:
+    """Runs a manifest of independent calculations concurrently on a fixed number of worker processes.
+
+    Each job has a core budget, its 'processes', which sizes the two electron integral pool inside it. Jobs are
+    started in manifest order while a worker is idle and their budget fits in the free cores, later jobs that fit
+    going ahead of one that does not. The workers are reused from job to job, so the basis set files parsed here
+    before they start, and any file a worker parses, are parsed once per batch rather than once per job. With a
+    cache directory the parsed basis sets, tuned integral engines and two electron integrals are also shared
+    through the disk. One record with the energy or error of each job is appended to the results file of the logger
+    as it finishes.
+
+    Attributes
+    ----------
+    workers : int
+    cores : int
+        The total core budget of the jobs running at the same time.
+    cache_directory : {None, str}
+
+    """
+    def __init__(self, workers, cores=None, cache_directory=None):
+        self.workers = workers
+        self.cores = cores or os.cpu_count() or 1
+        self.cache_directory = cache_directory
+
+    def run(self, jobs):
+        """Runs every job.
+
+        Parameters
+        ----------
+        jobs : List[Dict[str, object]]
+            The 'mol_file', 'basis_file' and 'method' of each job with its optional 'processes' and 'options', the
+            keyword arguments of start.
+
+        Returns
+        -------
+        records : List[Dict[str, object]]
+            The record of each job in the order given.
+
+        """
+        for basis_file in set(job['basis_file'] for job in jobs):
+            try:
+                basis_set_library.shells(basis_file)
+            except OSError:
+                pass  # reported by the job
+
+        records = [None] * len(jobs)
+        pending = list(range(len(jobs)))
+        running = {}
+        free_cores = self.cores
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            while pending or running:
+                for index in list(pending):
+                    budget = min(jobs[index].get('processes', 1), self.cores)
+                    if len(running) < self.workers and budget <= free_cores:
+                        future = executor.submit(run_job, jobs[index], budget, self.cache_directory)
+                        running[future] = index, budget
+                        free_cores -= budget
+                        pending.remove(index)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, budget = running.pop(future)
+                    free_cores += budget
+                    records[index] = dict(job=index, **future.result())
+                    logger.record('job', **records[index])
+                    logger.log('JOB {}: {}', index, records[index].get('energy', records[index].get('error')))
+
+        return records
+
+
+def run_job(job, processes, cache_directory=None):
+    """Runs a job of a manifest with the output silenced.
+
+    Parameters
+    ----------
+    job : Dict[str, object]
+    processes : int
+    cache_directory : {None, str}
+
+    Returns
+    -------
+    : Dict[str, object]
+        The files, method, processes and seconds of the job with its energy, or the error it raised.
+
+    """
+    from src.main import start  # src.main imports this module for its command line
+
+    options = dict(job.get('options', {}))
+    if cache_directory is not None:
+        options.setdefault('cache_directory', cache_directory)
+    method = job['method'] if isinstance(job['method'], str) else tuple(job['method'])
+    record = {
+        'mol_file': job['mol_file'], 'basis_file': job['basis_file'], 'method': method, 'processes': processes
+    }
+
+    results_file, logger.results_file = logger.results_file, None
+    start_time = time.perf_counter()
+    try:
+        with logger.quiet():
+            record['energy'] = start(job['mol_file'], job['basis_file'], method, processes, **options)
+    except Exception as error:
+        record['error'] = '{}: {}'.format(type(error).__name__, error)
+    finally:
+        logger.results_file = results_file
+    record['seconds'] = time.perf_counter() - start_time
+    return record
+
+
+def read_manifest(manifest_file):
+    """Reads the jobs of a manifest, a json list of jobs or a file of one json job on each line.
+
+    Parameters
+    ----------
+    manifest_file : str
+
+    Returns
+    -------
+    : List[Dict[str, object]]
+
+    """
+    with open(manifest_file, 'r') as file:
+        text = file.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
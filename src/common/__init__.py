@@ -16,8 +16,16 @@ from src.common.vector_manipulation import rho
 from src.common.vector_manipulation import theta
 from src.common.vector_manipulation import phi
 from src.common.vector_manipulation import gaussian_product_coordinate
+from src.common.double_factorial import double_factorial
+from src.common.basis_set_library import BasisSetLibrary
+from src.common.basis_set_library import basis_set_library
 from src.common.file_input import read_basis_set_file
 from src.common.file_input import read_mol_file
 from src.common.nuclear_repulsion import coulomb_matrix
+from src.common.nuclear_repulsion import coulomb_gradient
 from src.common.symmetry import Symmetry
 from src.common.indices import Indices
+from src.common.instrumentation import Instrumentation
+from src.common.instrumentation import instrumentation
+from src.common.logger import Logger
+from src.common.logger import logger
@@ -0,0 +1,145 @@
+import hashlib, os, pickle
+from src.factory.primitive_basis_factory import expand_basis_set
+from src.objects import BasisSet
+
+
+class BasisSetLibrary:
+    """Parses each gaussian basis set file once into the shells of every element it contains.
+
+    The parsed shells are memoised in process and, if a cache directory is given, pickled to disk so later runs can
+    skip the parsing too. Both caches are keyed by the path and modification time of the file, so an edited file is
+    parsed again. Creating the basis set of a geometry only places copies of the cached shells on the nuclei.
+
+    Attributes
+    ----------
+    cache_directory : {None, str}
+    shells_memo : Dict[str, Tuple[float, Dict[str, List]]]
+        The modification time and shells of every file parsed so far.
+
+    """
+    def __init__(self, cache_directory=None):
+        self.cache_directory = cache_directory
+        self.shells_memo = {}
+
+    def create(self, file_input_basis, nuclei_array):
+        """Creates the basis set of a list of nuclei.
+
+        Parameters
+        ----------
+        file_input_basis : str
+        nuclei_array : List[Nuclei]
+
+        Returns
+        -------
+        : BasisSet
+
+        """
+        shells = self.shells(file_input_basis)
+        basis_array = []
+        for nuclei in nuclei_array:
+            basis_array += expand_basis_set(shells[nuclei.element], nuclei.coordinates)
+        return BasisSet(basis_array)
+
+    def shells(self, file_input_basis):
+        """Returns the shells of every element in a basis set file, parsing the file only if it is not cached.
+
+        Parameters
+        ----------
+        file_input_basis : str
+
+        Returns
+        -------
+        shells : Dict[str, List]
+            The shells of each element in the form taken by expand_basis_set.
+
+        """
+        path = basis_set_path(file_input_basis)
+        modified_time = os.path.getmtime(path)
+
+        if path in self.shells_memo and self.shells_memo[path][0] == modified_time:
+            return self.shells_memo[path][1]
+
+        shells = self.load_cache(path, modified_time)
+        if shells is None:
+            shells = parse_basis_set_file(path)
+            self.save_cache(path, modified_time, shells)
+
+        self.shells_memo[path] = (modified_time, shells)
+        return shells
+
+    def cache_file(self, path):
+        key = hashlib.sha1(path.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_directory, os.path.basename(path) + '.' + key + '.pickle')
+
+    def load_cache(self, path, modified_time):
+        if self.cache_directory is None or not os.path.isfile(self.cache_file(path)):
+            return None
+        with open(self.cache_file(path), 'rb') as file:
+            cached_time, shells = pickle.load(file)
+        if cached_time != modified_time:
+            return None
+        return shells
+
+    def save_cache(self, path, modified_time, shells):
+        if self.cache_directory is None:
+            return
+        os.makedirs(self.cache_directory, exist_ok=True)
+        temporary_file = self.cache_file(path) + '.' + str(os.getpid())
+        with open(temporary_file, 'wb') as file:
+            pickle.dump((modified_time, shells), file)
+        os.replace(temporary_file, self.cache_file(path))
+
+
+def basis_set_path(file_input_basis):
+    """Returns the absolute path of a file in the basissets directory.
+
+    Parameters
+    ----------
+    file_input_basis : str
+
+    Returns
+    -------
+    : str
+
+    """
+    return os.path.realpath(os.path.dirname(os.path.realpath(__file__)) + '/../../basissets/' + file_input_basis)
+
+
+def parse_basis_set_file(path):
+    """Parses a GAMESS-UK formatted gaussian basis set file.
+
+    Every element starts at a '# ELEMENT' comment and ends at the next comment. A line starting with a letter starts a
+    new shell and every other line holds the contraction coefficients and exponent of one primitive. Fortran style
+    exponents such as 0.1D+01 are read as floats.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    shells : Dict[str, List]
+        The shells of each element, e.g. {'HYDROGEN': [['S', [0.15432897, 3.42525091], ...]]}.
+
+    """
+    shells = {}
+    element = None
+    with open(path, 'r') as file:
+        for line in file:
+            words = line.split()
+            if len(words) == 0:
+                continue
+            if line.startswith('#'):
+                element = None
+                if len(words) == 2 and words[1].isalpha() and words[1].isupper() and words[1] not in shells:
+                    element = words[1]
+                    shells[element] = []
+            elif element is not None:
+                if words[0][0].isalpha():
+                    shells[element].append([words[0][0]])
+                else:
+                    shells[element][-1].append([float(word.replace('D', 'E')) for word in words])
+    return shells
+
+
+basis_set_library = BasisSetLibrary()
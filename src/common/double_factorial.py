@@ -0,0 +1,17 @@
+def double_factorial(n):
+    """Returns n!! = n (n - 2) (n - 4) ... down to 1 or 2.
+
+    Parameters
+    ----------
+    n : int
+        Taken as -1 or greater, with (-1)!! = 0!! = 1 as in the normalisation of s type gaussians.
+
+    Returns
+    -------
+    ans : int
+
+    """
+    ans = 1
+    for k in range(n, 1, -2):
+        ans *= k
+    return ans
@@ -1,11 +1,13 @@
-import os, re
-from src.factory.primitive_basis_factory import expand_basis_set
+import os
+from src.common.basis_set_library import basis_set_library
 from src.objects import Nuclei
 
 
 def read_basis_set_file(file_input_basis, nuclei_array):
     """Reads a GAMESS-UK formatted gaussian basis set file using a list of nuclei objects.
 
+    The file is parsed once by the shared basis set library and later calls only place the cached shells on the nuclei.
+
     Parameters
     ----------
     file_input_basis : str
@@ -13,45 +15,15 @@ def read_basis_set_file(file_input_basis, nuclei_array):
 
     Returns
     -------
-    basis_array : List[Basis]
+    : BasisSet
 
     See Also
     --------
     expand_basis_set : function for expanding L, P, D and higher functions
+    BasisSetLibrary : parses and caches the basis set files
 
     """
-    file_input_basis = os.path.dirname(os.path.realpath(__file__)) + '/../../basissets/' + file_input_basis
-    basis_array = []
-    for a in range(len(nuclei_array)):
-        file = open(file_input_basis, 'r')
-        lines = file.read().replace('\n', ':')
-        file.close()
-
-        regex = nuclei_array[a].element + '.*?#'  # e.g. regex = CARBON.*?#
-        lines = ' '.join(lines.split()) + '#'  # remove whitespace and add '#' for last element
-        lines = re.search(regex, lines).group(0)  # return string from regex
-        lines = re.split(':', lines.replace(': ', ':'))  # create list from colon separated string
-        lines = lines[1:len(lines) - 2]
-
-        i = 0
-        input1 = input2 = []
-        for line in lines:
-            if any(letter in line for letter in ('S', 'L', 'P', 'D')):
-                if i == 1:
-                    input1.append(input2)
-                    input2 = [line[0]]
-                else:
-                    i = 1
-                    input2 = [line[0]]
-            else:
-                input2.append([float(b) for b in line.split()])
-        input1.append(input2)
-
-        # basis set file data is now in a more convenient form for expand_basis_set to process
-        basis_array_from_fact = expand_basis_set(input1, nuclei_array[a].coordinates)
-        basis_array += basis_array_from_fact
-
-    return basis_array
+    return basis_set_library.create(file_input_basis, nuclei_array)
 
 
 def read_mol_file(file_input_mol):
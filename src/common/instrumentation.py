@@ -0,0 +1,163 @@
+import csv, json, time
+
+
+class Instrumentation:
+    """Collects nested stage timers and event counters of a calculation and writes them out at the end of a run.
+
+    Timers are keyed by the path of the timers they are nested in, e.g. 'calculation/hartree_fock/two_electron', and
+    record the total seconds and the number of times they ran. Counters are totals keyed by name. Timers always
+    measure their stage so it can be printed, but nothing is recorded unless enabled. Hot code should check enabled
+    before calling count so a disabled run pays for a single attribute lookup. Worker processes count in their own
+    copy of the instrumentation, so work sent to a pool goes through starmap, which adds the counters of the workers to
+    these. The timers of the workers are not kept.
+
+    Attributes
+    ----------
+    enabled : bool
+    timers : Dict[str, Dict[str, float]]
+        The seconds and calls of each timer path.
+    counters : Dict[str, int]
+    stack : List[str]
+        The names of the running timers.
+
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timers = {}
+        self.counters = {}
+        self.stack = []
+
+    def timer(self, name):
+        """Returns a context manager timing a stage nested in the running timers.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        : Timer
+
+        """
+        return Timer(self, name)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, counters):
+        for name, amount in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def starmap(self, pool, function, arguments, chunks=64):
+        """Calls a function on each tuple of arguments in the worker processes of a pool, adding the counters of the
+        calls to these.
+
+        Parameters
+        ----------
+        pool : {multiprocessing.Pool, concurrent.futures.Executor}
+        function : Callable
+        arguments : List[Tuple]
+        chunks : int
+            The number of tasks the calls are split into.
+
+        Returns
+        -------
+        : List[object]
+            The result of each call in the order given.
+
+        """
+        arguments = list(arguments)
+        size = max(1, -(-len(arguments) // chunks))
+        tasks = [(function, self.enabled, arguments[i:i + size]) for i in range(0, len(arguments), size)]
+        if hasattr(pool, 'starmap'):
+            results = pool.starmap(counted_calls, tasks)
+        else:
+            results = pool.map(counted_calls, *zip(*tasks)) if tasks else []
+        values = []
+        for chunk_values, counters in results:
+            values.extend(chunk_values)
+            self.merge(counters)
+        return values
+
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+        self.stack = []
+
+    def report(self):
+        return {'timers': self.timers, 'counters': self.counters}
+
+    def write(self, file_name):
+        """Writes the timers and counters to a json file, or a csv file if the name ends in '.csv'.
+
+        The csv file has one row of kind, name, calls and value for each timer and counter, the value being the
+        seconds of a timer.
+
+        Parameters
+        ----------
+        file_name : str
+
+        """
+        with open(file_name, 'w', newline='') as file:
+            if not file_name.endswith('.csv'):
+                json.dump(self.report(), file, indent=1, sort_keys=True)
+                return
+            writer = csv.writer(file)
+            writer.writerow(['kind', 'name', 'calls', 'value'])
+            for name, timer in sorted(self.timers.items()):
+                writer.writerow(['timer', name, timer['calls'], timer['seconds']])
+            for name, value in sorted(self.counters.items()):
+                writer.writerow(['counter', name, '', value])
+
+
+class Timer:
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.path = None
+        self.start = None
+        self.seconds = 0.0
+
+    def __enter__(self):
+        if self.instrumentation.enabled:
+            self.instrumentation.stack.append(self.name)
+            self.path = '/'.join(self.instrumentation.stack)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        self.seconds = time.perf_counter() - self.start
+        if self.path is not None:
+            self.instrumentation.stack.pop()
+            timer = self.instrumentation.timers.setdefault(self.path, {'seconds': 0.0, 'calls': 0})
+            timer['seconds'] += self.seconds
+            timer['calls'] += 1
+        return False
+
+
+def counted_calls(function, enabled, arguments):
+    """Calls a function on each tuple of arguments in a worker process, returning the results with the counters of
+    the calls.
+
+    Parameters
+    ----------
+    function : Callable
+    enabled : bool
+        Whether the instrumentation of the parent process is enabled.
+    arguments : List[Tuple]
+
+    Returns
+    -------
+    values : List[object]
+    counters : Dict[str, int]
+
+    """
+    instrumentation.enabled = enabled
+    instrumentation.reset()
+    values = [function(*argument) for argument in arguments]
+    return values, instrumentation.counters
+
+
+instrumentation = Instrumentation()
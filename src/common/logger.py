@@ -0,0 +1,84 @@
+import json, sys
+from contextlib import contextmanager
+import numpy as np
+
+QUIET = 0
+SUMMARY = 1
+DEBUG = 2
+
+
+class Logger:
+    """Prints the progress of a calculation at a level of verbosity and streams its results as json lines.
+
+    Messages are only formatted if they are printed, so arrays passed as arguments cost nothing at a lower verbosity.
+    Full matrices are printed at DEBUG, and only then with numpy's summarisation of large arrays turned off. Each
+    result is appended to the results file as one json object on its own line as soon as it is known, so a batch
+    of runs can be read back without parsing the printed text.
+
+    Attributes
+    ----------
+    verbosity : int
+        QUIET, SUMMARY or DEBUG.
+    results_file : {None, str}
+        No results are written if None.
+
+    """
+    def __init__(self, verbosity=SUMMARY, results_file=None):
+        self.verbosity = verbosity
+        self.results_file = results_file
+
+    def log(self, message, *arguments, level=SUMMARY):
+        """Prints a message at a level of verbosity, formatting the arguments into it only if it is printed.
+
+        Parameters
+        ----------
+        message : str
+        arguments : object
+        level : int
+
+        """
+        if self.verbosity >= level:
+            print(message.format(*arguments) if arguments else message)
+
+    def separator(self, newline=True, level=SUMMARY):
+        self.log(('\n' if newline else '') + '*' * 97, level=level)
+
+    def matrix(self, title, matrix, level=DEBUG):
+        if self.verbosity >= level:
+            with np.printoptions(linewidth=100000, threshold=sys.maxsize):
+                print('\n{}\n{}'.format(title, matrix))
+
+    @contextmanager
+    def quiet(self):
+        """Silences the printed output inside the context, leaving the results file as it is."""
+        verbosity = self.verbosity
+        self.verbosity = QUIET
+        try:
+            yield
+        finally:
+            self.verbosity = verbosity
+
+    def record(self, kind, **fields):
+        """Appends a result to the results file as a json line.
+
+        Parameters
+        ----------
+        kind : str
+            Stored under 'record', e.g. 'scf' or 'energy'.
+        fields : object
+            Numpy arrays and scalars are stored as lists and numbers.
+
+        """
+        if self.results_file is None:
+            return
+        with open(self.results_file, 'a') as file:
+            file.write(json.dumps(dict(record=kind, **fields), default=json_default) + '\n')
+
+
+def json_default(value):
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError('{} is not json serializable'.format(type(value).__name__))
+
+
+logger = Logger()
@@ -39,3 +39,26 @@ def coulombs_law(nuc1, nuc2):
     r_12 = coordinate_distance(nuc1.coordinates, nuc2.coordinates)
     ans = (nuc1.charge * nuc2.charge) / r_12
     return ans
+
+
+def coulomb_gradient(nuclei_array):
+    """Computes the gradient of the nuclear-nuclear repulsion energy with respect to the nuclear coordinates.
+
+    Parameters
+    ----------
+    nuclei_array : List[Nuclei]
+
+    Returns
+    -------
+    gradient : np.array
+        One row of x, y and z derivatives for each nuclei.
+
+    """
+    gradient = np.zeros((len(nuclei_array), 3))
+    for i, nuc1 in enumerate(nuclei_array):
+        for j, nuc2 in enumerate(nuclei_array):
+            if i != j:
+                r_12 = coordinate_distance(nuc1.coordinates, nuc2.coordinates)
+                displacement = np.array(nuc1.coordinates) - np.array(nuc2.coordinates)
+                gradient[i] -= nuc1.charge * nuc2.charge * displacement / r_12**3
+    return gradient
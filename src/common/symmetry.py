@@ -1,7 +1,8 @@
-import copy
+import itertools
 import numpy as np
 from src.common import coordinate_distance
 from src.common import vector_add
+from src.objects import Basis
 from src.objects import ImproperRotationSymmetry
 from src.objects import RotationSymmetry
 
@@ -14,6 +15,8 @@ class Symmetry:
         self.symmetry_objects = self.symmetry_object_list()
         self.int_operate_dict = self.symmetry_exponent_dict()
         self.symmetry_matrix = self.basis_set_symmetry_matrix()
+        self.permutation_table = self.symmetry_matrix[1:, 1:].astype(int)
+        self.parity_table = self.parity_change_table()
 
     def none_zero_integral(self, index):
 
@@ -54,6 +57,63 @@ class Symmetry:
 
         return True
 
+    def none_zero_integrals(self, quartets):
+        """Returns which quartets are not zero by symmetry, the same as none_zero_integral for each quartet.
+
+        Parameters
+        ----------
+        quartets : np.array
+            One row (i, j, k, l) for each quartet.
+
+        Returns
+        -------
+        : np.array
+            A boolean for each quartet.
+
+        """
+        quartets = np.asarray(quartets, dtype=int)
+        if self.point_group.label == 'C_{1}' or len(quartets) == 0:
+            return np.ones(len(quartets), dtype=bool)
+
+        i, j, k, l = quartets.T
+        parities = np.array([basis.integral_exponents for basis in self.basis_set], dtype=int) % 2
+        parity = (parities[i] + parities[j] + parities[k] + parities[l]) % 2
+        parity = parity @ np.array([4, 2, 1])
+
+        centres = {}
+        centre_index = np.array([
+            centres.setdefault(tuple(basis.coordinates), len(centres)) for basis in self.basis_set
+        ])
+        one_centre = (centre_index[i] == centre_index[j]) & (centre_index[j] == centre_index[k]) \
+        & (centre_index[k] == centre_index[l])
+
+        zero = np.zeros(len(quartets), dtype=bool)
+        images = np.abs(self.permutation_table) - 1
+        for m in range(self.permutation_table.shape[1]):
+            w, x, y, z = images[i, m], images[j, m], images[k, m], images[l, m]
+            found = (self.permutation_table[i, m] != 0) & (self.permutation_table[j, m] != 0) \
+            & (self.permutation_table[k, m] != 0) & (self.permutation_table[l, m] != 0)
+            bra = ((i == w) & (j == x)) | ((i == x) & (j == w))
+            ket = ((k == y) & (l == z)) | ((k == z) & (l == y))
+            zero |= found & bra & ket & self.parity_table[m, parity]
+
+        return np.where(one_centre, parity == 0, ~zero)
+
+    def parity_change_table(self):
+        """Creates the table of whether each symmetry operation changes the sign of a product of functions with each
+        parity of integral exponents, the parity (x, y, z) at index 4x + 2y + z.
+
+        Returns
+        -------
+        : np.array
+
+        """
+        table = [
+            [parity != self.int_operate_dict[(m, parity)] for parity in itertools.product((0, 1), repeat=3)]
+            for m in range(1, len(self.symmetry_objects))
+        ]
+        return np.array(table, dtype=bool).reshape(-1, 8)
+
     def symmetry_exponent_dict(self):
         operate_dict = {}
         for i in range(1, len(self.symmetry_objects)):
@@ -132,9 +192,10 @@ class Symmetry:
         return rotation_operations
 
     def symmetry_operation_index(self, symmetry_operation, basis):
-        basis_i = copy.deepcopy(basis)
-        basis_i.coordinates = symmetry_operation.operate(basis.coordinates)
-        basis_i.integral_exponents = symmetry_operation.int_operate(basis_i.integral_exponents)
+        basis_i = Basis(
+            basis.primitive_gaussian_array, symmetry_operation.operate(basis.coordinates),
+            symmetry_operation.int_operate(basis.integral_exponents)
+        )
 
         i = k = 0
         for j, basis_j in enumerate(self.basis_set):
@@ -183,6 +244,111 @@ class Symmetry:
                 return False
         return True
 
+    def symmetry_adapted_basis(self):
+        """Creates the symmetry adapted linear combinations of the basis functions for the irreducible representations
+        of the largest subgroup of D_{2h} found among the symmetry operations.
+
+        Only the operations that send each of x, y and z to plus or minus itself are used, so the point group must be
+        in its standard orientation. Each of these operations sends a basis function to plus or minus another, given by
+        the symmetry_matrix and the parity of the integral exponents, and the combinations of each irreducible
+        representation are the range of its projection operator.
+
+        Returns
+        -------
+        salc : np.array
+            The orthonormal combinations as columns, grouped by irreducible representation.
+        irreps : List[Tuple[str, slice]]
+            The characters of the generators and the columns of each irreducible representation, the totally
+            symmetric first.
+
+        """
+        size = len(self.basis_set)
+        generators = []
+        # each element of the subgroup, keyed by the signs it gives x, y and z, holds its matrix on the basis set and
+        # how many times, 0 or 1, each generator appears in it
+        group = {(1, 1, 1): (np.identity(size), ())}
+        for m in range(1, len(self.symmetry_objects)):
+            signs = self.axis_signs(self.symmetry_objects[m])
+            if signs is None or signs in group or any(self.symmetry_matrix.item(i + 1, m) == 0 for i in range(size)):
+                continue
+            representation = np.zeros((size, size))
+            for i, basis in enumerate(self.basis_set):
+                j = abs(self.symmetry_matrix.item(i + 1, m)) - 1
+                x, y, z = basis.integral_exponents
+                representation.itemset((j, i), signs[0]**x * signs[1]**y * signs[2]**z)
+            generators.append(self.symmetry_objects[m].symmetry_operation)
+            new_group = {key: (matrix, powers + (0,)) for key, (matrix, powers) in group.items()}
+            for key, (matrix, powers) in group.items():
+                new_group[tuple(a * b for a, b in zip(signs, key))] = (representation @ matrix, powers + (1,))
+            group = new_group
+
+        columns = []
+        irreps = []
+        for characters in itertools.product((1, -1), repeat=len(generators)):
+            projection = np.zeros((size, size))
+            for matrix, powers in group.values():
+                projection += np.prod([c**p for c, p in zip(characters, powers)]) * matrix
+            eigenvalues, eigenvectors = np.linalg.eigh(projection / len(group))
+            irrep_columns = eigenvectors[:, eigenvalues > 0.5]
+            label = ' '.join('{}:{:+d}'.format(operation, c) for operation, c in zip(generators, characters))
+            irreps.append((label or 'A', slice(len(columns), len(columns) + irrep_columns.shape[1])))
+            columns += list(irrep_columns.T)
+
+        return np.array(columns).T, irreps
+
+    def signed_permutations(self):
+        """Creates the group of the symmetry operations that send each of x, y and z to plus or minus one of x, y and z,
+        as the basis function and sign each basis function is sent to by each element.
+
+        Each of these operations sends a cartesian gaussian to exactly plus or minus another, found in the
+        symmetry_matrix, so every two electron integral equals plus or minus the integral of the images of its four
+        basis functions. The group is closed under composition so its elements are all the images of a quartet.
+
+        Returns
+        -------
+        : List[Tuple[np.array, np.array]]
+            The index of the image of each basis function and the sign it takes, the identity first.
+
+        """
+        size = len(self.basis_set)
+        exponents = np.array([basis.integral_exponents for basis in self.basis_set], dtype=int).reshape(size, 3)
+        generators = []
+        for m in range(1, len(self.symmetry_objects)):
+            axes = self.axis_permutation(self.symmetry_objects[m])
+            images = np.abs(self.permutation_table[:, m - 1]) - 1
+            if axes is None or np.any(images < 0) or np.any(exponents[images][:, list(axes[0])] != exponents):
+                continue
+            generators.append((images, np.prod(np.array(axes[1]) ** exponents, axis=1)))
+
+        identity = (np.arange(size), np.ones(size, dtype=int))
+        group = {(identity[0].tobytes(), identity[1].tobytes()): identity}
+        new_elements = [identity]
+        while new_elements:
+            element = new_elements.pop()
+            for permutation, signs in generators:
+                product = (permutation[element[0]], element[1] * signs[element[0]])
+                key = (product[0].tobytes(), product[1].tobytes())
+                if key not in group:
+                    group[key] = product
+                    new_elements.append(product)
+        return list(group.values())
+
+    @staticmethod
+    def axis_permutation(symmetry_object):
+        matrix = np.array([symmetry_object.operate(axis) for axis in ((1, 0, 0), (0, 1, 0), (0, 0, 1))])
+        rounded = np.round(matrix)
+        if not np.allclose(matrix, rounded, atol=1e-3) or not np.allclose(np.abs(rounded).sum(axis=0), 1) \
+        or not np.allclose(np.abs(rounded).sum(axis=1), 1):
+            return None
+        return tuple(int(x) for x in np.abs(rounded).argmax(axis=1)), tuple(int(x) for x in rounded.sum(axis=1))
+
+    @staticmethod
+    def axis_signs(symmetry_object):
+        matrix = np.array([symmetry_object.operate(axis) for axis in ((1, 0, 0), (0, 1, 0), (0, 0, 1))])
+        if not np.allclose(np.abs(matrix), np.identity(3), atol=1e-3):
+            return None
+        return tuple(int(round(matrix[i, i])) for i in range(3))
+
     def sort_index(self, a, b, c, d):
         if a > b:
             a, b = b, a
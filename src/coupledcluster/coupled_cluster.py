@@ -1,7 +1,9 @@
-import time
 from src.common import Indices
+from src.common import instrumentation
+from src.common import logger
 from src.coupledcluster import PeturbativeTriples
 from src.coupledcluster import SinglesDoubles
+from src.matrixelements import checkpoint
 from src.matrixelements import molecular_orbitals
 from src.matrixelements import spin_basis_anti_physicist
 from src.matrixelements import spin_orbital_energies
@@ -11,7 +13,10 @@ class CoupledCluster(Indices):
 
     def __init__(self, hartree_fock, threshold):
         self.hartree_fock_energy, orbital_energies, orbital_coefficients = hartree_fock.begin_scf()
-        self.repulsion = spin_basis_anti_physicist(molecular_orbitals(hartree_fock.repulsion, orbital_coefficients))
+        with instrumentation.timer('ao_to_mo'):
+            self.repulsion = spin_basis_anti_physicist(
+                molecular_orbitals(hartree_fock.repulsion, orbital_coefficients)
+            )
         self.orbital_energies = spin_orbital_energies(orbital_energies)
         self.occupied_orbitals = hartree_fock.electrons
         self.unoccupied_orbitals = len(self.orbital_energies) - hartree_fock.electrons
@@ -27,34 +32,51 @@ class CoupledClusterSinglesDoubles(CoupledCluster):
         self.unoccupied_orbitals)
 
     def calculate_singles_doubles(self):
-        print('*************************************************************************************************')
-        print('\nMP2 INITIAL GUESS')
-        start = time.clock()
-        amplitudes = self.amplitudes_factory.mp2_initial_guess()
-        correlation = self.singles_doubles_correlation(amplitudes)
-        print('MP2 CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
-        print('TIME TAKEN: ' + str(time.clock() - start) + 's')
-
-        print('\n*************************************************************************************************')
-        print('\nBEGIN CCSD ITERATIONS')
-        start = time.clock()
-        previous_correlation = 0
-
-        while True:
-
-            amplitudes = self.amplitudes_factory.calculate_amplitudes(amplitudes)
-            correlation = self.singles_doubles_correlation(amplitudes)
-            delta_energy = previous_correlation - correlation
-            previous_correlation = correlation
-            print('CCSD CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
-
-            if abs(delta_energy) < self.threshold:
-                break
-
-        print('TIME TAKEN: ' + str(time.clock() - start) + 's\n\n')
+        state = checkpoint.load('ccsd')
+        if state is None:
+            logger.separator(newline=False)
+            logger.log('\nMP2 INITIAL GUESS')
+            with instrumentation.timer('mp2_initial_guess') as timer:
+                amplitudes = self.amplitudes_factory.mp2_initial_guess()
+                correlation = self.singles_doubles_correlation(amplitudes)
+            logger.log('MP2 CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
+            logger.log('TIME TAKEN: ' + str(timer.seconds) + 's')
+            previous_correlation, iterations, converged = 0, 0, False
+        else:
+            amplitudes = dict(zip(self.amplitude_indices(), state['amplitudes'].tolist()))
+            correlation = previous_correlation = float(state['correlation'])
+            iterations, converged = int(state['iterations']), bool(state['converged'])
+            logger.log('\nCCSD RESTARTED FROM ITERATION {} OF THE CHECKPOINT', iterations)
+
+        logger.separator()
+        logger.log('\nBEGIN CCSD ITERATIONS')
+
+        with instrumentation.timer('ccsd') as timer:
+            while not converged:
+
+                instrumentation.count('cc_iterations')
+                amplitudes = self.amplitudes_factory.calculate_amplitudes(amplitudes)
+                correlation = self.singles_doubles_correlation(amplitudes)
+                delta_energy = previous_correlation - correlation
+                previous_correlation = correlation
+                iterations += 1
+                converged = abs(delta_energy) < self.threshold
+                logger.log('CCSD CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
+
+                if converged or checkpoint.due(iterations):
+                    checkpoint.save(
+                        'ccsd', amplitudes=[amplitudes[index] for index in self.amplitude_indices()],
+                        correlation=correlation, iterations=iterations, converged=converged
+                    )
+
+        logger.log('TIME TAKEN: ' + str(timer.seconds) + 's\n\n')
+        logger.record('ccsd', correlation=correlation, seconds=timer.seconds)
 
         return correlation, amplitudes
 
+    def amplitude_indices(self):
+        return list(self.singles()) + list(self.doubles())
+
     def singles_doubles_correlation(self, t):
         correlation = 0
         for i, j, a, b in self.doubles():
@@ -75,16 +97,17 @@ class CoupledClusterPerturbativeTriples(CoupledClusterSinglesDoubles):
         self.unoccupied_orbitals)
 
     def calculate_perturbative_triples(self):
-        print('\n*************************************************************************************************')
-        print('\nBEGIN CCSD(T) CALCULATION')
-        start = time.clock()
-        t_connected, t_disconnected = self.amplitudes_factory.calculate_triples_amplitudes(self.t_singles_doubles)
-        correlation_triples = self.perturbative_triples_correlation(t_connected, t_disconnected)
+        logger.separator()
+        logger.log('\nBEGIN CCSD(T) CALCULATION')
+        with instrumentation.timer('triples') as timer:
+            t_connected, t_disconnected = self.amplitudes_factory.calculate_triples_amplitudes(self.t_singles_doubles)
+            correlation_triples = self.perturbative_triples_correlation(t_connected, t_disconnected)
         correlation = self.singles_doubles_correlation + correlation_triples
-        print('CCSD(T) SINGLES AND DOUBLES CORRELATION ENERGY: ' + str(self.singles_doubles_correlation) + ' a.u.')
-        print('CCSD(T) TRIPLES CORRELATION ENERGY: ' + str(correlation_triples) + ' a.u.')
-        print('CCSD(T) CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
-        print('TIME TAKEN: ' + str(time.clock() - start) + 's\n\n')
+        logger.log('CCSD(T) SINGLES AND DOUBLES CORRELATION ENERGY: {} a.u.', self.singles_doubles_correlation)
+        logger.log('CCSD(T) TRIPLES CORRELATION ENERGY: ' + str(correlation_triples) + ' a.u.')
+        logger.log('CCSD(T) CORRELATION ENERGY: ' + str(correlation) + ' a.u.')
+        logger.log('TIME TAKEN: ' + str(timer.seconds) + 's\n\n')
+        logger.record('triples', correlation_triples=correlation_triples, seconds=timer.seconds)
         return correlation
 
     def perturbative_triples_correlation(self, t_connected, t_disconnected):
@@ -1,4 +1,5 @@
 import numpy as np
+from src.common import logger
 
 
 class DIIS:
@@ -103,5 +104,5 @@ class DIIS:
         except np.linalg.linalg.LinAlgError:
             self.fock_array.pop(0)
             self.error_array.pop(0)
-            print("np.linalg.linalg.LinAlgError: removing a DIIS vector")
+            logger.log("np.linalg.linalg.LinAlgError: removing a DIIS vector")
             return self.create_b_matrix()
@@ -1 +1,4 @@
 from src.energy.energy import Energy
+from src.energy.energy_pool import EnergyPool
+from src.energy.energy_pool import geometry_energy
+from src.energy.finite_difference import FiniteDifference
@@ -1,81 +1,211 @@
 from src.common import Symmetry
+from src.common import coordinate_distance
 from src.common import coulomb_matrix
-from src.coupledcluster import CoupledClusterPerturbativeTriples
-from src.coupledcluster import CoupledClusterSinglesDoubles
+from src.common import logger
+from src.common import read_basis_set_file
 from src.hartreefock import BlockedHartreeFock
+from src.hartreefock import OrbitalGuess
 from src.hartreefock import RestrictedHF
 from src.hartreefock import UnrestrictedHF
-from src.kohnsham import RestrictedKohnSham
-from src.moellerplesset import MoellerPlesset
 from src.objects import PointGroup
-from src.tdhartreefock import TimeDependentHartreeFock
-from src.tdhartreefock import TammDancoffApproximation
 
 
 class Energy:
+    """Calculates the energy of a geometry by a method.
 
-    def __init__(self, electrons, multiplicity, processors, method):
+    The module of each post Hartree-Fock, Kohn-Sham and excited state method is imported the first time the method
+    is used, so a run only loads the modules and dependencies it needs. With an auxiliary basis file the RHF and UHF
+    two electron integrals are density fitted, which the other methods do not support. With a Fock rebuild interval
+    the restricted Fock matrices are built from the change in the density, in full every fock_rebuild_interval builds.
+    The integral engine is passed on to HartreeFock, None picking ObaraSaika unless a tuning of the basis set is cached.
+
+    """
+    def __init__(self, electrons, multiplicity, processors, method, spherical=False, auxiliary_basis=None,
+    fock_rebuild_interval=None, integral_engine=None):
         self.electrons = electrons
         self.multiplicity = multiplicity
         self.processors = processors
         self.method = method
+        self.spherical = spherical
+        self.auxiliary_basis = auxiliary_basis
+        self.fock_rebuild_interval = fock_rebuild_interval
+        self.integral_engine = integral_engine
         self.symmetry_object = Symmetry(PointGroup([], [], [], [], 'C_{1}'), [])
+        self.orbital_guess = None
 
-    def calculate_energy(self, nuclei_array, basis_set):
+    def calculate_energy(self, nuclei_array, basis_set, orbital_guess=None):
         electron_energy = correlation = 0.0
+        hartree_fock = None
+        auxiliary_basis_set = None
+        if self.auxiliary_basis is not None:
+            if self.method not in ('RHF', 'UHF'):
+                raise ValueError('density fitting is only available for RHF and UHF, not {}'.format(self.method))
+            auxiliary_basis_set = read_basis_set_file(self.auxiliary_basis, nuclei_array)
+        self.match_symmetry(basis_set)
 
         coulomb_law_matrix = coulomb_matrix(nuclei_array)
         nuclear_repulsion = coulomb_law_matrix.sum() / 2
 
         if self.method == 'RHF':
-            electron_energy, correlation = RestrictedHF(
-                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors
-            ).energies()
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                auxiliary_basis_set=auxiliary_basis_set, fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = hartree_fock.energies()
 
         if self.method == 'UHF':
             electron_energy, correlation = UnrestrictedHF(
-                nuclei_array, basis_set, self.electrons, self.multiplicity, self.symmetry_object, self.processors
+                nuclei_array, basis_set, self.electrons, self.multiplicity, self.symmetry_object, self.processors,
+                spherical=self.spherical, integral_engine=self.integral_engine, auxiliary_basis_set=auxiliary_basis_set
             ).energies()
 
         if self.method == 'GUHF':
             electron_energy, correlation = BlockedHartreeFock(
-                nuclei_array, basis_set, self.electrons, self.multiplicity, self.symmetry_object, self.processors
+                nuclei_array, basis_set, self.electrons, self.multiplicity, self.symmetry_object, self.processors,
+                spherical=self.spherical, integral_engine=self.integral_engine
             ).energies()
 
         if self.method == 'MP2':
-            electron_energy, correlation = MoellerPlesset(
-                RestrictedHF(nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors)
-            ).energies()
+            from src.moellerplesset import MoellerPlesset
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = MoellerPlesset(hartree_fock).energies()
 
         if self.method[0] == 'DFT':
-            electron_energy, correlation = RestrictedKohnSham(
+            from src.kohnsham import RestrictedKohnSham
+            if self.spherical:
+                raise ValueError('spherical basis sets are not available for DFT')
+            hartree_fock = RestrictedKohnSham(
                 nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors, self.method[1],
-                self.method[2]
-            ).energies()
+                self.method[2], orbital_guess=orbital_guess, integral_engine=self.integral_engine
+            )
+            electron_energy, correlation = hartree_fock.energies()
 
         if self.method == 'CCSD':
-            electron_energy, correlation = CoupledClusterSinglesDoubles(
-                RestrictedHF(nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors)
-            ).energies()
+            from src.coupledcluster import CoupledClusterSinglesDoubles
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = CoupledClusterSinglesDoubles(hartree_fock).energies()
 
         if self.method == 'CCSD(T)':
-            electron_energy, correlation = CoupledClusterPerturbativeTriples(
-                RestrictedHF(nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors)
-            ).energies()
+            from src.coupledcluster import CoupledClusterPerturbativeTriples
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = CoupledClusterPerturbativeTriples(hartree_fock).energies()
 
         if self.method == 'TDHF':
-            electron_energy, correlation = TimeDependentHartreeFock(
-                RestrictedHF(nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors)
-            ).calculate()
+            from src.tdhartreefock import TimeDependentHartreeFock
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = TimeDependentHartreeFock(hartree_fock).calculate()
 
         if self.method == 'CIS':
-            electron_energy, correlation = TammDancoffApproximation(
-                RestrictedHF(nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors)
-            ).calculate()
+            from src.tdhartreefock import TammDancoffApproximation
+            hartree_fock = RestrictedHF(
+                nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors,
+                orbital_guess=orbital_guess, spherical=self.spherical, integral_engine=self.integral_engine,
+                fock_rebuild_interval=self.fock_rebuild_interval
+            )
+            electron_energy, correlation = TammDancoffApproximation(hartree_fock).calculate()
+
+        # converged restricted orbitals can warm-start the next calculation at a nearby geometry
+        self.orbital_guess = None
+        if hartree_fock is not None and hartree_fock.orbital_coefficients is not None:
+            self.orbital_guess = OrbitalGuess(basis_set, hartree_fock.orbital_coefficients)
 
         total_energy = electron_energy + nuclear_repulsion + correlation
-        print('NUCLEAR REPULSION ENERGY:    ' + str(nuclear_repulsion) + ' a.u.')
-        print('SCF ENERGY:                  ' + str(electron_energy) + ' a.u.')
-        print('CORRELATION ENERGY:          ' + str(correlation) + ' a.u.')
-        print('TOTAL ENERGY:                ' + str(total_energy) + ' a.u.')
+        logger.log('NUCLEAR REPULSION ENERGY:    ' + str(nuclear_repulsion) + ' a.u.')
+        logger.log('SCF ENERGY:                  ' + str(electron_energy) + ' a.u.')
+        logger.log('CORRELATION ENERGY:          ' + str(correlation) + ' a.u.')
+        logger.log('TOTAL ENERGY:                ' + str(total_energy) + ' a.u.')
+        logger.record(
+            'energy', method=self.method, nuclear_repulsion=nuclear_repulsion, scf_energy=electron_energy,
+            correlation=correlation, total_energy=total_energy
+        )
         return total_energy
+
+    def match_symmetry(self, basis_set, error=1e-4):
+        """Recreates the symmetry object for the basis set of a new geometry, as the symmetry object of the initial
+        geometry, or the default one with no basis set, describes other basis functions. The point group is kept only
+        while each of its operations still maps the basis function centres onto each other, as a displaced geometry has
+        in general lost the symmetry of the initial one, otherwise the symmetry object falls back to C1.
+
+        Parameters
+        ----------
+        basis_set : List[Basis]
+        error : float
+            The distance in bohr within which the image of a centre must fall on another centre.
+
+        """
+        centres = [basis.coordinates for basis in basis_set]
+        if centres == [basis.coordinates for basis in self.symmetry_object.basis_set]:
+            return
+        point_group = self.symmetry_object.point_group
+        for operation in self.symmetry_object.symmetry_objects[1:]:
+            if any(min(coordinate_distance(operation.operate(centre), other) for other in centres) > error
+                   for centre in centres):
+                point_group = PointGroup([], [], [], [], 'C_{1}')
+                break
+        self.symmetry_object = Symmetry(point_group, basis_set)
+
+    def analytic_gradient(self):
+        return self.method == 'RHF' and self.auxiliary_basis is None
+
+    def calculate_gradient(self, nuclei_array, basis_set, orbital_guess=None):
+        """Calculates the total energy and its analytic gradient with respect to the nuclear coordinates.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        basis_set : List[Basis]
+        orbital_guess : {None, OrbitalGuess}
+
+        Returns
+        -------
+        total_energy : float
+        gradient : np.array
+            One row of x, y and z derivatives for each nuclei.
+
+        """
+        if self.method != 'RHF':
+            raise ValueError('analytic gradients are only available for RHF, not {}'.format(self.method))
+        if self.auxiliary_basis is not None:
+            raise ValueError('analytic gradients are not available with density fitting')
+        from src.gradient import RestrictedGradient
+        self.match_symmetry(basis_set)
+
+        coulomb_law_matrix = coulomb_matrix(nuclei_array)
+        nuclear_repulsion = coulomb_law_matrix.sum() / 2
+
+        hartree_fock = RestrictedHF(
+            nuclei_array, basis_set, self.electrons, self.symmetry_object, self.processors, orbital_guess=orbital_guess,
+            spherical=self.spherical, integral_engine=self.integral_engine,
+            fock_rebuild_interval=self.fock_rebuild_interval
+        )
+        restricted_gradient = RestrictedGradient(hartree_fock, self.processors)
+        gradient = restricted_gradient.gradient()
+        self.orbital_guess = OrbitalGuess(basis_set, hartree_fock.orbital_coefficients)
+
+        total_energy = restricted_gradient.electron_energy + nuclear_repulsion
+        logger.log('NUCLEAR REPULSION ENERGY:    ' + str(nuclear_repulsion) + ' a.u.')
+        logger.log('SCF ENERGY:                  ' + str(restricted_gradient.electron_energy) + ' a.u.')
+        logger.log('TOTAL ENERGY:                ' + str(total_energy) + ' a.u.')
+        logger.log('NUCLEAR GRADIENT:\n{}', gradient)
+        logger.record(
+            'gradient', method=self.method, nuclear_repulsion=nuclear_repulsion,
+            scf_energy=restricted_gradient.electron_energy, total_energy=total_energy, gradient=gradient
+        )
+        return total_energy, gradient
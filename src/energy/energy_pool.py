@@ -0,0 +1,79 @@
+import copy
+from itertools import repeat
+from src.common import instrumentation
+from src.common import logger
+from src.common import read_basis_set_file
+
+
+def geometry_energy(energy_object, basis_file, nuclei_array, orbital_guess=None):
+    """Runs a single point calculation for one geometry with the output suppressed.
+
+    Parameters
+    ----------
+    energy_object : Energy
+    basis_file : str
+    nuclei_array : List[Nuclei]
+    orbital_guess : {None, OrbitalGuess}
+
+    Returns
+    -------
+    energy : float
+    orbital_guess : {None, OrbitalGuess}
+        The converged orbitals of this geometry.
+
+    """
+    with logger.quiet():
+        basis_set = read_basis_set_file(basis_file, nuclei_array)
+        energy = energy_object.calculate_energy(nuclei_array, basis_set, orbital_guess)
+    return energy, energy_object.orbital_guess
+
+
+class EnergyPool:
+    """Evaluates the energies of independent geometries concurrently in a process pool.
+
+    The processor count of the energy object is the total budget. It is split between the geometries evaluated at the
+    same time and the two electron repulsion integral pool inside each of them so the cores are not oversubscribed.
+
+    Attributes
+    ----------
+    energy_object : Energy
+    basis_file : str
+    processes : int
+        The number of geometries evaluated at the same time.
+
+    """
+    def __init__(self, energy_object, basis_file, processes):
+        self.energy_object = energy_object
+        self.basis_file = basis_file
+        self.processes = processes
+
+    def calculate(self, nuclei_arrays, orbital_guesses=None):
+        """Calculates the energy of every geometry.
+
+        Parameters
+        ----------
+        nuclei_arrays : List[List[Nuclei]]
+        orbital_guesses : {None, List[OrbitalGuess]}
+
+        Returns
+        -------
+        : List[Tuple[float, OrbitalGuess]]
+            The energy and converged orbitals of each geometry in the order given.
+
+        """
+        if orbital_guesses is None:
+            orbital_guesses = [None] * len(nuclei_arrays)
+
+        processes = min(self.processes, len(nuclei_arrays))
+        if processes <= 1:
+            return [geometry_energy(self.energy_object, self.basis_file, nuclei_array, orbital_guess)
+                    for nuclei_array, orbital_guess in zip(nuclei_arrays, orbital_guesses)]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        energy_object = copy.copy(self.energy_object)
+        energy_object.processors = max(1, self.energy_object.processors // processes)
+        with ProcessPoolExecutor(processes) as executor:
+            return instrumentation.starmap(executor, geometry_energy, zip(
+                repeat(energy_object), repeat(self.basis_file), nuclei_arrays, orbital_guesses
+            ))
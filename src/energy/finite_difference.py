@@ -0,0 +1,343 @@
+import itertools
+import numpy as np
+from src.common import Symmetry
+from src.energy import EnergyPool
+from src.factory import MoleculeFactory
+from src.objects import Nuclei
+
+
+class FiniteDifference:
+    """Gradients, hessians and harmonic frequencies from the energies of displaced geometries.
+
+    The displacements are taken along internal coordinates, with the translations and rotations projected out, that are
+    adapted to the point group of the molecule. The energy is totally symmetric so only the totally symmetric
+    coordinates have a gradient and the hessian only couples coordinates of the same irreducible representation. Any
+    remaining displacement that is the image of another under a symmetry operation has the same energy and is only
+    calculated once. The energies of the displaced geometries are independent and run in an energy pool.
+
+    Attributes
+    ----------
+    basis_file : str
+    energy_object : Energy
+    step : float
+        The displacement in bohr.
+    symmetry : bool
+    processes : int
+    orbital_guess : {None, OrbitalGuess}
+        The converged orbitals of the undisplaced geometry once calculated.
+
+    """
+    def __init__(self, basis_file, energy_object, step=5e-3, symmetry=True, processes=1):
+        self.basis_file = basis_file
+        self.energy_object = energy_object
+        self.step = step
+        self.symmetry = symmetry
+        self.energy_pool = EnergyPool(energy_object, basis_file, processes)
+        self.orbital_guess = None
+
+    def gradient(self, nuclei_array, orbital_guess=None):
+        """Calculates the energy and the gradient from central differences along the totally symmetric coordinates.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        orbital_guess : {None, OrbitalGuess}
+
+        Returns
+        -------
+        energy : float
+        gradient : np.array
+            One row of x, y and z derivatives for each nuclei.
+
+        """
+        operations = self.symmetry_operations(nuclei_array)
+        coordinates = [vector for characters, block in self.coordinate_blocks(nuclei_array, operations)
+                       if self.totally_symmetric(characters) for vector in block.T]
+
+        displacements = [sign * self.step * vector for vector in coordinates for sign in (1, -1)]
+        energy, energies = self.displaced_energies(nuclei_array, displacements, operations, orbital_guess)
+
+        gradient = np.zeros(3 * len(nuclei_array))
+        for i, vector in enumerate(coordinates):
+            gradient += vector * (energies[2 * i] - energies[2 * i + 1]) / (2 * self.step)
+        return energy, gradient.reshape(len(nuclei_array), 3)
+
+    def hessian(self, nuclei_array, orbital_guess=None):
+        """Calculates the energy, gradient and hessian from single and double displacements.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        orbital_guess : {None, OrbitalGuess}
+
+        Returns
+        -------
+        energy : float
+        gradient : np.array
+            One row of x, y and z derivatives for each nuclei.
+        hessian : np.array
+            The second derivatives with respect to the 3N cartesian coordinates, ordered x, y, z for each nuclei.
+
+        """
+        operations = self.symmetry_operations(nuclei_array)
+        coordinates = []
+        labels = []
+        for characters, block in self.coordinate_blocks(nuclei_array, operations):
+            for vector in block.T:
+                coordinates.append(vector)
+                labels.append(characters)
+
+        pairs = [(i, j) for i, j in itertools.combinations(range(len(coordinates)), 2) if labels[i] == labels[j]]
+        displacements = [sign * self.step * vector for vector in coordinates for sign in (1, -1)]
+        displacements += [sign * self.step * (coordinates[i] + coordinates[j]) for i, j in pairs for sign in (1, -1)]
+        energy, energies = self.displaced_energies(nuclei_array, displacements, operations, orbital_guess)
+
+        h = self.step
+        internal_gradient = np.zeros(len(coordinates))
+        internal_hessian = np.zeros((len(coordinates), len(coordinates)))
+        for i in range(len(coordinates)):
+            if self.totally_symmetric(labels[i]):
+                internal_gradient[i] = (energies[2 * i] - energies[2 * i + 1]) / (2 * h)
+            internal_hessian[i, i] = (energies[2 * i] + energies[2 * i + 1] - 2 * energy) / h**2
+        for k, (i, j) in enumerate(pairs):
+            double = energies[2 * len(coordinates) + 2 * k] + energies[2 * len(coordinates) + 2 * k + 1]
+            single = energies[2 * i] + energies[2 * i + 1] + energies[2 * j] + energies[2 * j + 1]
+            internal_hessian[i, j] = internal_hessian[j, i] = (double - single + 2 * energy) / (2 * h**2)
+
+        if len(coordinates) == 0:
+            return energy, np.zeros((len(nuclei_array), 3)), np.zeros((3 * len(nuclei_array), 3 * len(nuclei_array)))
+        basis = np.array(coordinates).T
+        gradient = (basis @ internal_gradient).reshape(len(nuclei_array), 3)
+        return energy, gradient, basis @ internal_hessian @ basis.T
+
+    def frequencies(self, nuclei_array, orbital_guess=None):
+        """Calculates the harmonic vibrational frequencies from the mass weighted hessian.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        orbital_guess : {None, OrbitalGuess}
+
+        Returns
+        -------
+        : np.array
+            The frequencies in cm^-1 in ascending order, imaginary frequencies are returned as negative numbers.
+
+        """
+        energy, gradient, hessian = self.hessian(nuclei_array, orbital_guess)
+        masses = np.repeat([nuclei.mass * 1822.888486 for nuclei in nuclei_array], 3)
+        mass_weighted_hessian = hessian / np.sqrt(np.outer(masses, masses))
+
+        internal = internal_coordinates(nuclei_array) / np.sqrt(masses)[:, np.newaxis]
+        if internal.shape[1] == 0:
+            return np.array([])
+        vibrations = np.linalg.qr(internal)[0]
+        eigenvalues = np.linalg.eigvalsh(vibrations.T @ mass_weighted_hessian @ vibrations)
+        return np.sign(eigenvalues) * np.sqrt(np.abs(eigenvalues)) * 219474.6313702
+
+    def symmetry_operations(self, nuclei_array):
+        """Returns the symmetry operations of the molecule as permutation matrices on the 3N cartesian displacements.
+
+        The point group is found by the molecule factory in its standard orientation, so the operations are rotated
+        back into the frame of the nuclei array and closed into a group.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+
+        Returns
+        -------
+        operations : List[np.array]
+
+        """
+        positions = np.array([nuclei.coordinates for nuclei in nuclei_array], dtype=float)
+        identity = np.identity(3 * len(nuclei_array))
+        if not self.symmetry or len(nuclei_array) == 1:
+            return [identity]
+
+        copies = [Nuclei(nuclei.element, nuclei.charge, nuclei.mass, nuclei.coordinates) for nuclei in nuclei_array]
+        point_group = MoleculeFactory(symmetry=True).create(list(copies))[1]
+        oriented_positions = np.array([nuclei.coordinates for nuclei in copies], dtype=float)
+
+        center = positions.mean(axis=0)
+        oriented_center = oriented_positions.mean(axis=0)
+        u, s, vt = np.linalg.svd((positions - center).T @ (oriented_positions - oriented_center))
+        frame = u @ vt
+
+        group = []
+        for operation in [None] + Symmetry(point_group, []).symmetry_objects[1:]:
+            if operation is None:
+                matrix = np.identity(3)
+            else:
+                matrix = frame @ np.array([operation.operate(axis) for axis in np.identity(3)], dtype=float).T \
+                @ frame.T
+            self.add_operation(group, nuclei_array, center, matrix)
+        i = 0
+        while i < len(group) and len(group) <= 120:
+            for element in list(group):
+                self.add_operation(group, nuclei_array, center, group[i][0] @ element[0])
+            i += 1
+
+        operations = []
+        for matrix, permutation in group:
+            operation = np.zeros((3 * len(nuclei_array), 3 * len(nuclei_array)))
+            for a, b in enumerate(permutation):
+                operation[3 * b:3 * b + 3, 3 * a:3 * a + 3] = matrix
+            operations.append(operation)
+        return operations
+
+    @staticmethod
+    def add_operation(group, nuclei_array, center, matrix, error=1e-3):
+        """Adds a symmetry operation to the group if it maps the molecule onto itself and is not already there.
+
+        The operations found in the standard orientation are only accurate to the symmetry tolerance, so each one is
+        replaced by the orthogonal matrix that best maps the nuclei onto their images. The original matrix is kept as a
+        small bias to fix the directions the nuclei do not span, for example the normal of a planar molecule.
+
+        Parameters
+        ----------
+        group : List[Tuple[np.array, List[int]]]
+            The matrices of the operations and the nuclei each nuclei is mapped onto.
+        nuclei_array : List[Nuclei]
+        center : np.array
+        matrix : np.array
+        error : float
+            The distance in bohr within which an image must fall on a nuclei, the tolerance of the molecule factory. It
+            must stay well below the step, or a displaced geometry could be taken as the image of another.
+
+        """
+        positions = np.array([nuclei.coordinates for nuclei in nuclei_array], dtype=float) - center
+        permutation = []
+        for a, image in enumerate(positions @ matrix.T):
+            distances = [np.linalg.norm(image - position) if nuclei.charge == nuclei_array[a].charge else np.inf
+                         for position, nuclei in zip(positions, nuclei_array)]
+            if min(distances) > error:
+                return
+            permutation.append(int(np.argmin(distances)))
+
+        u, s, vt = np.linalg.svd(positions[permutation].T @ positions + 1e-3 * matrix)
+        matrix = u @ vt
+        if not any(np.allclose(matrix, element, atol=1e-4) for element, other in group):
+            group.append((matrix, permutation))
+
+    def coordinate_blocks(self, nuclei_array, operations):
+        """Splits the internal coordinates into blocks that each span one irreducible representation.
+
+        A fixed symmetric matrix averaged over the group commutes with every operation, so its eigenspaces are
+        invariant subspaces of the displacements. Each is labelled with its characters under the operations.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        operations : List[np.array]
+
+        Returns
+        -------
+        blocks : List[Tuple[Tuple[float, ...], np.array]]
+            The characters and the orthonormal coordinates, as columns, of each block.
+
+        """
+        internal = internal_coordinates(nuclei_array)
+        if internal.shape[1] == 0:
+            return []
+        weights = np.diag(np.random.RandomState(0).uniform(1, 2, internal.shape[1]))
+        matrix = internal @ weights @ internal.T
+        matrix = sum(operation @ matrix @ operation.T for operation in operations) / len(operations)
+        eigenvalues, eigenvectors = np.linalg.eigh(internal.T @ matrix @ internal)
+        eigenvectors = internal @ eigenvectors
+
+        blocks = []
+        start = 0
+        for end in range(1, len(eigenvalues) + 1):
+            if end == len(eigenvalues) or abs(eigenvalues[end] - eigenvalues[start]) > 1e-8:
+                block = eigenvectors[:, start:end]
+                characters = tuple(round(np.trace(block.T @ operation @ block), 3) + 0.0 for operation in operations)
+                blocks.append((characters, block))
+                start = end
+        return blocks
+
+    @staticmethod
+    def totally_symmetric(characters):
+        return all(abs(character - 1) < 1e-3 for character in characters)
+
+    def displaced_energies(self, nuclei_array, displacements, operations, orbital_guess=None):
+        """Calculates the energy of the undisplaced geometry and of every displacement.
+
+        The displaced geometries are warm-started from the orbitals of the undisplaced geometry and each set of
+        symmetry equivalent displacements is only calculated once.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+        displacements : List[np.array]
+        operations : List[np.array]
+        orbital_guess : {None, OrbitalGuess}
+
+        Returns
+        -------
+        energy : float
+        energies : List[float]
+
+        """
+        unique_keys = {}
+        unique_displacements = []
+        index = []
+        for displacement in displacements:
+            for operation in operations:
+                key = tuple(np.round(operation @ displacement / self.step, 5) + 0.0)
+                if key in unique_keys:
+                    index.append(unique_keys[key])
+                    break
+            else:
+                unique_keys[tuple(np.round(displacement / self.step, 5) + 0.0)] = len(unique_displacements)
+                index.append(len(unique_displacements))
+                unique_displacements.append(displacement)
+
+        energy, self.orbital_guess = self.energy_pool.calculate([nuclei_array], [orbital_guess])[0]
+        nuclei_arrays = [displace(nuclei_array, displacement) for displacement in unique_displacements]
+        unique_energies = [energy for energy, orbital_guess in self.energy_pool.calculate(
+            nuclei_arrays, [self.orbital_guess] * len(nuclei_arrays)
+        )]
+        return energy, [unique_energies[i] for i in index]
+
+
+def displace(nuclei_array, displacement):
+    """Creates a new nuclei array with every nuclei moved by its part of a 3N cartesian displacement.
+
+    Parameters
+    ----------
+    nuclei_array : List[Nuclei]
+    displacement : np.array
+
+    Returns
+    -------
+    : List[Nuclei]
+
+    """
+    return [Nuclei(nuclei.element, nuclei.charge, nuclei.mass,
+            tuple(np.array(nuclei.coordinates, dtype=float) + displacement[3 * i:3 * i + 3]))
+            for i, nuclei in enumerate(nuclei_array)]
+
+
+def internal_coordinates(nuclei_array):
+    """Returns an orthonormal basis of the 3N cartesian displacements with the translations and rotations removed.
+
+    Parameters
+    ----------
+    nuclei_array : List[Nuclei]
+
+    Returns
+    -------
+    : np.array
+        The coordinates as columns.
+
+    """
+    positions = np.array([nuclei.coordinates for nuclei in nuclei_array], dtype=float)
+    positions = positions - positions.mean(axis=0)
+    external = []
+    for axis in np.identity(3):
+        external.append(np.tile(axis, len(nuclei_array)))
+        external.append(np.cross(axis, positions).flatten())
+    u, s, vt = np.linalg.svd(np.array(external).T, full_matrices=True)
+    rank = int(np.sum(s > 1e-6 * max(1.0, s.max())))
+    return u[:, rank:]
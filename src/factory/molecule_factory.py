@@ -27,7 +27,7 @@ class MoleculeFactory:
         if len(nuclei_array) == 1:                                      # Point
             return nuclei_array, Oh()
 
-        rotation, reflection, improper, inversion = self.symmetry_factory.brute_force_symmetry(nuclei_array)
+        rotation, reflection, improper, inversion = self.symmetry_factory.partitioned_symmetry(nuclei_array)
         nuclei_array, rotation, reflection = self.standard_orientation(nuclei_array, rotation, reflection)
 
         if self.check_linear(nuclei_array):                             # Linear
@@ -145,7 +145,7 @@ class MoleculeFactory:
             vector_i = (1.0, 0.0, 0.0)
 
         quaternion_i = create_quaternion((-vector_i[1], vector_i[0], 0.0), -theta(vector_i))
-        quaternion_j = create_quaternion((0.0, 0.0, 1.0), -phi(vector_j))
+        quaternion_j = create_quaternion((0.0, 0.0, 1.0), -phi(quaternion_rotation(quaternion_i, vector_j)))
         quaternion = quaternion_multi(quaternion_j, quaternion_i)
 
         for rotation in rotation_symmetry:
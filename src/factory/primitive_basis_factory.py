@@ -1,6 +1,10 @@
 from src.objects import Basis
 from src.objects import PrimitiveBasis
 
+f_integral_exponents = (
+    (3, 0, 0), (0, 3, 0), (0, 0, 3), (2, 1, 0), (2, 0, 1), (1, 2, 0), (0, 2, 1), (1, 0, 2), (0, 1, 2), (1, 1, 1)
+)
+
 
 def expand_basis_set(file_list, coordinates):
     basis_list = []
@@ -83,6 +87,15 @@ def expand_basis_set(file_list, coordinates):
             basis_list.append(basis_dxy)
             basis_list.append(basis_dxz)
             basis_list.append(basis_dyz)
+        elif file_list[a][0] == 'F':
+            for integral_exponents in f_integral_exponents:
+                primitive_basis_f_list = []
+                for b in range(1, len(file_list[a])):
+                    primitive_basis_f = PrimitiveBasis(file_list[a][b][0], file_list[a][b][1], coordinates,
+                    integral_exponents)
+                    primitive_basis_f_list.append(primitive_basis_f)
+                basis_f = Basis(primitive_basis_f_list, coordinates, integral_exponents)
+                basis_list.append(basis_f)
     return basis_list
 
 
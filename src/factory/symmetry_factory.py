@@ -40,6 +40,150 @@ class SymmetryFactory:
 
         return rotation_symmetry, reflection_symmetry, improper_rotation, inversion_symmetry
 
+    def partitioned_symmetry(self, nuclei_array):
+        """Finds the same symmetry operations as brute_force_symmetry from far fewer candidate axes and planes.
+
+        Every symmetry operation sends each nucleus to another of the same charge at the same distance from the centre,
+        so the nuclei are split into sets of these. The candidates are built from the principal axes of the inertia
+        tensor, the sets on a line through the centre, a line every operation sends to itself, and two points of the
+        smallest of the other sets: their sums, differences and cross products with the rest of the set and the normals
+        of the triangles the first makes with two points equally far from it. A rotation is only tested for the folds
+        that divide the number of nuclei of every set off its axis, and each operation is checked by looking up the
+        images of the nuclei in a KD-tree.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+            The nuclei of a molecule centred at the origin.
+
+        Returns
+        -------
+        rotation_symmetry : List[RotationSymmetry]
+        reflection_symmetry : List[ReflectionSymmetry]
+        improper_rotation : List[ImproperRotationSymmetry]
+        inversion_symmetry : List[InversionSymmetry]
+
+        """
+        from scipy.spatial import cKDTree  # scipy.spatial is only loaded by the runs that detect symmetry
+
+        nuclei_array = self.remove_center_nuclei(nuclei_array)
+        coordinates = np.array([nuclei.coordinates for nuclei in nuclei_array], dtype=float).reshape(-1, 3)
+        charges = np.array([nuclei.charge for nuclei in nuclei_array])
+        tree = cKDTree(coordinates)
+        equivalent_sets = self.equivalent_sets(nuclei_array)
+
+        if len(nuclei_array) == 0:
+            return [], [], [], [InversionSymmetry()]
+
+        principal_axes = self.inertia_axes(nuclei_array)
+        collinear = [self.check_collinear(coordinates[indices]) for indices in equivalent_sets]
+        lines = coordinates[[i for indices, line in zip(equivalent_sets, collinear) if line for i in indices]]
+        spread = [indices for indices, line in zip(equivalent_sets, collinear) if not line]
+        points = coordinates[min(spread, key=len)] if spread else coordinates
+
+        # an operation either fixes the first point or sends it to another point, likewise for the first point not on
+        # a line with it, and the polygon of the first point about an n-fold axis has two points equally far from it
+        first = points[0]
+        second = next((point for point in points if rho(np.cross(first, point)) > self.error), first)
+        distances = np.linalg.norm(points - first, axis=1)
+        b, c = np.triu_indices(len(points), 1)
+        equidistant = np.abs(distances[b] - distances[c]) <= self.error
+        b, c = b[equidistant], c[equidistant]
+        axes = np.vstack((
+            principal_axes, lines, points, first + points, second + points, np.cross(first, points),
+            np.cross(points[b] - first, points[c] - first)
+        ))
+        rotation_symmetry = []
+        for axis in self.unique_directions(axes):
+            # the nuclei of each set off the axis fall into cycles of the length of the fold
+            off_axis = np.linalg.norm(np.cross(coordinates, axis), axis=1) > self.error
+            counts = [np.count_nonzero(off_axis[indices]) for indices in equivalent_sets]
+            n_fold = 1
+            for fold in range(2, 9):
+                if all(count % fold == 0 for count in counts) \
+                and self.check_operation(tree, coordinates, charges, RotationSymmetry(fold, tuple(axis))):
+                    n_fold = fold
+            if n_fold != 1:
+                rotation_symmetry.append(RotationSymmetry(n_fold, tuple(axis)))
+
+        directions = np.vstack([principal_axes] + [rotation.vector for rotation in rotation_symmetry])
+        normals = np.vstack((
+            directions, lines, first - points, second - points, np.cross(first, second),
+            np.cross(np.vstack((lines, first, second))[:, None], directions[None]).reshape(-1, 3)
+        ))
+        reflection_symmetry = [
+            ReflectionSymmetry(tuple(normal)) for normal in self.unique_directions(normals)
+            if self.check_operation(tree, coordinates, charges, ReflectionSymmetry(tuple(normal)))
+        ]
+
+        improper_rotation = []
+        for rotation in rotation_symmetry:
+            improper = ImproperRotationSymmetry(2 * rotation.fold, rotation.vector)
+            if self.check_operation(tree, coordinates, charges, improper):
+                improper_rotation.append(improper)
+                continue
+            improper.fold //= 2
+            if improper.fold > 2 and self.check_operation(tree, coordinates, charges, improper):
+                improper_rotation.append(improper)
+
+        inversion = InversionSymmetry()
+        inversion_symmetry = [inversion] if self.check_operation(tree, coordinates, charges, inversion) else []
+
+        return rotation_symmetry, reflection_symmetry, improper_rotation, inversion_symmetry
+
+    def equivalent_sets(self, nuclei_array):
+        """Splits the nuclei into sets of the same charge and distance from the centre.
+
+        Parameters
+        ----------
+        nuclei_array : List[Nuclei]
+
+        Returns
+        -------
+        : List[np.array]
+            The indices of the nuclei of each set.
+
+        """
+        keys = sorted(
+            range(len(nuclei_array)), key=lambda i: (nuclei_array[i].charge, rho(nuclei_array[i].coordinates))
+        )
+        equivalent_sets = []
+        for i, j in zip([None] + keys, keys):
+            if i is None or nuclei_array[i].charge != nuclei_array[j].charge \
+            or rho(nuclei_array[j].coordinates) - rho(nuclei_array[i].coordinates) > self.error:
+                equivalent_sets.append([])
+            equivalent_sets[-1].append(j)
+        return [np.array(indices) for indices in equivalent_sets]
+
+    def check_collinear(self, coordinates):
+        return len(coordinates) < 2 or np.linalg.svd(coordinates, compute_uv=False)[1] <= self.error
+
+    def inertia_axes(self, nuclei_array):
+        inertia_tensor = np.zeros((3, 3))
+        for nuclei in nuclei_array:
+            r = np.array(nuclei.coordinates)
+            inertia_tensor += nuclei.mass * (np.dot(r, r) * np.identity(3) - np.outer(r, r))
+        return np.linalg.eigh(inertia_tensor)[1].T
+
+    def unique_directions(self, vectors):
+        from scipy.spatial import cKDTree
+
+        lengths = np.linalg.norm(vectors, axis=1)
+        vectors = vectors[lengths > self.error] / lengths[lengths > self.error, None]
+        tree = cKDTree(np.vstack((vectors, -vectors)))
+        duplicate = np.zeros(len(vectors), dtype=bool)
+        directions = []
+        for i, vector in enumerate(vectors):
+            if not duplicate[i]:
+                directions.append(vector)
+                duplicate[np.array(tree.query_ball_point(vector, self.error), dtype=int) % len(vectors)] = True
+        return directions
+
+    def check_operation(self, tree, coordinates, charges, symmetry):
+        matrix = np.array([symmetry.operate(axis) for axis in ((1, 0, 0), (0, 1, 0), (0, 0, 1))])
+        distances, images = tree.query(coordinates @ matrix)
+        return bool(np.all(distances <= self.error) and np.all(charges[images] == charges))
+
     def brute_force_rotation_symmetry(self, nuclei_array, corner, edge_center, cross_vertices_vertices,
     cross_edge_vertices, cross_edge_edge):
 
@@ -1 +1,3 @@
+from src.geometryoptimization.geometry_optimization import GeometryOptimization
 from src.geometryoptimization.nelder_mead import NelderMead
+from src.geometryoptimization.bfgs import BFGS
@@ -0,0 +1,154 @@
+import numpy as np
+from src.common import logger
+from src.common import read_basis_set_file
+from src.energy import FiniteDifference
+from src.geometryoptimization.geometry_optimization import GeometryOptimization
+
+
+class BFGS(GeometryOptimization):
+    """Quasi-Newton geometry optimization with analytic gradients.
+
+    The inverse hessian starts as the identity and is improved with the BFGS update after every step. Each step is
+    capped in length and followed by a backtracking line search on the energy, so only a handful of energy and gradient
+    evaluations are needed instead of the hundreds of energies taken by the Nelder-Mead simplex. Methods without
+    analytic gradients, and density fitted RHF, fall back to finite differences. The optimization stops after
+    max_iterations steps whether or not it has converged.
+
+    Attributes
+    ----------
+    threshold : float
+        The largest internal gradient component at convergence.
+    max_step : float
+        The longest step in bohr taken from one geometry to the next.
+    max_iterations : int
+    warm_start : bool
+        Starts the SCF of every geometry from the converged orbitals of the previous one.
+    finite_difference : FiniteDifference
+        Calculates the gradient of methods without analytic gradients.
+
+    """
+    def __init__(self, basis_file, energy_object, nuclei_list, threshold=3e-4, max_step=0.3, warm_start=True,
+    processes=1, max_iterations=100):
+        super().__init__(basis_file, energy_object, nuclei_list)
+        self.threshold = threshold
+        self.max_step = max_step
+        self.max_iterations = max_iterations
+        self.warm_start = warm_start
+        self.orbital_guess = None
+        self.finite_difference = FiniteDifference(basis_file, energy_object, processes=processes)
+
+    def optimize(self):
+        logger.separator()
+        logger.log('\nELECTRONIC STRUCTURE METHOD: {}'.format(self.energy_object.method))
+        logger.log('\nBEGIN BFGS OPTIMIZATION')
+
+        points = np.array(self.initial_points())
+        energy, gradient = self.calculate_gradient(points)
+        inverse_hessian = np.identity(self.m)
+
+        iterations = 0
+        while True:
+            logger.log("ENERGY: {}, GRADIENT: {}".format(energy, np.max(np.abs(gradient))))
+
+            if np.max(np.abs(gradient)) <= self.threshold:
+                break
+            if iterations == self.max_iterations:
+                logger.log('\nBFGS OPTIMIZATION NOT CONVERGED IN {} ITERATIONS'.format(self.max_iterations))
+                break
+            iterations += 1
+
+            step = - inverse_hessian @ gradient
+            if step @ gradient >= 0:
+                inverse_hessian = np.identity(self.m)
+                step = - gradient
+
+            step_length = np.linalg.norm(step)
+            if step_length > self.max_step:
+                step *= self.max_step / step_length
+
+            new_points, new_energy, new_gradient = self.line_search(points, energy, gradient, step)
+            inverse_hessian = self.update_inverse_hessian(
+                inverse_hessian, new_points - points, new_gradient - gradient
+            )
+            points, energy, gradient = new_points, new_energy, new_gradient
+
+        return energy
+
+    def line_search(self, points, energy, gradient, step, c_1=1e-4, min_alpha=1e-3):
+        """Backtracks along the step until the energy decreases enough, interpolating the energy quadratically.
+
+        Parameters
+        ----------
+        points : np.array
+        energy : float
+        gradient : np.array
+        step : np.array
+        c_1 : float
+            The fraction of the predicted decrease required by the Armijo condition.
+        min_alpha : float
+
+        Returns
+        -------
+        new_points : np.array
+        new_energy : float
+        new_gradient : np.array
+
+        """
+        slope = gradient @ step
+        alpha = 1.0
+        while True:
+            new_points = points + alpha * step
+            new_energy, new_gradient = self.calculate_gradient(new_points)
+            if new_energy <= energy + c_1 * alpha * slope or alpha <= min_alpha:
+                return new_points, new_energy, new_gradient
+            interpolated = - slope * alpha**2 / (2 * (new_energy - energy - slope * alpha))
+            alpha = min(max(interpolated, 0.1 * alpha), 0.5 * alpha)
+
+    def update_inverse_hessian(self, inverse_hessian, s, y):
+        """BFGS update of the inverse hessian, skipped when the curvature condition does not hold.
+
+        Parameters
+        ----------
+        inverse_hessian : np.array
+        s : np.array
+            The change in the internal coordinates.
+        y : np.array
+            The change in the gradient.
+
+        Returns
+        -------
+        : np.array
+
+        """
+        curvature = s @ y
+        if curvature <= 1e-10:
+            return inverse_hessian
+        rho = 1 / curvature
+        identity = np.identity(self.m)
+        return (identity - rho * np.outer(s, y)) @ inverse_hessian @ (identity - rho * np.outer(y, s)) \
+        + rho * np.outer(s, s)
+
+    def calculate_gradient(self, points):
+        """Calculates the energy and the gradient with respect to the internal coordinates.
+
+        Parameters
+        ----------
+        points : np.array
+
+        Returns
+        -------
+        energy : float
+        gradient : np.array
+
+        """
+        nuclei_array = self.create_nuclei_array(points)
+        orbital_guess = self.orbital_guess if self.warm_start else None
+        if self.energy_object.analytic_gradient():
+            with logger.quiet():
+                basis_set = read_basis_set_file(self.basis_file, nuclei_array)
+                energy, gradient = self.energy_object.calculate_gradient(nuclei_array, basis_set, orbital_guess)
+            self.orbital_guess = self.energy_object.orbital_guess
+        else:
+            energy, gradient = self.finite_difference.gradient(nuclei_array, orbital_guess)
+            self.orbital_guess = self.finite_difference.orbital_guess
+        return energy, self.internal_gradient(gradient)
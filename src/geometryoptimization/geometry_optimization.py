@@ -0,0 +1,125 @@
+import numpy as np
+from src.common import create_quaternion
+from src.common import normalize
+from src.common import quaternion_rotation
+from src.common import theta, phi
+from src.objects import Nuclei
+
+
+class GeometryOptimization:
+    """Internal coordinate layout shared by the geometry optimizers.
+
+    The molecule is translated so the first nuclei sits at the origin, then rotated so the second nuclei lies on the z
+    axis and the third nuclei in the yz plane. The remaining degrees of freedom are the z coordinate of the second
+    nuclei, the y and z coordinates of the third nuclei and the x, y and z coordinates of every other nuclei.
+
+    Attributes
+    ----------
+    basis_file : str
+    energy_object : Energy
+    first_nuclei : List[Nuclei]
+    nuclei_list : List[Nuclei]
+    m : int
+        The number of internal coordinates.
+
+    """
+    def __init__(self, basis_file, energy_object, nuclei_list):
+        self.basis_file = basis_file
+        self.energy_object = energy_object
+        self.first_nuclei, self.nuclei_list = self.reorient_molecule(nuclei_list)
+        if len(self.nuclei_list) == 1:
+            self.m = 1
+        else:
+            self.m = len(self.nuclei_list) * 3 - 3
+
+    def initial_points(self):
+        """Returns the internal coordinates of the reoriented molecule.
+
+        Returns
+        -------
+        initial_points : List[float]
+
+        """
+        initial_points = []
+        for i, nuclei in enumerate(self.nuclei_list):
+            if i == 0:
+                initial_points.append(nuclei.coordinates[2])
+            elif i == 1:
+                initial_points.append(nuclei.coordinates[1])
+                initial_points.append(nuclei.coordinates[2])
+            else:
+                initial_points.append(nuclei.coordinates[0])
+                initial_points.append(nuclei.coordinates[1])
+                initial_points.append(nuclei.coordinates[2])
+        return initial_points
+
+    def internal_gradient(self, gradient):
+        """Picks the derivatives with respect to the internal coordinates out of a cartesian gradient.
+
+        Parameters
+        ----------
+        gradient : np.array
+            One row of x, y and z derivatives for each nuclei, including the first nuclei.
+
+        Returns
+        -------
+        : np.array
+
+        """
+        internal_gradient = []
+        for i in range(len(self.nuclei_list)):
+            if i == 0:
+                internal_gradient.append(gradient[i + 1, 2])
+            elif i == 1:
+                internal_gradient.append(gradient[i + 1, 1])
+                internal_gradient.append(gradient[i + 1, 2])
+            else:
+                internal_gradient.append(gradient[i + 1, 0])
+                internal_gradient.append(gradient[i + 1, 1])
+                internal_gradient.append(gradient[i + 1, 2])
+        return np.array(internal_gradient)
+
+    def create_nuclei_array(self, coordinate_list):
+        nuclei_array = []
+        j = 0
+        for i, nuclei in enumerate(self.nuclei_list):
+            if i == 0:
+                coordinates = (0.0, 0.0, coordinate_list.item(j))
+                j += 1
+            elif i == 1:
+                coordinates = (0.0, coordinate_list.item(j), coordinate_list.item(j+1))
+                j += 2
+            else:
+                coordinates = (coordinate_list.item(j), coordinate_list.item(j+1), coordinate_list.item(j+2))
+                j += 3
+            nuclei_array.append(Nuclei(nuclei.element, nuclei.charge, nuclei.mass, coordinates))
+        return self.first_nuclei + nuclei_array
+
+    def reorient_molecule(self, nuclei_list):
+        first_nuclei = nuclei_list.pop(0)
+        coordinates = first_nuclei.coordinates
+        first_nuclei.coordinates = (0, 0, 0)
+
+        for nuclei in nuclei_list:
+            x = nuclei.coordinates[0] - coordinates[0]
+            y = nuclei.coordinates[1] - coordinates[1]
+            z = nuclei.coordinates[2] - coordinates[2]
+            nuclei.coordinates = (x, y, z)
+
+        if len(nuclei_list) >= 1:
+            second_nuclei = nuclei_list[0]
+            coordinates = normalize(second_nuclei.coordinates)
+
+            quaternion = create_quaternion((-coordinates[1], coordinates[0], 0.0), -theta(coordinates))
+            for nuclei in nuclei_list:
+                nuclei.coordinates = quaternion_rotation(quaternion, nuclei.coordinates)
+
+        if len(nuclei_list) >= 2:
+            third_nuclei = nuclei_list[1]
+            coordinates = normalize(third_nuclei.coordinates)
+
+            quaternion = create_quaternion((0.0, 0.0, 1.0), -phi(coordinates) + np.pi/2)
+            for nuclei in nuclei_list:
+                nuclei.coordinates = quaternion_rotation(quaternion, nuclei.coordinates)
+
+        return [first_nuclei], nuclei_list
@@ -1,34 +1,29 @@
-import heapq, os
-from contextlib import redirect_stdout
+import heapq
+from collections import deque
 import numpy as np
-from src.common import create_quaternion
-from src.common import normalize
-from src.common import quaternion_rotation
-from src.common import read_basis_set_file
-from src.common import theta, phi
-
-
-class NelderMead:
-
-    def __init__(self, basis_file, energy_object, nuclei_list, tau=0.25, threshold=1e-6):
-        self.basis_file = basis_file
-        self.energy_object = energy_object
-        self.first_nuclei, self.nuclei_list = self.reorient_molecule(nuclei_list)
-        if len(self.nuclei_list) == 1:
-            self.m = 1
-        else:
-            self.m = len(self.nuclei_list) * 3 - 3
+from src.common import logger
+from src.energy import EnergyPool
+from src.geometryoptimization.geometry_optimization import GeometryOptimization
+
+
+class NelderMead(GeometryOptimization):
+
+    def __init__(self, basis_file, energy_object, nuclei_list, tau=0.25, threshold=1e-6, warm_start=True, processes=1):
+        super().__init__(basis_file, energy_object, nuclei_list)
         self.alpha = 1
         self.beta = 2 + (2 / self.m)
         self.gamma = 0.75 + (1 / (2 * self.m))
         self.delta = 0.5 - (1 / self.m)
         self.tau = tau
         self.threshold = threshold
+        self.warm_start = warm_start
+        self.orbital_guesses = deque(maxlen=2 * (self.m + 1))
+        self.energy_pool = EnergyPool(energy_object, basis_file, processes)
 
     def optimize(self):
-        print('\n*************************************************************************************************')
-        print('\nELECTRONIC STRUCTURE METHOD: {}'.format(self.energy_object.method))
-        print('\nBEGIN NELDER-MEAD OPTIMIZATION')
+        logger.separator()
+        logger.log('\nELECTRONIC STRUCTURE METHOD: {}'.format(self.energy_object.method))
+        logger.log('\nBEGIN NELDER-MEAD OPTIMIZATION')
 
         simplex_matrix, energy_list = self.build_initial_simplex()
 
@@ -83,7 +78,7 @@ class NelderMead:
                     simplex_matrix = self.shrink_simplex(simplex_matrix, energy_list)
                     energy_list = self.calculate_simplex_energies(simplex_matrix)
 
-            print("ENERGY: {}, DEV: {}".format(min(energy_list), np.std(energy_list)))
+            logger.log("ENERGY: {}, DEV: {}".format(min(energy_list), np.std(energy_list)))
 
             if np.std(energy_list) <= self.threshold:
                 break
@@ -92,18 +87,7 @@ class NelderMead:
 
     def build_initial_simplex(self):
 
-        initial_points = []
-        for i, nuclei in enumerate(self.nuclei_list):
-            if i == 0:
-                initial_points.append(nuclei.coordinates[2])
-            elif i == 1:
-                initial_points.append(nuclei.coordinates[1])
-                initial_points.append(nuclei.coordinates[2])
-            else:
-                initial_points.append(nuclei.coordinates[0])
-                initial_points.append(nuclei.coordinates[1])
-                initial_points.append(nuclei.coordinates[2])
-        initial_points = np.matrix(initial_points).T
+        initial_points = np.matrix(self.initial_points()).T
 
         simplex_matrix = np.copy(initial_points)
         for i in range(self.m):
@@ -117,31 +101,61 @@ class NelderMead:
         return simplex_matrix, energy_list
 
     def calculate_simplex_energies(self, simplex_matrix):
+        coordinate_lists = [simplex_matrix[:, i] for i in range(self.m + 1)]
+
+        # converge one vertex first so the vertices evaluated concurrently can all be warm-started from it
         energy_list = []
-        for i in range(self.m + 1):
-            energy = self.calculate_energy(simplex_matrix[:, i])
-            energy_list.append(energy)
+        if self.warm_start and len(self.orbital_guesses) == 0 and self.energy_pool.processes > 1:
+            energy_list.append(self.calculate_energy(coordinate_lists.pop(0)))
+
+        energy_list += self.calculate_energies(coordinate_lists)
         return energy_list
 
     def calculate_energy(self, coordinate_list):
+        return self.calculate_energies([coordinate_list])[0]
 
-        j = 0
-        for i, nuclei in enumerate(self.nuclei_list):
-            if i == 0:
-                nuclei.coordinates = (0.0, 0.0, coordinate_list.item(j))
-                j += 1
-            elif i == 1:
-                nuclei.coordinates = (0.0, coordinate_list.item(j), coordinate_list.item(j+1))
-                j += 2
-            else:
-                nuclei.coordinates = (coordinate_list.item(j), coordinate_list.item(j+1), coordinate_list.item(j+2))
-                j += 3
+    def calculate_energies(self, coordinate_lists):
+        """Calculates the energies of independent vertices, concurrently if the energy pool has more than one process.
 
-        with redirect_stdout(open(os.devnull, "w")):
-            basis_set = read_basis_set_file(self.basis_file, self.first_nuclei + self.nuclei_list)
-            energy = self.energy_object.calculate_energy(self.first_nuclei + self.nuclei_list, basis_set)
+        Parameters
+        ----------
+        coordinate_lists : List[np.matrix]
 
-        return energy
+        Returns
+        -------
+        energy_list : List[float]
+
+        """
+        nuclei_arrays = [self.create_nuclei_array(coordinate_list) for coordinate_list in coordinate_lists]
+        orbital_guesses = [self.closest_orbital_guess(coordinate_list) for coordinate_list in coordinate_lists]
+
+        energy_list = []
+        for coordinate_list, (energy, orbital_guess) in zip(
+            coordinate_lists, self.energy_pool.calculate(nuclei_arrays, orbital_guesses)
+        ):
+            if self.warm_start and orbital_guess is not None:
+                self.orbital_guesses.append((np.array(coordinate_list).flatten(), orbital_guess))
+            energy_list.append(energy)
+
+        return energy_list
+
+    def closest_orbital_guess(self, coordinate_list):
+        """Returns the converged orbitals of the previously evaluated geometry closest to the new geometry.
+
+        Parameters
+        ----------
+        coordinate_list : np.matrix
+
+        Returns
+        -------
+        : {None, OrbitalGuess}
+
+        """
+        if not self.warm_start or len(self.orbital_guesses) == 0:
+            return None
+        coordinates = np.array(coordinate_list).flatten()
+        distances = [np.linalg.norm(coordinates - points) for points, orbital_guess in self.orbital_guesses]
+        return self.orbital_guesses[int(np.argmin(distances))][1]
 
     def replace_max_energy(self, simplex_matrix, energy_list, max_energy_index, new_points, new_energy):
         del energy_list[max_energy_index]
@@ -156,32 +170,3 @@ class NelderMead:
         min_points_matrix = np.tile(min_points, (self.m + 1, ))
         simplex_matrix = min_points_matrix + self.delta * (simplex_matrix - min_points_matrix)
         return simplex_matrix
-
-    def reorient_molecule(self, nuclei_list):
-        first_nuclei = nuclei_list.pop(0)
-        coordinates = first_nuclei.coordinates
-        first_nuclei.coordinates = (0, 0, 0)
-
-        for nuclei in nuclei_list:
-            x = nuclei.coordinates[0] - coordinates[0]
-            y = nuclei.coordinates[1] - coordinates[1]
-            z = nuclei.coordinates[2] - coordinates[2]
-            nuclei.coordinates = (x, y, z)
-
-        if len(nuclei_list) >= 1:
-            second_nuclei = nuclei_list[0]
-            coordinates = normalize(second_nuclei.coordinates)
-
-            quaternion = create_quaternion((-coordinates[1], coordinates[0], 0.0), -theta(coordinates))
-            for nuclei in nuclei_list:
-                nuclei.coordinates = quaternion_rotation(quaternion, nuclei.coordinates)
-
-        if len(nuclei_list) >= 2:
-            third_nuclei = nuclei_list[1]
-            coordinates = normalize(third_nuclei.coordinates)
-
-            quaternion = create_quaternion((0.0, 0.0, 1.0), -phi(coordinates) + np.pi/2)
-            for nuclei in nuclei_list:
-                nuclei.coordinates = quaternion_rotation(quaternion, nuclei.coordinates)
-
-        return [first_nuclei], nuclei_list
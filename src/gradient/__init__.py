@@ -0,0 +1,2 @@
+from src.gradient.derivative_basis import derivative_basis
+from src.gradient.restricted_gradient import RestrictedGradient
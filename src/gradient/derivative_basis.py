@@ -0,0 +1,49 @@
+from src.objects import Basis
+from src.objects import PrimitiveBasis
+
+
+def derivative_basis(basis, axis):
+    """Differentiates a contracted gaussian with respect to one coordinate of the centre it is attached to.
+
+    The derivative of a cartesian primitive with respect to its centre is 2a g(l + 1) - l g(l - 1), so the derivative
+    of the contracted function is a combination of the basis function with the angular momentum along the axis raised
+    and lowered by one. The normalisation constants of the original functions are folded into the contraction
+    coefficients so the returned functions can be used in any of the existing integral routines.
+
+    Parameters
+    ----------
+    basis : Basis
+    axis : int
+        0, 1 or 2 for the x, y or z coordinate of the centre.
+
+    Returns
+    -------
+    derivative_array : List[Basis]
+        The raised function and, if the angular momentum along the axis is not zero, the lowered function. The
+        derivative is their sum.
+
+    """
+    exponents = basis.integral_exponents
+    raised_exponents = tuple(l + 1 if i == axis else l for i, l in enumerate(exponents))
+    lowered_exponents = tuple(l - 1 if i == axis else l for i, l in enumerate(exponents))
+
+    raised_array = []
+    lowered_array = []
+    for primitive in basis.primitive_gaussian_array:
+        contraction = primitive.contraction * primitive.normalisation
+        raised = PrimitiveBasis(2 * primitive.exponent * contraction, primitive.exponent, primitive.coordinates,
+        raised_exponents)
+        raised.normalisation_memo = 1.0
+        raised_array.append(raised)
+        if exponents[axis] > 0:
+            lowered = PrimitiveBasis(- exponents[axis] * contraction, primitive.exponent, primitive.coordinates,
+            lowered_exponents)
+            lowered.normalisation_memo = 1.0
+            lowered_array.append(lowered)
+
+    derivative_array = [Basis(raised_array, basis.coordinates, raised_exponents)]
+    if exponents[axis] > 0:
+        derivative_array.append(Basis(lowered_array, basis.coordinates, lowered_exponents))
+    for derivative in derivative_array:
+        derivative.normalisation_memo = basis.normalisation
+    return derivative_array
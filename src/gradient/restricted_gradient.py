@@ -0,0 +1,151 @@
+import itertools
+from multiprocessing import Pool
+import numpy as np
+from src.common import coordinate_distance
+from src.common import coulomb_gradient
+from src.common import instrumentation
+from src.gradient import derivative_basis
+from src.integrals import ObaraSaika
+from src.matrixelements import KineticEnergyMatrix
+from src.matrixelements import NuclearAttractionMatrix
+from src.matrixelements import OrbitalOverlapMatrix
+
+
+class RestrictedGradient:
+    """Analytic nuclear gradient of the restricted hartree fock energy.
+
+    dE/dx = sum D h^x + sum P (uv|ls)^x - sum W S^x + dV_nn/dx, where D is the density matrix, W is the energy weighted
+    density matrix and P is the two particle density matrix of a single determinant. Only the derivatives of the basis
+    functions on the displaced nuclei are needed and the Hellmann-Feynman part of the nuclear attraction derivative is
+    recovered from the basis function derivatives by translational invariance.
+
+    Attributes
+    ----------
+    electron_energy : float
+    nuclei_array : List[Nuclei]
+    basis_set_array : List[Basis]
+    density_matrix : np.array
+    energy_weighted_density_matrix : np.array
+    two_particle_density : np.array
+    processes : int
+
+    """
+    def __init__(self, hartree_fock, processes=1):
+        self.electron_energy, orbital_energies, orbital_coefficients = hartree_fock.begin_scf()
+        orbital_coefficients = hartree_fock.cartesian_coefficients(orbital_coefficients)
+        self.nuclei_array = hartree_fock.nuclei_array
+        self.basis_set_array = hartree_fock.basis_set_array
+        self.processes = processes
+
+        occupied_orbitals = hartree_fock.electrons // 2
+        orbital_energies = np.array(orbital_energies).flatten()[:occupied_orbitals]
+        occupied_coefficients = np.array(orbital_coefficients)[:, :occupied_orbitals]
+        self.density_matrix = 2 * occupied_coefficients @ occupied_coefficients.T
+        self.energy_weighted_density_matrix = 2 * occupied_coefficients @ np.diag(orbital_energies) \
+        @ occupied_coefficients.T
+
+        d = self.density_matrix
+        self.two_particle_density = (1/2) * np.einsum('ij,kl->ijkl', d, d) \
+        - (1/8) * (np.einsum('ik,jl->ijkl', d, d) + np.einsum('il,jk->ijkl', d, d))
+
+    def nuclei_index(self, basis):
+        for i, nuclei in enumerate(self.nuclei_array):
+            if coordinate_distance(nuclei.coordinates, basis.coordinates) < 1e-8:
+                return i
+
+    def gradient(self):
+        """Calculates the gradient of the total energy, including the nuclear repulsion.
+
+        The two electron part is invariant to translating every basis function at once, so the derivatives of the
+        nuclei carrying the most basis functions are recovered as minus the sum of the others instead of integrated.
+
+        Returns
+        -------
+        gradient : np.array
+            One row of x, y and z derivatives for each nuclei.
+
+        """
+        centres = [self.nuclei_index(basis) for basis in self.basis_set_array]
+        reference = max(range(len(self.nuclei_array)), key=centres.count)
+        keys = list(itertools.product(range(len(self.basis_set_array)), range(3)))
+        repulsion_keys = [(i, axis) for i, axis in keys if centres[i] != reference]
+
+        if self.processes > 1:
+            pool = Pool(self.processes)
+            one_electron = instrumentation.starmap(pool, self.one_electron_derivative, keys)
+            two_electron = instrumentation.starmap(pool, self.two_electron_derivative, repulsion_keys)
+            pool.close()
+        else:
+            one_electron = [self.one_electron_derivative(*key) for key in keys]
+            two_electron = [self.two_electron_derivative(*key) for key in repulsion_keys]
+
+        gradient = coulomb_gradient(self.nuclei_array)
+        for (i, axis), (basis_term, hellmann_feynman) in zip(keys, one_electron):
+            gradient[centres[i], axis] += basis_term
+            gradient[:, axis] += hellmann_feynman
+
+        repulsion_gradient = np.zeros((len(self.nuclei_array), 3))
+        for (i, axis), repulsion in zip(repulsion_keys, two_electron):
+            repulsion_gradient[centres[i], axis] += repulsion
+        repulsion_gradient[reference] = - repulsion_gradient.sum(axis=0)
+
+        return gradient + repulsion_gradient
+
+    def one_electron_derivative(self, i, axis):
+        """Contracts the derivatives of the one electron integrals of basis function i along an axis.
+
+        Parameters
+        ----------
+        i : int
+        axis : int
+
+        Returns
+        -------
+        basis_term : float
+            The contribution to the derivative of the nuclei basis function i is centered on.
+        hellmann_feynman : np.array
+            The contributions to the derivatives of every nuclei from moving the operator of its nuclear attraction.
+
+        """
+        basis_term = 0.0
+        hellmann_feynman = np.zeros(len(self.nuclei_array))
+        for derivative in derivative_basis(self.basis_set_array[i], axis):
+            for j, basis_j in enumerate(self.basis_set_array):
+                basis_pair = [derivative, basis_j]
+                overlap = OrbitalOverlapMatrix(basis_pair).calculate(0, 1)
+                kinetic = KineticEnergyMatrix(basis_pair).calculate(0, 1)
+                attraction = np.array([
+                    NuclearAttractionMatrix(basis_pair, [nuclei]).calculate(0, 1) for nuclei in self.nuclei_array
+                ])
+                basis_term += 2 * self.density_matrix[i, j] * (kinetic + attraction.sum())
+                basis_term -= 2 * self.energy_weighted_density_matrix[i, j] * overlap
+                hellmann_feynman -= 2 * self.density_matrix[i, j] * attraction
+        return basis_term, hellmann_feynman
+
+    def two_electron_derivative(self, i, axis):
+        """Contracts the derivatives of the two electron repulsion integrals of basis function i along an axis.
+
+        The two particle density has the same permutational symmetry as the integrals, so only the first index is
+        differentiated, with a factor of four, and only l <= s is calculated.
+
+        Parameters
+        ----------
+        i : int
+        axis : int
+
+        Returns
+        -------
+        repulsion : float
+
+        """
+        integral = ObaraSaika()
+        repulsion = 0.0
+        matrix_size = len(self.basis_set_array)
+        for derivative in derivative_basis(self.basis_set_array[i], axis):
+            for j, k, l in itertools.product(range(matrix_size), repeat=3):
+                if k <= l:
+                    factor = 4 if k == l else 8
+                    repulsion += factor * self.two_particle_density[i, j, k, l] * integral.integrate(
+                        derivative, self.basis_set_array[j], self.basis_set_array[k], self.basis_set_array[l]
+                    )
+        return repulsion
@@ -1,9 +1,17 @@
 from src.hartreefock.linear_algebra import LinearAlgebra
 from src.hartreefock.linear_algebra import BlockedLinearAlgebra
+from src.hartreefock.linear_algebra import SymmetryAdaptedLinearAlgebra
+from src.hartreefock.orbital_guess import OrbitalGuess
 from src.hartreefock.total_energy import TotalEnergy
 from src.hartreefock.fock_matrix import FockMatrixRestricted
 from src.hartreefock.fock_matrix import FockMatrixUnrestricted
+from src.hartreefock.fock_matrix import IncrementalFockMatrixRestricted
 from src.hartreefock.fock_matrix import BlockedFockMatrixUnrestricted
+from src.hartreefock.fock_matrix import DensityFittedFockMatrixRestricted
+from src.hartreefock.fock_matrix import DensityFittedFockMatrixUnrestricted
+from src.hartreefock.fock_matrix import coulomb_exchange
+from src.hartreefock.fock_matrix import fitted_coulomb_exchange
+from src.hartreefock.fock_matrix import screened_coulomb_exchange
 from src.hartreefock.scf_procedure import SelfConsistentField
 from src.hartreefock.scf_procedure import RestrictedSCF
 from src.hartreefock.scf_procedure import PopleNesbetBerthier
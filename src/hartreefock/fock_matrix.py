@@ -1,5 +1,7 @@
-import itertools
+import numpy as np
+from src.common import instrumentation
 from src.matrixelements import Matrix
+from src.matrixelements import scratch_space
 
 
 class FockMatrixRestricted(Matrix):
@@ -10,16 +12,55 @@ class FockMatrixRestricted(Matrix):
         self.core_hamiltonian = core_hamiltonian
 
     def create(self, density_matrix):
+        (coulomb,), (exchange,) = coulomb_exchange(self.repulsion_matrix, [density_matrix])
+        return self.core_hamiltonian + coulomb - 1/2 * exchange
+
+
+class IncrementalFockMatrixRestricted(FockMatrixRestricted):
+    """Restricted Fock matrix built from the change in the density since the previous build.
+
+    F_n = F_{n-1} + G(D_n - D_{n-1}), G being the coulomb less half the exchange matrix. Only the pairs (a, b) of the
+    density change whose Schwarz bound on their coulomb or exchange contribution is over screening are contracted, and
+    as the SCF converges the change, and so the number of pairs, shrinks. The screened contributions add up from build
+    to build, so every rebuild_interval builds the two electron part is built in full from the density.
+
+    Attributes
+    ----------
+    rebuild_interval : int
+    screening : float
+    schwarz : np.array
+        sqrt((ab|ab)) of each pair.
+    builds : int
+    density_matrix : {None, np.array}
+        The density of the previous build.
+    two_electron : {None, np.array}
+        G of the density of the previous build.
+
+    """
+    def __init__(self, core_hamiltonian, repulsion_matrix, rebuild_interval=8, screening=1e-12):
+        super().__init__(core_hamiltonian, repulsion_matrix)
+        if rebuild_interval < 1:
+            raise ValueError('the fock rebuild interval must be at least 1, not {}'.format(rebuild_interval))
+        self.rebuild_interval = rebuild_interval
+        self.screening = screening
+        self.schwarz = np.sqrt(np.abs(np.einsum('abab->ab', repulsion_matrix)))
+        self.builds = 0
+        self.density_matrix = None
+        self.two_electron = None
 
-        def calculate_restricted(i, j):
-            g_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                coulomb_integral = self.repulsion_matrix.item(i, j, a, b)
-                exchange_integral = self.repulsion_matrix.item(i, b, a, j)
-                g_ij += density_matrix.item(a, b) * (coulomb_integral - 1/2 * exchange_integral)
-            return g_ij
-
-        return self.core_hamiltonian + self.create_matrix(calculate_restricted)
+    def create(self, density_matrix):
+        density_matrix = np.asarray(density_matrix)
+        if self.builds % self.rebuild_interval == 0:
+            (coulomb,), (exchange,) = coulomb_exchange(self.repulsion_matrix, [density_matrix])
+            self.two_electron = coulomb - 1/2 * exchange
+        else:
+            coulomb, exchange = screened_coulomb_exchange(
+                self.repulsion_matrix, density_matrix - self.density_matrix, self.schwarz, self.screening
+            )
+            self.two_electron = self.two_electron + coulomb - 1/2 * exchange
+        self.builds += 1
+        self.density_matrix = density_matrix
+        return self.core_hamiltonian + self.two_electron
 
 
 class FockMatrixUnrestricted(Matrix):
@@ -30,26 +71,10 @@ class FockMatrixUnrestricted(Matrix):
         self.core_hamiltonian = core_hamiltonian
 
     def create(self, density_matrix_alph, density_matrix_beta):
-        density_matrix_total = density_matrix_alph + density_matrix_beta
-
-        def unrestricted_alph(i, j):
-            g_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                coulomb = density_matrix_total.item(a, b) * self.repulsion_matrix.item(i, j, a, b)
-                exchange = density_matrix_alph.item(a, b) * self.repulsion_matrix.item(i, b, a, j)
-                g_ij += coulomb - exchange
-            return g_ij
-
-        def unrestricted_beta(i, j):
-            g_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                coulomb = density_matrix_total.item(a, b) * self.repulsion_matrix.item(i, j, a, b)
-                exchange = density_matrix_beta.item(a, b) * self.repulsion_matrix.item(i, b, a, j)
-                g_ij += coulomb - exchange
-            return g_ij
-
-        fock_matrix_alph = self.core_hamiltonian + self.create_matrix(unrestricted_alph)
-        fock_matrix_beta = self.core_hamiltonian + self.create_matrix(unrestricted_beta)
+        (coulomb_alph, coulomb_beta), (exchange_alph, exchange_beta) \
+            = coulomb_exchange(self.repulsion_matrix, [density_matrix_alph, density_matrix_beta])
+        fock_matrix_alph = self.core_hamiltonian + coulomb_alph + coulomb_beta - exchange_alph
+        fock_matrix_beta = self.core_hamiltonian + coulomb_alph + coulomb_beta - exchange_beta
         return fock_matrix_alph, fock_matrix_beta
 
 
@@ -61,21 +86,131 @@ class BlockedFockMatrixUnrestricted(Matrix):
         self.core_hamiltonian = core_hamiltonian
 
     def create(self, density_matrix):
-
-        def coulomb(i, j):
-            j_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                coulomb_integral = self.repulsion_matrix.item(i, j, a, b)
-                j_ij += density_matrix.item(a, b) * coulomb_integral
-            return j_ij
-
-        def exchange(i, j):
-            j_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                exchange_integral = self.repulsion_matrix.item(i, b, a, j)
-                j_ij += density_matrix.item(a, b) * exchange_integral
-            return j_ij
-
-        coulomb = self.create_matrix(coulomb)
-        exchange = self.create_matrix(exchange)
+        (coulomb,), (exchange,) = coulomb_exchange(self.repulsion_matrix, [density_matrix])
         return self.core_hamiltonian + coulomb - exchange
+
+
+class DensityFittedFockMatrixRestricted(Matrix):
+
+    def __init__(self, core_hamiltonian, fitted_integrals):
+        super().__init__(fitted_integrals.shape[1])
+        self.fitted_integrals = fitted_integrals
+        self.core_hamiltonian = core_hamiltonian
+
+    def create(self, density_matrix):
+        (coulomb,), (exchange,) = fitted_coulomb_exchange(self.fitted_integrals, [density_matrix])
+        return self.core_hamiltonian + coulomb - 1/2 * exchange
+
+
+class DensityFittedFockMatrixUnrestricted(Matrix):
+
+    def __init__(self, core_hamiltonian, fitted_integrals):
+        super().__init__(fitted_integrals.shape[1])
+        self.fitted_integrals = fitted_integrals
+        self.core_hamiltonian = core_hamiltonian
+
+    def create(self, density_matrix_alph, density_matrix_beta):
+        (coulomb_alph, coulomb_beta), (exchange_alph, exchange_beta) \
+            = fitted_coulomb_exchange(self.fitted_integrals, [density_matrix_alph, density_matrix_beta])
+        fock_matrix_alph = self.core_hamiltonian + coulomb_alph + coulomb_beta - exchange_alph
+        fock_matrix_beta = self.core_hamiltonian + coulomb_alph + coulomb_beta - exchange_beta
+        return fock_matrix_alph, fock_matrix_beta
+
+
+def coulomb_exchange(repulsion_matrix, density_matrices):
+    """Creates the coulomb matrix J_ij = sum_ab (ij|ab) D_ab and exchange matrix K_ij = sum_ab (ib|aj) D_ab of each
+    density matrix, reading the repulsion tensor once in blocks of its first index.
+
+    Parameters
+    ----------
+    repulsion_matrix : np.array
+    density_matrices : List[np.matrix]
+
+    Returns
+    -------
+    coulomb_matrices : List[np.array]
+    exchange_matrices : List[np.array]
+
+    """
+    instrumentation.count('fock_builds', len(density_matrices))
+    matrix_size = repulsion_matrix.shape[0]
+    density_matrices = [np.asarray(density_matrix) for density_matrix in density_matrices]
+    coulomb_matrices = [np.zeros((matrix_size, matrix_size)) for _ in density_matrices]
+    exchange_matrices = [np.zeros((matrix_size, matrix_size)) for _ in density_matrices]
+
+    for block in scratch_space.blocks(matrix_size, matrix_size**3):
+        repulsion_block = np.asarray(repulsion_matrix[block])
+        for density_matrix, coulomb, exchange in zip(density_matrices, coulomb_matrices, exchange_matrices):
+            coulomb[block] = np.tensordot(repulsion_block, density_matrix, axes=([2, 3], [0, 1]))
+            exchange[block] = np.tensordot(repulsion_block, density_matrix, axes=([1, 2], [1, 0]))
+
+    return coulomb_matrices, exchange_matrices
+
+
+def screened_coulomb_exchange(repulsion_matrix, density_matrix, schwarz, screening):
+    """Creates the coulomb and exchange matrices of a density matrix from the pairs (a, b) of the density whose
+    Schwarz bound on their contribution is over screening. The bound is max_ij sqrt((ij|ij)) sqrt((ab|ab)) |D_ab| on
+    the (ij|ab) D_ab of the coulomb matrix and max_i sqrt((ib|ib)) max_j sqrt((aj|aj)) |D_ab| on the (ib|aj) D_ab of the
+    exchange matrix, so each is screened with its own pairs.
+
+    Parameters
+    ----------
+    repulsion_matrix : np.array
+    density_matrix : np.array
+    schwarz : np.array
+        sqrt((ab|ab)) of each pair.
+    screening : float
+
+    Returns
+    -------
+    coulomb : np.array
+    exchange : np.array
+
+    """
+    matrix_size = repulsion_matrix.shape[0]
+    schwarz_max = schwarz.max(axis=0)
+    a_coulomb, b_coulomb = np.nonzero(schwarz.max() * schwarz * np.abs(density_matrix) > screening)
+    a_exchange, b_exchange = np.nonzero(np.outer(schwarz_max, schwarz_max) * np.abs(density_matrix) > screening)
+    instrumentation.count('fock_builds')
+    instrumentation.count('coulomb_pairs_screened', matrix_size**2 - len(a_coulomb))
+    instrumentation.count('exchange_pairs_screened', matrix_size**2 - len(a_exchange))
+    coulomb = np.zeros((matrix_size, matrix_size))
+    exchange = np.zeros((matrix_size, matrix_size))
+    if len(a_coulomb) == 0 and len(a_exchange) == 0:
+        return coulomb, exchange
+
+    density_coulomb = density_matrix[a_coulomb, b_coulomb]
+    density_exchange = density_matrix[a_exchange, b_exchange]
+    pairs = len(a_coulomb) + len(a_exchange)
+    for block in scratch_space.blocks(matrix_size, matrix_size**3 + matrix_size * pairs):
+        repulsion_block = np.asarray(repulsion_matrix[block])
+        coulomb[block] = repulsion_block[:, :, a_coulomb, b_coulomb] @ density_coulomb
+        exchange[block] = np.einsum('ipj,p->ij', repulsion_block[:, b_exchange, a_exchange, :], density_exchange)
+    return coulomb, exchange
+
+
+def fitted_coulomb_exchange(fitted_integrals, density_matrices):
+    """Creates the coulomb and exchange matrices of each density matrix from the fitted integrals B_Qij of density
+    fitting, J_ij = sum_Q B_Qij sum_ab B_Qab D_ab and K_ij = sum_Q sum_ab B_Qib D_ab B_Qaj.
+
+    Parameters
+    ----------
+    fitted_integrals : np.array
+    density_matrices : List[np.matrix]
+
+    Returns
+    -------
+    coulomb_matrices : List[np.array]
+    exchange_matrices : List[np.array]
+
+    """
+    instrumentation.count('fock_builds', len(density_matrices))
+    coulomb_matrices = []
+    exchange_matrices = []
+    for density_matrix in density_matrices:
+        density_matrix = np.asarray(density_matrix)
+        fitted_density = np.tensordot(fitted_integrals, density_matrix, axes=([1, 2], [0, 1]))
+        coulomb_matrices.append(np.tensordot(fitted_density, fitted_integrals, axes=([0], [0])))
+        half_transformed = fitted_integrals @ density_matrix.T
+        exchange_matrices.append(np.tensordot(half_transformed, fitted_integrals, axes=([0, 2], [0, 1])))
+    return coulomb_matrices, exchange_matrices
@@ -1,48 +1,183 @@
-import time
 import numpy as np
+from src.common import instrumentation
+from src.common import logger
+from src.common.logger import DEBUG
 from src.hartreefock import BlockedFockMatrixUnrestricted
 from src.hartreefock import BlockedLinearAlgebra
 from src.hartreefock import BlockedUnrestrictedSCF
+from src.hartreefock import DensityFittedFockMatrixRestricted
+from src.hartreefock import DensityFittedFockMatrixUnrestricted
 from src.hartreefock import FockMatrixRestricted
 from src.hartreefock import FockMatrixUnrestricted
+from src.hartreefock import IncrementalFockMatrixRestricted
 from src.hartreefock import LinearAlgebra
 from src.hartreefock import PopleNesbetBerthier
 from src.hartreefock import RestrictedSCF
+from src.hartreefock import SymmetryAdaptedLinearAlgebra
 from src.matrixelements import KineticEnergyMatrix
 from src.matrixelements import NuclearAttractionMatrix
 from src.matrixelements import OrbitalOverlapMatrix
-from src.matrixelements import TwoElectronRepulsionMatrixOS
+from src.matrixelements import DensityFitting
+from src.integrals import integral_autotuner
+from src.matrixelements import TwoElectronRepulsion
+from src.matrixelements import basis_set_hash
 from src.matrixelements import blocked_spin_basis_set
+from src.matrixelements import checkpoint
+from src.matrixelements import repulsion_cache
+from src.matrixelements import spherical_repulsion
+from src.matrixelements import spherical_transformation
 
 
 class HartreeFock:
+    """Sets up the one and two electron integrals of a self consistent field calculation.
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes):
+    With an auxiliary basis set the two electron integrals are density fitted, fitted_integrals replacing the
+    repulsion tensor, which is then None. The integral engine is ObaraSaika unless another is named, or 'auto' is
+    given or the autotuner already has the timings of the basis set, as tuning can take longer than the integrals.
+
+    """
+    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, orbital_guess=None,
+    spherical=False, integral_engine=None, occupations=None, auxiliary_basis_set=None):
         self.scf_method = None
+        self.orbital_guess = orbital_guess
+        self.orbital_coefficients = None
         self.nuclei_array = nuclei_array
         self.basis_set_array = basis_set_array
         self.electrons = electrons
         self.symmetry = symmetry
-        self.orbital_overlap = OrbitalOverlapMatrix(basis_set_array).create()
-        self.kinetic_energy = KineticEnergyMatrix(basis_set_array).create()
-        self.nuclear_attraction = NuclearAttractionMatrix(basis_set_array, nuclei_array).create()
+        with instrumentation.timer('one_electron'):
+            self.orbital_overlap = OrbitalOverlapMatrix(basis_set_array).create()
+            self.kinetic_energy = KineticEnergyMatrix(basis_set_array).create()
+            self.nuclear_attraction = NuclearAttractionMatrix(basis_set_array, nuclei_array).create()
+        self.spherical_transformation = None
+        if spherical:
+            self.spherical_transformation = spherical_transformation(basis_set_array, self.orbital_overlap)
+            self.orbital_overlap = self.spherical_matrix(self.orbital_overlap)
+            self.kinetic_energy = self.spherical_matrix(self.kinetic_energy)
+            self.nuclear_attraction = self.spherical_matrix(self.nuclear_attraction)
         self.core_hamiltonian = self.kinetic_energy + self.nuclear_attraction
-        self.linear_algebra = LinearAlgebra(self.orbital_overlap)
-        print('\n*************************************************************************************************')
-        print('\nMATRICES\n')
-        print('\nORBITAL OVERLAP MATRIX\n{}'.format(self.orbital_overlap))
-        print('\nKINETIC ENERGY MATRIX\n{}'.format(self.kinetic_energy))
-        print('\nNUCLEAR POTENTIAL ENERGY MATRIX\n{}'.format(self.nuclear_attraction))
-        print('\nCORE HAMILTONIAN MATRIX\n{}'.format(self.core_hamiltonian))
-        print('\nBEGIN TWO ELECTRON REPULSION CALCULATION')
-        start_repulsion = time.clock()
-        self.repulsion = TwoElectronRepulsionMatrixOS(
-            self.basis_set_array, self.symmetry, processes
-        ).create_repulsion_matrix()
-        print('TIME TAKEN: ' + str(time.clock() - start_repulsion) + 's\n')
-        print('\n*************************************************************************************************')
+        self.linear_algebra = self.create_linear_algebra(occupations)
+        logger.separator()
+        logger.log('\nMATRICES\n', level=DEBUG)
+        logger.matrix('ORBITAL OVERLAP MATRIX', self.orbital_overlap)
+        logger.matrix('KINETIC ENERGY MATRIX', self.kinetic_energy)
+        logger.matrix('NUCLEAR POTENTIAL ENERGY MATRIX', self.nuclear_attraction)
+        logger.matrix('CORE HAMILTONIAN MATRIX', self.core_hamiltonian)
+        logger.log('\nBASIS FUNCTIONS: {}', self.core_hamiltonian.shape[0])
+        logger.log('\nBEGIN TWO ELECTRON REPULSION CALCULATION')
+        if integral_engine is None:
+            integral_engine = 'auto' if integral_autotuner.cached(basis_set_array) else 'OS'
+        # everything besides the basis set the saved state of the checkpoint depends on, extended by the subclasses
+        self.checkpoint_options = [
+            type(self).__name__, 'electrons {}'.format(electrons), 'spherical' if spherical else 'cartesian',
+            symmetry.point_group.label, 'occupations {}'.format(occupations)
+        ]
+        if auxiliary_basis_set is not None:
+            self.checkpoint_options.append(basis_set_hash(auxiliary_basis_set, 'auxiliary'))
+        self.fitted_integrals = None
+        with instrumentation.timer('two_electron') as timer:
+            if auxiliary_basis_set is not None:
+                logger.log('DENSITY FITTED WITH {} AUXILIARY BASIS FUNCTIONS', len(auxiliary_basis_set))
+                self.repulsion = None
+                self.fitted_integrals = DensityFitting(
+                    self.basis_set_array, auxiliary_basis_set, self.integral_engine(integral_engine), processes
+                ).create_fitted_integrals()
+                if spherical:
+                    self.fitted_integrals = self.spherical_matrix(self.fitted_integrals)
+            else:
+                self.repulsion = repulsion_cache.load(self.basis_set_array, integral_engine)
+                if self.repulsion is None and checkpoint.restart:
+                    self.repulsion = checkpoint.repulsion_cache().load(self.basis_set_array, integral_engine)
+                if self.repulsion is None:
+                    self.repulsion = TwoElectronRepulsion(
+                        self.basis_set_array, self.integral_engine(integral_engine), self.symmetry, processes
+                    ).create_repulsion_matrix()
+                    repulsion_cache.save(self.basis_set_array, integral_engine, self.repulsion)
+                    checkpoint.repulsion_cache().save(self.basis_set_array, integral_engine, self.repulsion)
+                else:
+                    logger.log('LOADED FROM THE INTEGRAL CACHE')
+                if spherical:
+                    self.repulsion = spherical_repulsion(self.repulsion, self.spherical_transformation)
+        logger.log('TIME TAKEN: {}s\n', timer.seconds)
+        logger.separator()
+
+    def create_linear_algebra(self, occupations):
+        """Blocks the SCF by irreducible representation if the molecule has symmetry or occupations are given.
+
+        Parameters
+        ----------
+        occupations : {None, List[int]}
+            The number of doubly occupied orbitals of each irreducible representation.
+
+        Returns
+        -------
+        : LinearAlgebra
+
+        """
+        if occupations is None and self.symmetry.point_group.label == 'C_{1}':
+            return LinearAlgebra(self.orbital_overlap)
+        if self.spherical_transformation is not None:
+            if occupations is not None:
+                raise ValueError(
+                    'occupations of irreducible representations are not available for spherical basis sets'
+                )
+            return LinearAlgebra(self.orbital_overlap)
+        salc, irreps = self.symmetry.symmetry_adapted_basis()
+        logger.log('\nSYMMETRY ADAPTED BASIS FUNCTIONS OF EACH IRREDUCIBLE REPRESENTATION')
+        for label, columns in irreps:
+            logger.log('{}: {}'.format(label, columns.stop - columns.start))
+        return SymmetryAdaptedLinearAlgebra(self.orbital_overlap, salc, irreps, occupations)
+
+    def integral_engine(self, integral_engine):
+        """Creates the two electron integral engine, tuned to the basis set if integral_engine is 'auto'.
+
+        Parameters
+        ----------
+        integral_engine : str
+            'auto' or the name of an engine of the autotuner, e.g. 'OS', 'HGP', 'CHGP', 'Rys' or 'Cook'.
+
+        Returns
+        -------
+        : object
+
+        """
+        if integral_engine != 'auto':
+            return integral_autotuner.engines[integral_engine]()
+        dispatch = integral_autotuner.tune(self.basis_set_array)
+        logger.log('INTEGRAL ENGINE OF EACH ANGULAR MOMENTUM CLASS')
+        for key, engine in sorted(dispatch.engines.items()):
+            logger.log('{}: {}'.format(key, type(engine).__name__))
+        return dispatch
+
+    def open_checkpoint(self):
+        """Starts the checkpoint of the SCF keyed by the basis set and the checkpoint options, so a restart with other
+        options than those the saved state was calculated with starts afresh rather than loading it.
+
+        """
+        checkpoint.open(self.basis_set_array, ' '.join(self.checkpoint_options))
+
+    def spherical_matrix(self, matrix):
+        return self.spherical_transformation.T @ matrix @ self.spherical_transformation
+
+    def cartesian_coefficients(self, orbital_coefficients):
+        """Expands orbital coefficients of the spherical basis set in the cartesian basis functions.
+
+        Parameters
+        ----------
+        orbital_coefficients : np.array
+
+        Returns
+        -------
+        : np.array
+
+        """
+        if self.spherical_transformation is None:
+            return orbital_coefficients
+        return self.spherical_transformation @ orbital_coefficients
 
     def initial_guess(self):
+        if self.orbital_guess is not None:
+            return self.orbital_guess.project(self.basis_set_array, self.orbital_overlap, self.spherical_transformation)
         initial_orbital_energies, initial_orbital_coefficients = self.linear_algebra.diagonalize(self.core_hamiltonian)
         return initial_orbital_coefficients
 
@@ -56,69 +191,124 @@ class HartreeFock:
 
 class Restricted(HartreeFock):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
 
     def begin_scf(self):
-        initial_coefficients = self.initial_guess()
-        print('COEFFICIENTS INITIAL GUESS\n{}'.format(initial_coefficients))
-        print('\n\nBEGIN SCF PROCEDURE')
-        start = time.clock()
-        electron_energy, orbital_energies, orbital_coefficients = self.scf_method.begin_iterations(initial_coefficients)
-        print('TIME TAKEN: ' + str(time.clock() - start) + 's\n')
-        print('\nORBITAL ENERGY EIGENVALUES\n{}'.format(orbital_energies))
-        print('\nORBITAL COEFFICIENTS\n{}'.format(orbital_coefficients), end='\n\n\n')
+        self.open_checkpoint()
+        state = checkpoint.load('scf')
+        with instrumentation.timer('scf') as timer:
+            if state is None:
+                initial_coefficients = self.initial_guess()
+                logger.matrix('COEFFICIENTS INITIAL GUESS', initial_coefficients)
+                logger.log('\n\nBEGIN SCF PROCEDURE')
+                electron_energy, orbital_energies, orbital_coefficients \
+                    = self.scf_method.begin_iterations(initial_coefficients)
+                checkpoint.save(
+                    'scf', electron_energy=electron_energy, orbital_energies=orbital_energies,
+                    orbital_coefficients=orbital_coefficients
+                )
+            else:
+                logger.log('\n\nCONVERGED SCF LOADED FROM THE CHECKPOINT')
+                electron_energy = float(state['electron_energy'])
+                orbital_energies, orbital_coefficients = state['orbital_energies'], state['orbital_coefficients']
+        logger.log('TIME TAKEN: {}s\n', timer.seconds)
+        self.orbital_coefficients = self.cartesian_coefficients(orbital_coefficients)
+        logger.log('\nORBITAL ENERGY EIGENVALUES\n{}', orbital_energies)
+        logger.matrix('ORBITAL COEFFICIENTS', orbital_coefficients)
+        logger.record('scf', electron_energy=electron_energy, orbital_energies=orbital_energies, seconds=timer.seconds)
 
         return electron_energy, orbital_energies, orbital_coefficients
 
 
 class RestrictedHF(Restricted):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, fock_rebuild_interval=None,
+    **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
+        self.checkpoint_options.append('fock rebuild interval {}'.format(fock_rebuild_interval))
         self.scf_method = RestrictedSCF(
-            self.linear_algebra, self.electrons, self.orbital_overlap,
-            FockMatrixRestricted(self.core_hamiltonian, self.repulsion)
+            self.linear_algebra, self.electrons, self.orbital_overlap, self.fock_matrix(fock_rebuild_interval)
         )
-        print('\nBEGIN RESTRICTED HARTREE FOCK\n')
+        logger.log('\nBEGIN RESTRICTED HARTREE FOCK\n')
+
+    def fock_matrix(self, fock_rebuild_interval):
+        """Creates the Fock matrix factory of the SCF.
+
+        Parameters
+        ----------
+        fock_rebuild_interval : {None, int}
+            If not None the Fock matrix is built from the change in the density, in full every fock_rebuild_interval
+            builds. Not used with density fitting.
+
+        Returns
+        -------
+        : Matrix
+
+        """
+        if self.fitted_integrals is not None:
+            return DensityFittedFockMatrixRestricted(self.core_hamiltonian, self.fitted_integrals)
+        if fock_rebuild_interval is not None:
+            return IncrementalFockMatrixRestricted(self.core_hamiltonian, self.repulsion, fock_rebuild_interval)
+        return FockMatrixRestricted(self.core_hamiltonian, self.repulsion)
 
 
 class Unrestricted(HartreeFock):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
 
     def begin_scf(self):
-        initial_coefficients = self.initial_guess()
-        print('COEFFICIENTS INITIAL GUESS\n{}'.format(initial_coefficients))
-        print('\n\nBEGIN SCF PROCEDURE')
-        start = time.clock()
-        electron_energy, energies_alpha, energies_beta, coefficients_alpha, coefficients_beta \
-            = self.scf_method.begin_iterations(initial_coefficients)
-        print('TIME TAKEN: ' + str(time.clock() - start) + 's\n')
-        print('\nALPHA ORBITAL ENERGY EIGENVALUES\n{}'.format(energies_alpha))
-        print('\nBETA ORBITAL ENERGY EIGENVALUES\n{}'.format(energies_beta))
-        print('\nALPHA ORBITAL COEFFICIENTS\n{}'.format(coefficients_alpha), end='\n')
-        print('\nBETA ORBITAL COEFFICIENTS\n{}'.format(coefficients_beta), end='\n\n\n')
+        self.open_checkpoint()
+        state = checkpoint.load('scf')
+        with instrumentation.timer('scf') as timer:
+            if state is None:
+                initial_coefficients = self.initial_guess()
+                logger.matrix('COEFFICIENTS INITIAL GUESS', initial_coefficients)
+                logger.log('\n\nBEGIN SCF PROCEDURE')
+                electron_energy, energies_alpha, energies_beta, coefficients_alpha, coefficients_beta \
+                    = self.scf_method.begin_iterations(initial_coefficients)
+                checkpoint.save(
+                    'scf', electron_energy=electron_energy, energies_alpha=energies_alpha,
+                    energies_beta=energies_beta, coefficients_alpha=coefficients_alpha,
+                    coefficients_beta=coefficients_beta
+                )
+            else:
+                logger.log('\n\nCONVERGED SCF LOADED FROM THE CHECKPOINT')
+                electron_energy = float(state['electron_energy'])
+                energies_alpha, energies_beta = state['energies_alpha'], state['energies_beta']
+                coefficients_alpha, coefficients_beta = state['coefficients_alpha'], state['coefficients_beta']
+        logger.log('TIME TAKEN: {}s\n', timer.seconds)
+        logger.log('\nALPHA ORBITAL ENERGY EIGENVALUES\n{}', energies_alpha)
+        logger.log('\nBETA ORBITAL ENERGY EIGENVALUES\n{}', energies_beta)
+        logger.matrix('ALPHA ORBITAL COEFFICIENTS', coefficients_alpha)
+        logger.matrix('BETA ORBITAL COEFFICIENTS', coefficients_beta)
+        logger.record(
+            'scf', electron_energy=electron_energy, orbital_energies_alpha=energies_alpha,
+            orbital_energies_beta=energies_beta, seconds=timer.seconds
+        )
 
         return electron_energy, energies_alpha, energies_beta, coefficients_alpha, coefficients_beta
 
 
 class UnrestrictedHF(Unrestricted):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, multiplicity, symmetry, processes):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, multiplicity, symmetry, processes, **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
+        self.checkpoint_options.append('multiplicity {}'.format(multiplicity))
         self.scf_method = PopleNesbetBerthier(
             self.linear_algebra, self.electrons, multiplicity,
-            FockMatrixUnrestricted(self.core_hamiltonian, self.repulsion)
+            FockMatrixUnrestricted(self.core_hamiltonian, self.repulsion) if self.fitted_integrals is None
+            else DensityFittedFockMatrixUnrestricted(self.core_hamiltonian, self.fitted_integrals)
         )
-        print('\nBEGIN UNRESTRICTED HARTREE FOCK\n')
+        logger.log('\nBEGIN UNRESTRICTED HARTREE FOCK\n')
 
 
 class BlockedHartreeFock(Restricted):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, multiplicity, symmetry, processes):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, multiplicity, symmetry, processes, **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
+        self.checkpoint_options.append('multiplicity {}'.format(multiplicity))
         self.zeros = np.zeros((self.orbital_overlap.shape[0], self.orbital_overlap.shape[0]))
 
         self.orbital_overlap = np.block([
@@ -135,4 +325,4 @@ class BlockedHartreeFock(Restricted):
         self.linear_algebra = BlockedLinearAlgebra(self.orbital_overlap)
         self.scf_method = BlockedUnrestrictedSCF(self.linear_algebra, self.electrons, multiplicity,
         self.orbital_overlap, BlockedFockMatrixUnrestricted(self.core_hamiltonian, self.repulsion))
-        print('\nBEGIN BLOCKED UNRESTRICTED HARTREE FOCK\n')
+        logger.log('\nBEGIN BLOCKED UNRESTRICTED HARTREE FOCK\n')
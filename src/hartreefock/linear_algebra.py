@@ -86,3 +86,60 @@ class BlockedLinearAlgebra(LinearAlgebra):
         s_matrix_eigenvalues = [x**(-1/2) for x in s_matrix_eigenvalues]
         x_canonical = s_matrix_unitary @ np.diag(s_matrix_eigenvalues)
         return x_canonical
+
+
+class SymmetryAdaptedLinearAlgebra(LinearAlgebra):
+    """Diagonalizes the Fock matrix as one small eigenproblem for each irreducible representation.
+
+    The transformation matrix is built from the symmetry adapted linear combinations, so the orthonormal Fock matrix is
+    block diagonal and its columns are grouped by irreducible representation.
+
+    Attributes
+    ----------
+    salc : np.array
+    irreps : List[Tuple[str, slice]]
+        The label and columns of the salc matrix of each irreducible representation.
+    occupations : {None, List[int]}
+        The number of doubly occupied orbitals of each irreducible representation, which are put first, or None to
+        order every orbital by energy.
+
+    """
+    def __init__(self, orbital_overlap, salc, irreps, occupations=None):
+        if occupations is not None and len(occupations) != len(irreps):
+            raise ValueError('{} occupations given for {} irreducible representations'.format(
+                len(occupations), len(irreps)
+            ))
+        self.salc = salc
+        self.irreps = irreps
+        self.occupations = occupations
+        super().__init__(orbital_overlap)
+
+    def diagonalize(self, fock_matrix):
+        orthonormal_h_matrix = self.transformation_matrix.T @ fock_matrix @ self.transformation_matrix
+        matrix_size = orthonormal_h_matrix.shape[0]
+        orbital_energies = np.zeros(matrix_size)
+        orbital_coefficients = np.zeros((matrix_size, matrix_size))
+        occupied = set()
+
+        for i, (_, columns) in enumerate(self.irreps):
+            if columns.start == columns.stop:
+                continue
+            energies, coefficients = np.linalg.eigh(orthonormal_h_matrix[columns, columns])
+            orbital_energies[columns] = energies
+            orbital_coefficients[columns, columns] = coefficients
+            if self.occupations is not None:
+                occupied.update(range(columns.start, columns.start + self.occupations[i]))
+
+        sort = sorted(range(matrix_size), key=lambda k: (k not in occupied, orbital_energies[k]))
+        orbital_energies = orbital_energies[sort]
+        orbital_coefficients = self.transformation_matrix @ orbital_coefficients[:, sort]
+        return orbital_energies, orbital_coefficients
+
+    def create_transformation_matrix(self, orbital_overlap):
+        blocks = []
+        for _, columns in self.irreps:
+            if columns.start == columns.stop:
+                continue
+            salc = self.salc[:, columns]
+            blocks.append(salc @ super().create_transformation_matrix(salc.T @ orbital_overlap @ salc))
+        return np.hstack(blocks)
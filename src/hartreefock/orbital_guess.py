@@ -0,0 +1,75 @@
+import itertools
+import numpy as np
+from src.integrals import orbital_overlap
+
+
+class OrbitalGuess:
+    """Converged orbital coefficients of a previous calculation used to start the SCF of a nearby geometry.
+
+    Attributes
+    ----------
+    basis_set_array : List[Basis]
+        The basis set the orbital coefficients were converged in.
+    orbital_coefficients : np.array
+        The orbital coefficients of the cartesian basis functions.
+
+    """
+    def __init__(self, basis_set_array, orbital_coefficients):
+        self.basis_set_array = basis_set_array
+        self.orbital_coefficients = orbital_coefficients
+
+    def project(self, basis_set_array, overlap, transformation=None):
+        """Projects the orbitals onto a new basis set and orthonormalizes them in the new metric.
+
+        The orbitals are projected with C' = S^-1 S' C, where S' is the mixed overlap between the new and old basis
+        sets. The projected orbitals are orthonormalized with a Cholesky decomposition so that the space spanned by the
+        first k orbitals, and therefore the occupied space, is preserved.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+        overlap : np.array
+            The orbital overlap matrix of the new basis set.
+        transformation : {None, np.array}
+            Projects onto the spherical functions of the new basis set made by this transformation of its cartesian
+            functions.
+
+        Returns
+        -------
+        orbital_coefficients : np.array
+
+        """
+        mixed_overlap = mixed_overlap_matrix(basis_set_array, self.basis_set_array)
+        if transformation is not None:
+            mixed_overlap = transformation.T @ mixed_overlap
+        orbital_coefficients = np.linalg.solve(overlap, mixed_overlap @ self.orbital_coefficients)
+        metric = orbital_coefficients.T @ overlap @ orbital_coefficients
+        lower = np.linalg.cholesky(metric)
+        return orbital_coefficients @ np.linalg.inv(lower).T
+
+
+def mixed_overlap_matrix(basis_set_i, basis_set_j):
+    """Creates the overlap matrix between two different basis sets.
+
+    Parameters
+    ----------
+    basis_set_i : List[Basis]
+    basis_set_j : List[Basis]
+
+    Returns
+    -------
+    matrix : np.array
+
+    """
+    matrix = np.zeros((len(basis_set_i), len(basis_set_j)))
+    for i, j in itertools.product(range(len(basis_set_i)), range(len(basis_set_j))):
+        s_ij = 0
+        for primitive_a, primitive_b in itertools.product(basis_set_i[i].primitive_gaussian_array,
+        basis_set_j[j].primitive_gaussian_array):
+            c_1 = primitive_a.contraction
+            c_2 = primitive_b.contraction
+            n_1 = primitive_a.normalisation
+            n_2 = primitive_b.normalisation
+            s_ij += n_1 * n_2 * c_1 * c_2 * orbital_overlap(primitive_a, primitive_b)
+        matrix[i, j] = basis_set_i[i].normalisation * basis_set_j[j].normalisation * s_ij
+    return matrix
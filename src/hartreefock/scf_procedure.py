@@ -1,6 +1,9 @@
+from src.common import instrumentation
+from src.common import logger
 from src.diismethod import DIIS
 from src.hartreefock import TotalEnergy
 from src.matrixelements import blocked_density_matrix
+from src.matrixelements import checkpoint
 from src.matrixelements import density_matrix_restricted
 from src.matrixelements import density_matrix_unrestricted
 
@@ -24,15 +27,27 @@ class RestrictedSCF(SelfConsistentField):
     def begin_iterations(self, orbital_coefficients):
         orbital_energies = []
         previous_total_energy = 0
+        iterations = 0
+
+        state = checkpoint.load('scf_iterations')
+        if state is not None:
+            orbital_energies, orbital_coefficients = state['orbital_energies'], state['orbital_coefficients']
+            previous_total_energy = float(state['total_energy'])
+            iterations = int(state['iterations'])
+            self.diis.fock_array = list(state['diis_fock'])
+            self.diis.error_array = list(state['diis_error'])
+            self.diis.begin = bool(state['diis_begin'])
+            logger.log('SCF RESTARTED FROM ITERATION {} OF THE CHECKPOINT', iterations)
 
         while True:
 
+            instrumentation.count('scf_iterations')
             density_matrix = density_matrix_restricted(orbital_coefficients, self.electrons)
             fock_matrix = self.hamiltonian_matrix_factory.create(density_matrix)
             total_energy = self.calculate.restricted(density_matrix, fock_matrix)
             delta_energy = previous_total_energy - total_energy
             previous_total_energy = total_energy
-            print('SCF ENERGY: ' + str(total_energy) + ' a.u.')
+            logger.log('SCF ENERGY: ' + str(total_energy) + ' a.u.')
 
             if abs(delta_energy) < self.threshold:
                 break
@@ -40,6 +55,14 @@ class RestrictedSCF(SelfConsistentField):
             fock_matrix = self.diis.fock_matrix(fock_matrix, density_matrix)
             orbital_energies, orbital_coefficients = self.linear_algebra.diagonalize(fock_matrix)
 
+            iterations += 1
+            if checkpoint.due(iterations):
+                checkpoint.save(
+                    'scf_iterations', orbital_energies=orbital_energies, orbital_coefficients=orbital_coefficients,
+                    total_energy=total_energy, iterations=iterations, diis_fock=self.diis.fock_array,
+                    diis_error=self.diis.error_array, diis_begin=self.diis.begin
+                )
+
         return total_energy, orbital_energies, orbital_coefficients
 
 
@@ -59,6 +82,7 @@ class PopleNesbetBerthier(SelfConsistentField):
 
         while True:
 
+            instrumentation.count('scf_iterations')
             if total_energy == 0:
                 density_matrix_alph = density_matrix_unrestricted(coefficients_alph, coefficients_alph.shape[0])
                 density_matrix_beta = density_matrix_unrestricted(coefficients_beta, 0)
@@ -75,7 +99,7 @@ class PopleNesbetBerthier(SelfConsistentField):
             )
             delta_energy = previous_total_energy - total_energy
             previous_total_energy = total_energy
-            print('SCF ENERGY: ' + str(total_energy) + ' a.u.')
+            logger.log('SCF ENERGY: ' + str(total_energy) + ' a.u.')
 
             if abs(delta_energy) < self.threshold:
                 break
@@ -100,6 +124,7 @@ class BlockedUnrestrictedSCF(SelfConsistentField):
 
         while True:
 
+            instrumentation.count('scf_iterations')
             if total_energy == 0:
                 density_matrix = blocked_density_matrix(orbital_coefficients, orbital_coefficients.shape[0] // 2, 0)
             else:
@@ -109,7 +134,7 @@ class BlockedUnrestrictedSCF(SelfConsistentField):
             total_energy = self.calculate.restricted(density_matrix, fock_matrix)
             delta_energy = previous_total_energy - total_energy
             previous_total_energy = total_energy
-            print('SCF ENERGY: ' + str(total_energy) + ' a.u.')
+            logger.log('SCF ENERGY: ' + str(total_energy) + ' a.u.')
 
             if abs(delta_energy) < self.threshold:
                 break
@@ -7,3 +7,9 @@ from src.integrals.nuclear_attraction_integral import nuclear_attraction
 from src.integrals.twoelectronrepulsion import ObaraSaika
 from src.integrals.twoelectronrepulsion import HeadGordonPople
 from src.integrals.twoelectronrepulsion import ElectronRepulsion
+from src.integrals.twoelectronrepulsion import ContractedHeadGordonPople
+from src.integrals.twoelectronrepulsion import RysQuadrature
+from src.integrals.twoelectronrepulsion import AngularMomentumDispatch
+from src.integrals.twoelectronrepulsion import angular_momentum_class
+from src.integrals.twoelectronrepulsion import IntegralAutotuner
+from src.integrals.twoelectronrepulsion import integral_autotuner
@@ -1,4 +1,5 @@
 from math import exp, gamma
+from src.common import instrumentation
 
 
 def boys_function(v, x):
@@ -22,6 +23,9 @@ def boys_function(v, x):
     [1] Handbook of Computational Chemistry pg. 280
 
     """
+    if instrumentation.enabled:
+        instrumentation.count('boys_function')
+
     # Approximation of the boys function for small x
     if x <= 25:
         i = 0
@@ -1,6 +1,6 @@
 from math import exp, pi
-from scipy.special import factorial2
 from src.common import coordinate_distance
+from src.common import double_factorial
 from src.common import gaussian_product_coordinate
 from src.common import vector_minus
 from src.integrals import binomial_coefficient
@@ -9,7 +9,7 @@ from src.integrals import binomial_coefficient
 def s_function(l_1, l_2, a, b, g):
     s = 0
     for j in range(((l_1 + l_2) // 2) + 1):
-        s += binomial_coefficient(2 * j, l_1, l_2, a, b) * (factorial2(2 * j - 1) / (2 * g)**j)
+        s += binomial_coefficient(2 * j, l_1, l_2, a, b) * (double_factorial(2 * j - 1) / (2 * g)**j)
     return s
 
 
@@ -1,3 +1,9 @@
 from src.integrals.twoelectronrepulsion.cook_integral import ElectronRepulsion
 from src.integrals.twoelectronrepulsion.obara_saika_scheme import ObaraSaika
 from src.integrals.twoelectronrepulsion.head_gordon_pople import HeadGordonPople
+from src.integrals.twoelectronrepulsion.contracted_head_gordon_pople import ContractedHeadGordonPople
+from src.integrals.twoelectronrepulsion.rys_quadrature import RysQuadrature
+from src.integrals.twoelectronrepulsion.angular_momentum_dispatch import AngularMomentumDispatch
+from src.integrals.twoelectronrepulsion.angular_momentum_dispatch import angular_momentum_class
+from src.integrals.twoelectronrepulsion.integral_autotuner import IntegralAutotuner
+from src.integrals.twoelectronrepulsion.integral_autotuner import integral_autotuner
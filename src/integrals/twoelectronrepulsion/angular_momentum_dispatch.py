@@ -0,0 +1,36 @@
+class AngularMomentumDispatch:
+    """Integrates each quartet with the engine chosen for its angular momentum class.
+
+    Attributes
+    ----------
+    engines : Dict[Tuple[int, int, int, int], object]
+        The engine of each class (l_i, l_j, l_k, l_l), any object with an integrate method.
+    default : object
+        The engine of every class not in engines.
+
+    """
+    def __init__(self, engines, default):
+        self.engines = engines
+        self.default = default
+
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        engine = self.engines.get(angular_momentum_class(basis_i, basis_j, basis_k, basis_l), self.default)
+        return engine.integrate(basis_i, basis_j, basis_k, basis_l)
+
+
+def angular_momentum_class(basis_i, basis_j, basis_k, basis_l):
+    """Returns the total angular momentum of each basis function of a quartet.
+
+    Parameters
+    ----------
+    basis_i : Basis
+    basis_j : Basis
+    basis_k : Basis
+    basis_l : Basis
+
+    Returns
+    -------
+    : Tuple[int, int, int, int]
+
+    """
+    return tuple(sum(basis.integral_exponents) for basis in (basis_i, basis_j, basis_k, basis_l))
@@ -0,0 +1,70 @@
+import itertools
+from math import comb
+import numpy as np
+from src.integrals.twoelectronrepulsion.head_gordon_pople import HeadGordonPople
+
+
+class ContractedHeadGordonPople(HeadGordonPople):
+    """Head-Gordon-Pople scheme with the horizontal recursion applied to contracted integrals.
+
+    The horizontal recursion (a, b + 1_r| = (a + 1_r, b| + AB_r (a, b| does not depend on the exponents, so the
+    vertical recursion only builds the primitive [e0|f0] integrals, which are summed over the primitive quartets
+    before the angular momentum is transferred once per contracted quartet. The horizontal recursion is applied in
+    its closed form (a, b| = sum_t C(b, t) AB^(b - t) (a + t, 0| as a matrix product on the contracted [e0|f0].
+
+    """
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        if sum(basis_i.integral_exponents) < sum(basis_j.integral_exponents):
+            basis_i, basis_j = basis_j, basis_i
+        if sum(basis_k.integral_exponents) < sum(basis_l.integral_exponents):
+            basis_k, basis_l = basis_l, basis_k
+
+        l_total = sum(basis_i.integral_exponents) + sum(basis_j.integral_exponents) \
+        + sum(basis_k.integral_exponents) + sum(basis_l.integral_exponents)
+        bra_exponents, bra_coefficients = self.horizontal_expansion(basis_i, basis_j)
+        ket_exponents, ket_coefficients = self.horizontal_expansion(basis_k, basis_l)
+
+        n = basis_i.normalisation * basis_j.normalisation * basis_k.normalisation * basis_l.normalisation
+
+        contracted = np.zeros((len(bra_exponents), len(ket_exponents)))
+        for g1, g2, g3, g4 in itertools.product(basis_i.primitive_gaussian_array, basis_j.primitive_gaussian_array,
+        basis_k.primitive_gaussian_array, basis_l.primitive_gaussian_array):
+            contraction = g1.contraction * g2.contraction * g3.contraction * g4.contraction * g1.normalisation \
+            * g2.normalisation * g3.normalisation * g4.normalisation * n
+
+            self.begin_primitive_quartet(l_total, g1, g2, g3, g4)
+            for (x, e), (y, f) in itertools.product(enumerate(bra_exponents), enumerate(ket_exponents)):
+                contracted[x, y] += contraction * self.hgp_vertical(0, e, f)
+
+        return bra_coefficients @ contracted @ ket_coefficients
+
+    @staticmethod
+    def horizontal_expansion(basis_a, basis_b):
+        """Expands (ab| in the integrals (e0| of the horizontal recursion.
+
+        Parameters
+        ----------
+        basis_a : Basis
+        basis_b : Basis
+
+        Returns
+        -------
+        exponents : List[Tuple[int, int, int]]
+            The integral exponents of each e.
+        coefficients : np.array
+            The coefficient of each (e0| in (ab|.
+
+        """
+        l_a = basis_a.integral_exponents
+        l_b = basis_b.integral_exponents
+        ab = [basis_a.coordinates[r] - basis_b.coordinates[r] for r in range(3)]
+
+        exponents = []
+        coefficients = []
+        for t in itertools.product(range(l_b[0] + 1), range(l_b[1] + 1), range(l_b[2] + 1)):
+            exponents.append((l_a[0] + t[0], l_a[1] + t[1], l_a[2] + t[2]))
+            coefficient = 1.0
+            for r in range(3):
+                coefficient *= comb(l_b[r], t[r]) * ab[r]**(l_b[r] - t[r])
+            coefficients.append(coefficient)
+        return exponents, np.array(coefficients)
@@ -2,39 +2,56 @@ import itertools
 from math import sqrt, pi, exp
 from src.common import coordinate_distance
 from src.common import gaussian_product_coordinate
+from src.common import vector_minus
 from src.integrals import boys_function
 from src.integrals import boys_function_recursion
 from src.objects import Basis
-from src.objects import PrimitiveBasis
 
 
 class HeadGordonPople:
-
+    """Head-Gordon-Pople scheme for the two electron repulsion integrals.
+
+    The horizontal recursion moves the angular momentum of the second and fourth functions onto the first and third,
+    then the vertical recursion builds the [e0|f0] integrals. Both recursions work on the integral exponents as tuples
+    of integers and memoise every intermediate of a primitive quartet, so each is calculated once.
+
+    Attributes
+    ----------
+    exponents : Tuple[float, float, float]
+        The exponents p = a_1 + a_2 and q = a_3 + a_4 of the bra and ket and a_7 = pq / (p + q).
+    centre_shifts : Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+        P - A and Q - C.
+    w_shifts : Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+        W - P and W - Q.
+    separations : Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+        A - B and C - D.
+    end_dict : Dict[int, float]
+        The integrals [00|00]^(m).
+    vertical_memo : Dict[Tuple, float]
+    horizontal_memo : Dict[Tuple, float]
+
+    """
     def __init__(self):
-        self.a_7 = 0
-        self.r_7 = ()
+        self.exponents = ()
+        self.centre_shifts = ()
+        self.w_shifts = ()
+        self.separations = ()
         self.end_dict = {}
+        self.vertical_memo = {}
+        self.horizontal_memo = {}
 
     def integrate(self, basis_i: Basis, basis_j: Basis, basis_k: Basis, basis_l: Basis):
-        if sum(basis_i.integral_exponents) < sum(basis_j.integral_exponents) \
-        and sum(basis_k.integral_exponents) < sum(basis_l.integral_exponents):
-            basis_i, basis_j, basis_k, basis_l = basis_j, basis_i, basis_l, basis_k
-        elif sum(basis_i.integral_exponents) < sum(basis_j.integral_exponents):
-            basis_i, basis_j, basis_k, basis_l = basis_j, basis_i, basis_k, basis_l
-        elif sum(basis_k.integral_exponents) < sum(basis_l.integral_exponents):
-            basis_i, basis_j, basis_k, basis_l = basis_j, basis_i, basis_k, basis_l
-
-        l_1 = basis_i.integral_exponents
-        l_2 = basis_j.integral_exponents
-        l_3 = basis_k.integral_exponents
-        l_4 = basis_l.integral_exponents
+        if sum(basis_i.integral_exponents) < sum(basis_j.integral_exponents):
+            basis_i, basis_j = basis_j, basis_i
+        if sum(basis_k.integral_exponents) < sum(basis_l.integral_exponents):
+            basis_k, basis_l = basis_l, basis_k
+
+        l_1 = tuple(basis_i.integral_exponents)
+        l_2 = tuple(basis_j.integral_exponents)
+        l_3 = tuple(basis_k.integral_exponents)
+        l_4 = tuple(basis_l.integral_exponents)
         l_total = sum(l_1) + sum(l_2) + sum(l_3) + sum(l_4)
 
-        r_1 = basis_i.coordinates
-        r_2 = basis_j.coordinates
-        r_3 = basis_k.coordinates
-        r_4 = basis_l.coordinates
-
         primitives_i = basis_i.primitive_gaussian_array
         primitives_j = basis_j.primitive_gaussian_array
         primitives_k = basis_k.primitive_gaussian_array
@@ -58,156 +75,173 @@ class HeadGordonPople:
             n_4 = g4.normalisation
             contraction = c_1 * c_2 * c_3 * c_4 * n_1 * n_2 * n_3 * n_4 * n
 
-            a_1 = g1.exponent
-            a_2 = g2.exponent
-            a_3 = g3.exponent
-            a_4 = g4.exponent
-            a_5 = a_1 + a_2
-            a_6 = a_3 + a_4
-            self.a_7 = (a_5 * a_6) / (a_5 + a_6)
-
-            r_5 = gaussian_product_coordinate(a_1, r_1, a_2, r_2)
-            r_6 = gaussian_product_coordinate(a_3, r_3, a_4, r_4)
-            self.r_7 = gaussian_product_coordinate(a_5, r_5, a_6, r_6)
-
-            r_12 = coordinate_distance(r_1, r_2)
-            r_34 = coordinate_distance(r_3, r_4)
-            r_56 = coordinate_distance(r_5, r_6)
-
-            boys_x = (a_5 * a_6 * r_56**2) / (a_5 + a_6)
-            boys_out1 = (2 * pi**(5/2)) / (a_5 * a_6 * sqrt(a_5 + a_6))
-            boys_out2 = exp(((- a_1 * a_2 * r_12**2) / a_5) - ((a_3 * a_4 * r_34**2) / a_6))
-            boys_out3 = boys_function(l_total, boys_x)
-            self.end_dict = {l_total: boys_out1 * boys_out2 * boys_out3}
-
-            m = l_total
-            while m >= 1:
-                boys_out3 = boys_function_recursion(m, boys_x, boys_out3)
-                m -= 1
-                self.end_dict[m] = boys_out1 * boys_out2 * boys_out3
-
-            ans += contraction * self.hgp_begin_horizontal(g1, g2, g4, g3)
+            self.begin_primitive_quartet(l_total, g1, g2, g3, g4)
+            ans += contraction * self.hgp_horizontal(l_1, l_2, l_3, l_4)
 
         return ans
 
-    def hgp_begin_horizontal(self, g1, g2, g3, g4):
-        l_2 = g2.integral_exponents
-        l_4 = g4.integral_exponents
-        if l_2[0] > 0:
-            return self.horizontal_recursion(0, g1, g2, g3, g4)
-        elif l_2[1] > 0:
-            return self.horizontal_recursion(1, g1, g2, g3, g4)
-        elif l_2[2] > 0:
-            return self.horizontal_recursion(2, g1, g2, g3, g4)
-        elif l_4[0] > 0:
-            return self.horizontal_recursion(0, g3, g4, g1, g2)
-        elif l_4[1] > 0:
-            return self.horizontal_recursion(1, g3, g4, g1, g2)
-        elif l_4[2] > 0:
-            return self.horizontal_recursion(2, g3, g4, g1, g2)
-        else:
-            return self.hgp_begin_vertical(0, g1, g2, g3, g4)
+    def begin_primitive_quartet(self, l_total, g1, g2, g3, g4):
+        """Sets the exponents, centre shifts and auxiliary integrals [00|00]^(m) for m <= l_total of a primitive
+        quartet and empties the memos.
 
-    def horizontal_recursion(self, r, g1, g2, g3, g4):
-        g1a1 = g2m1 = None
-        out2 = 0
-
-        d_1 = g1.contraction
-        d_2 = g2.contraction
-        a_1 = g1.exponent
-        a_2 = g2.exponent
-        r_1 = g1.coordinates
-        r_2 = g2.coordinates
-        l_1 = g1.integral_exponents
-        l_2 = g2.integral_exponents
-
-        if r == 0:
-            g1a1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0] + 1, l_1[1], l_1[2]))
-            g2m1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0] - 1, l_2[1], l_2[2]))
-        elif r == 1:
-            g1a1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1] + 1, l_1[2]))
-            g2m1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0], l_2[1] - 1, l_2[2]))
-        elif r == 2:
-            g1a1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1], l_1[2] + 1))
-            g2m1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0], l_2[1], l_2[2] - 1))
-
-        out1 = self.hgp_begin_horizontal(g1a1, g2m1, g3, g4)
-        if r_1[r] != r_2[r]:
-            out2 = (r_1[r] - r_2[r]) * self.hgp_begin_horizontal(g1, g2m1, g3, g4)
-        return out1 + out2
-
-    def hgp_begin_vertical(self, m, g1, g2, g3, g4):
-        l_1 = g1.integral_exponents
-        l_3 = g3.integral_exponents
-        if l_1[0] > 0:
-            return self.vertical_recursion(0, m, *self.hgp_vertical_factory(0, g1, g2, g3, g4))
-        if l_3[0] > 0:
-            return self.vertical_recursion(0, m, *self.hgp_vertical_factory(0, g3, g4, g1, g2))
-        if l_1[1] > 0:
-            return self.vertical_recursion(1, m, *self.hgp_vertical_factory(1, g1, g2, g3, g4))
-        if l_3[1] > 0:
-            return self.vertical_recursion(1, m, *self.hgp_vertical_factory(1, g3, g4, g1, g2))
-        if l_1[2] > 0:
-            return self.vertical_recursion(2, m, *self.hgp_vertical_factory(2, g1, g2, g3, g4))
-        if l_3[2] > 0:
-            return self.vertical_recursion(2, m, *self.hgp_vertical_factory(2, g3, g4, g1, g2))
-        else:
-            return self.end_dict[m]
-
-    def vertical_recursion(self, r, m, g1, g2, g3, g4, g5, g6):
-        out1 = out2 = out3 = out4 = out5 = 0
+        Parameters
+        ----------
+        l_total : int
+        g1 : PrimitiveBasis
+        g2 : PrimitiveBasis
+        g3 : PrimitiveBasis
+        g4 : PrimitiveBasis
 
+        """
         a_1 = g1.exponent
         a_2 = g2.exponent
         a_3 = g3.exponent
         a_4 = g4.exponent
         a_5 = a_1 + a_2
         a_6 = a_3 + a_4
+        a_7 = (a_5 * a_6) / (a_5 + a_6)
+        self.exponents = (a_5, a_6, a_7)
 
         r_1 = g1.coordinates
         r_2 = g2.coordinates
+        r_3 = g3.coordinates
+        r_4 = g4.coordinates
         r_5 = gaussian_product_coordinate(a_1, r_1, a_2, r_2)
-
-        if r_5[r] != r_1[r]:
-            out1 = (r_5[r] - r_1[r]) * self.hgp_begin_vertical(m, g1, g2, g3, g4)
-        if self.r_7[r] != r_5[r]:
-            out2 = (self.r_7[r] - r_5[r]) * self.hgp_begin_vertical((m+1), g1, g2, g3, g4)
-        if g5.integral_exponents[r] >= 0:
-            out3 = self.os_count(g1.integral_exponents[r]) * (1 / (2 * a_5)) * self.hgp_begin_vertical(m, g5, g2, g3, g4)
-            out4 = self.os_count(g1.integral_exponents[r]) * (self.a_7 / (2 * a_5**2)) * self.hgp_begin_vertical((m+1), g5, g2, g3, g4)
-        if g6.integral_exponents[r] >= 0:
-            out5 = self.os_count(g3.integral_exponents[r]) * (1 / (2*(a_5 + a_6))) * self.hgp_begin_vertical((m+1), g1, g2, g6, g4)
-
-        return out1 + out2 + out3 - out4 + out5
-
-    def os_count(self, i):
-        if i == 0:
-            return 1
+        r_6 = gaussian_product_coordinate(a_3, r_3, a_4, r_4)
+        r_7 = gaussian_product_coordinate(a_5, r_5, a_6, r_6)
+
+        self.centre_shifts = (vector_minus(r_5, r_1), vector_minus(r_6, r_3))
+        self.w_shifts = (vector_minus(r_7, r_5), vector_minus(r_7, r_6))
+        self.separations = (vector_minus(r_1, r_2), vector_minus(r_3, r_4))
+
+        r_12 = coordinate_distance(r_1, r_2)
+        r_34 = coordinate_distance(r_3, r_4)
+        r_56 = coordinate_distance(r_5, r_6)
+
+        boys_x = (a_5 * a_6 * r_56**2) / (a_5 + a_6)
+        boys_out1 = (2 * pi**(5/2)) / (a_5 * a_6 * sqrt(a_5 + a_6))
+        boys_out2 = exp(((- a_1 * a_2 * r_12**2) / a_5) - ((a_3 * a_4 * r_34**2) / a_6))
+        boys_out3 = boys_function(l_total, boys_x)
+        self.end_dict = {l_total: boys_out1 * boys_out2 * boys_out3}
+
+        m = l_total
+        while m >= 1:
+            boys_out3 = boys_function_recursion(m, boys_x, boys_out3)
+            m -= 1
+            self.end_dict[m] = boys_out1 * boys_out2 * boys_out3
+
+        self.vertical_memo = {}
+        self.horizontal_memo = {}
+
+    def hgp_horizontal(self, l_1, l_2, l_3, l_4):
+        """Returns (ab|cd) of the primitive quartet with (a, b + 1_r| = (a + 1_r, b| + AB_r (a, b|.
+
+        Parameters
+        ----------
+        l_1 : Tuple[int, int, int]
+        l_2 : Tuple[int, int, int]
+        l_3 : Tuple[int, int, int]
+        l_4 : Tuple[int, int, int]
+
+        Returns
+        -------
+        : float
+
+        """
+        key = (l_1, l_2, l_3, l_4)
+        if key in self.horizontal_memo:
+            return self.horizontal_memo[key]
+
+        for r in range(3):
+            if l_2[r] > 0:
+                l_2_lower = lower(l_2, r)
+                value = self.hgp_horizontal(raise_(l_1, r), l_2_lower, l_3, l_4)
+                if self.separations[0][r] != 0:
+                    value += self.separations[0][r] * self.hgp_horizontal(l_1, l_2_lower, l_3, l_4)
+                break
+            if l_4[r] > 0:
+                l_4_lower = lower(l_4, r)
+                value = self.hgp_horizontal(l_1, l_2, raise_(l_3, r), l_4_lower)
+                if self.separations[1][r] != 0:
+                    value += self.separations[1][r] * self.hgp_horizontal(l_1, l_2, l_3, l_4_lower)
+                break
         else:
-            return i
-
-    def hgp_vertical_factory(self, r, g1, g2, g3, g4):
-        d_1 = g1.contraction
-        d_3 = g3.contraction
-        a_1 = g1.exponent
-        a_3 = g3.exponent
-        r_1 = g1.coordinates
-        r_3 = g3.coordinates
-        l_1 = g1.integral_exponents
-        l_3 = g3.integral_exponents
-
-        if r == 0:
-            g1xm1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0] - 1, l_1[1], l_1[2]))
-            g1xm2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0] - 2, l_1[1], l_1[2]))
-            g3xm1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0] - 1, l_3[1], l_3[2]))
-            return g1xm1, g2, g3, g4, g1xm2, g3xm1
-        elif r == 1:
-            g1ym1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1] - 1, l_1[2]))
-            g1ym2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1] - 2, l_1[2]))
-            g3ym1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0], l_3[1] - 1, l_3[2]))
-            return g1ym1, g2, g3, g4, g1ym2, g3ym1
-        elif r == 2:
-            g1zm1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1], l_1[2] - 1))
-            g1zm2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1], l_1[2] - 2))
-            g3zm1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0], l_3[1], l_3[2] - 1))
-            return g1zm1, g2, g3, g4, g1zm2, g3zm1
+            value = self.hgp_vertical(0, l_1, l_3)
+
+        self.horizontal_memo[key] = value
+        return value
+
+    def hgp_vertical(self, m, l_1, l_3):
+        """Returns [e0|f0]^(m) of the primitive quartet, lowering e before f in each direction.
+
+        Parameters
+        ----------
+        m : int
+        l_1 : Tuple[int, int, int]
+        l_3 : Tuple[int, int, int]
+
+        Returns
+        -------
+        : float
+
+        """
+        key = (m, l_1, l_3)
+        if key in self.vertical_memo:
+            return self.vertical_memo[key]
+
+        for r in range(3):
+            if l_1[r] > 0:
+                value = self.vertical_recursion(0, r, m, lower(l_1, r), l_3)
+                break
+            if l_3[r] > 0:
+                value = self.vertical_recursion(1, r, m, lower(l_3, r), l_1)
+                break
+        else:
+            value = self.end_dict[m]
+
+        self.vertical_memo[key] = value
+        return value
+
+    def vertical_recursion(self, side, r, m, l_e, l_f):
+        """Raises the exponent r of e, the first function of the bra if side is 0 or of the ket if side is 1, by one.
+
+        Parameters
+        ----------
+        side : int
+        r : int
+        m : int
+        l_e : Tuple[int, int, int]
+            The integral exponents of e before raising.
+        l_f : Tuple[int, int, int]
+            The integral exponents of the first function on the other side.
+
+        Returns
+        -------
+        : float
+
+        """
+        a_5, a_6, a_7 = self.exponents
+        zeta = (a_5, a_6)[side]
+
+        def vertical(m_i, l_i, l_j):
+            return self.hgp_vertical(m_i, l_i, l_j) if side == 0 else self.hgp_vertical(m_i, l_j, l_i)
+
+        out = 0.0
+        if self.centre_shifts[side][r] != 0:
+            out += self.centre_shifts[side][r] * vertical(m, l_e, l_f)
+        if self.w_shifts[side][r] != 0:
+            out += self.w_shifts[side][r] * vertical(m + 1, l_e, l_f)
+        if l_e[r] > 0:
+            l_e_lower = lower(l_e, r)
+            out += (l_e[r] / (2 * zeta)) * (vertical(m, l_e_lower, l_f) - (a_7 / zeta) * vertical(m + 1, l_e_lower, l_f))
+        if l_f[r] > 0:
+            out += (l_f[r] / (2 * (a_5 + a_6))) * vertical(m + 1, l_e, lower(l_f, r))
+        return out
+
+
+def lower(l, r):
+    return l[:r] + (l[r] - 1,) + l[r + 1:]
+
+
+def raise_(l, r):
+    return l[:r] + (l[r] + 1,) + l[r + 1:]
@@ -0,0 +1,209 @@
+import hashlib, itertools, json, os, random, time
+from src.integrals.twoelectronrepulsion.angular_momentum_dispatch import AngularMomentumDispatch
+from src.integrals.twoelectronrepulsion.contracted_head_gordon_pople import ContractedHeadGordonPople
+from src.integrals.twoelectronrepulsion.cook_integral import ElectronRepulsion
+from src.integrals.twoelectronrepulsion.head_gordon_pople import HeadGordonPople
+from src.integrals.twoelectronrepulsion.obara_saika_scheme import ObaraSaika
+from src.integrals.twoelectronrepulsion.rys_quadrature import RysQuadrature
+
+
+class IntegralAutotuner:
+    """Picks the fastest two electron integral engine for every angular momentum class of a basis set.
+
+    Each engine is timed on a few random quartets of every class (l_i, l_j, l_k, l_l) found in the basis set. The
+    timings are memoised in process and, if a cache directory is given, saved as json, both keyed by the angular
+    momentum and contraction length of every basis function, so another geometry or run with the same basis set skips
+    the timing.
+
+    Attributes
+    ----------
+    engines : Dict[str, type]
+    samples : int
+        The number of quartets timed for each class.
+    prune_ratio : float
+        An engine this many times slower than the fastest on the first quartet of a class is not timed any further.
+    margin : float
+        The fraction of the time of the default engine, the first of engines, another must save to replace it, so a
+        class is not moved to an engine that only looks faster through noise in the timings.
+    cache_directory : {None, str}
+    timings_memo : Dict[str, Dict[str, Dict[str, float]]]
+        The mean seconds per quartet taken by each engine for each class of every basis set timed so far.
+
+    """
+    def __init__(self, engines=None, samples=8, prune_ratio=4.0, margin=0.1, cache_directory=None):
+        if engines is None:
+            engines = {
+                'OS': ObaraSaika, 'HGP': HeadGordonPople, 'CHGP': ContractedHeadGordonPople, 'Rys': RysQuadrature,
+                'Cook': ElectronRepulsion
+            }
+        self.engines = engines
+        self.samples = samples
+        self.prune_ratio = prune_ratio
+        self.margin = margin
+        self.cache_directory = cache_directory
+        self.timings_memo = {}
+
+    def tune(self, basis_set_array):
+        """Creates the dispatch that integrates every class of the basis set with its fastest engine.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+
+        Returns
+        -------
+        : AngularMomentumDispatch
+
+        """
+        default = next(iter(self.engines))
+        instances = {name: engine() for name, engine in self.engines.items()}
+
+        fastest = {}
+        for key, times in self.timings(basis_set_array).items():
+            name = min(times, key=times.get)
+            if times[name] > (1 - self.margin) * times[default]:
+                name = default
+            fastest[tuple(int(l) for l in key.split(','))] = instances[name]
+        return AngularMomentumDispatch(fastest, instances[default])
+
+    def timings(self, basis_set_array):
+        """Returns the time taken by each engine for each class of the basis set, timing it only if not cached.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+
+        Returns
+        -------
+        timings : Dict[str, Dict[str, float]]
+            The mean seconds per quartet taken by each engine keyed by the class written as 'l_i,l_j,l_k,l_l'.
+
+        """
+        signature = basis_set_signature(basis_set_array)
+        if signature in self.timings_memo:
+            return self.timings_memo[signature]
+
+        timings = self.load_cache(signature)
+        if timings is None:
+            timings = {}
+            for key, quartets in representative_quartets(basis_set_array, self.samples).items():
+                timings[','.join(str(l) for l in key)] = time_engines(self.engines, quartets, self.prune_ratio)
+            self.save_cache(signature, timings)
+
+        self.timings_memo[signature] = timings
+        return timings
+
+    def cached(self, basis_set_array):
+        """Returns True if the timings of the basis set are memoised or saved in the cache directory.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+
+        Returns
+        -------
+        : bool
+
+        """
+        signature = basis_set_signature(basis_set_array)
+        return signature in self.timings_memo or self.load_cache(signature) is not None
+
+    def cache_file(self, signature):
+        return os.path.join(self.cache_directory, 'integral_timings.' + signature + '.json')
+
+    def load_cache(self, signature):
+        if self.cache_directory is None or not os.path.isfile(self.cache_file(signature)):
+            return None
+        with open(self.cache_file(signature), 'r') as file:
+            timings = json.load(file)
+        if any(name not in times for times in timings.values() for name in self.engines):
+            return None
+        return timings
+
+    def save_cache(self, signature, timings):
+        if self.cache_directory is None:
+            return
+        os.makedirs(self.cache_directory, exist_ok=True)
+        temporary_file = self.cache_file(signature) + '.' + str(os.getpid())
+        with open(temporary_file, 'w') as file:
+            json.dump(timings, file, indent=1, sort_keys=True)
+        os.replace(temporary_file, self.cache_file(signature))
+
+
+def basis_set_signature(basis_set_array):
+    """Returns a key of the angular momenta and contraction lengths of a basis set.
+
+    Parameters
+    ----------
+    basis_set_array : List[Basis]
+
+    Returns
+    -------
+    : str
+
+    """
+    shells = sorted({(sum(basis.integral_exponents), len(basis.primitive_gaussian_array)) for basis in basis_set_array})
+    return hashlib.sha1(str(shells).encode()).hexdigest()[:16]
+
+
+def representative_quartets(basis_set_array, samples):
+    """Picks a few quartets of every angular momentum class of a basis set at random.
+
+    The functions are drawn uniformly from those of each angular momentum, so the mix of contraction lengths timed is
+    the mix found in the repulsion matrix rather than the few long contractions of the core functions.
+
+    Parameters
+    ----------
+    basis_set_array : List[Basis]
+    samples : int
+
+    Returns
+    -------
+    quartets : Dict[Tuple[int, int, int, int], List[Tuple[Basis, Basis, Basis, Basis]]]
+
+    """
+    by_momentum = {}
+    for basis in basis_set_array:
+        by_momentum.setdefault(sum(basis.integral_exponents), []).append(basis)
+
+    generator = random.Random(0)
+    quartets = {}
+    for key in itertools.product(sorted(by_momentum), repeat=4):
+        quartets[key] = [tuple(generator.choice(by_momentum[l]) for l in key) for _ in range(samples)]
+    return quartets
+
+
+def time_engines(engines, quartets, prune_ratio):
+    """Returns the mean seconds each engine takes to integrate a quartet.
+
+    The engines take turns on each quartet so a drift in the speed of the machine affects them all alike. An engine
+    more than prune_ratio times slower than the fastest on the first quartet is not timed on the rest and is given an
+    infinite time, as its mean would otherwise be taken over different quartets to the others.
+
+    Parameters
+    ----------
+    engines : Dict[str, type]
+    quartets : List[Tuple[Basis, Basis, Basis, Basis]]
+    prune_ratio : float
+
+    Returns
+    -------
+    : Dict[str, float]
+
+    """
+    instances = {name: engine() for name, engine in engines.items()}
+    times = {name: [] for name in engines}
+    for quartet in quartets:
+        for name, instance in instances.items():
+            start = time.perf_counter()
+            instance.integrate(*quartet)
+            times[name].append(time.perf_counter() - start)
+        fastest = min(times[name][0] for name in instances)
+        instances = {name: instance for name, instance in instances.items() if times[name][0] <= prune_ratio * fastest}
+    return {
+        name: sum(values) / len(values) if len(values) == len(quartets) else float('inf')
+        for name, values in times.items()
+    }
+
+
+integral_autotuner = IntegralAutotuner()
@@ -2,29 +2,43 @@ import itertools
 from math import sqrt, pi, exp
 from src.common import coordinate_distance
 from src.common import gaussian_product_coordinate
+from src.common import vector_minus
 from src.integrals import boys_function
 from src.integrals import boys_function_recursion
-from src.objects import PrimitiveBasis
 
 
 class ObaraSaika:
-
+    """Obara-Saika recursion for the two electron repulsion integrals.
+
+    The recursion works on the integral exponents of the four primitives as tuples of integers and memoises every
+    intermediate (ab|cd)^(m) of a primitive quartet, so each is calculated once however many times it is reached.
+
+    Attributes
+    ----------
+    exponents : Tuple[float, float, float]
+        The exponents p = a_1 + a_2 and q = a_3 + a_4 of the bra and ket and a_7 = pq / (p + q).
+    centre_shifts : Tuple[Tuple[float, float, float], ...]
+        P - A, P - B, Q - C and Q - D.
+    w_shifts : Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+        W - P and W - Q.
+    end_dict : Dict[int, float]
+        The integrals [00|00]^(m).
+    memo : Dict[Tuple, float]
+
+    """
     def __init__(self):
-        self.a_7 = 0
-        self.r_7 = ()
+        self.exponents = ()
+        self.centre_shifts = ()
+        self.w_shifts = ()
         self.end_dict = {}
+        self.memo = {}
 
     def integrate(self, basis_i, basis_j, basis_k, basis_l):
-        l_1 = basis_i.integral_exponents
-        l_2 = basis_j.integral_exponents
-        l_3 = basis_k.integral_exponents
-        l_4 = basis_l.integral_exponents
-        l_total = sum(l_1) + sum(l_2) + sum(l_3) + sum(l_4)
-
-        r_1 = basis_i.coordinates
-        r_2 = basis_j.coordinates
-        r_3 = basis_k.coordinates
-        r_4 = basis_l.coordinates
+        l = (
+            tuple(basis_i.integral_exponents), tuple(basis_j.integral_exponents),
+            tuple(basis_k.integral_exponents), tuple(basis_l.integral_exponents)
+        )
+        l_total = sum(l[0]) + sum(l[1]) + sum(l[2]) + sum(l[3])
 
         primitives_i = basis_i.primitive_gaussian_array
         primitives_j = basis_j.primitive_gaussian_array
@@ -49,147 +63,142 @@ class ObaraSaika:
             n_4 = g4.normalisation
             contraction = c_1 * c_2 * c_3 * c_4 * n_1 * n_2 * n_3 * n_4 * n
 
-            a_1 = g1.exponent
-            a_2 = g2.exponent
-            a_3 = g3.exponent
-            a_4 = g4.exponent
-            a_5 = a_1 + a_2
-            a_6 = a_3 + a_4
-            self.a_7 = (a_5 * a_6) / (a_5 + a_6)
-
-            r_5 = gaussian_product_coordinate(a_1, r_1, a_2, r_2)
-            r_6 = gaussian_product_coordinate(a_3, r_3, a_4, r_4)
-            self.r_7 = gaussian_product_coordinate(a_5, r_5, a_6, r_6)
-
-            r_12 = coordinate_distance(r_1, r_2)
-            r_34 = coordinate_distance(r_3, r_4)
-            r_56 = coordinate_distance(r_5, r_6)
-
-            boys_x = (a_5 * a_6 * r_56**2) / (a_5 + a_6)
-            boys_out1 = (2 * pi**(5/2)) / (a_5 * a_6 * sqrt(a_5 + a_6))
-            boys_out2 = exp(((- a_1 * a_2 * r_12**2) / a_5) - ((a_3 * a_4 * r_34**2) / a_6))
-            boys_out3 = boys_function(l_total, boys_x)
-            self.end_dict = {l_total: boys_out1 * boys_out2 * boys_out3}
-
-            m = l_total
-            while m >= 1:
-                boys_out3 = boys_function_recursion(m, boys_x, boys_out3)
-                m -= 1
-                self.end_dict[m] = boys_out1 * boys_out2 * boys_out3
-
-            ans += contraction * self.os_begin(0, g1, g2, g3, g4)
+            self.begin_primitive_quartet(l_total, g1, g2, g3, g4)
+            ans += contraction * self.os_vertical(0, l)
 
         return ans
 
-    def os_begin(self, m, g1, g2, g3, g4):
-        l_1 = g1.integral_exponents
-        l_2 = g2.integral_exponents
-        l_3 = g3.integral_exponents
-        l_4 = g4.integral_exponents
-
-        if l_1[0] > 0:
-            return self.os_recursive(0, m, *self.os_gaussian_factory(0, g1, g2, g3, g4))
-        elif l_1[1] > 0:
-            return self.os_recursive(1, m, *self.os_gaussian_factory(1, g1, g2, g3, g4))
-        elif l_1[2] > 0:
-            return self.os_recursive(2, m, *self.os_gaussian_factory(2, g1, g2, g3, g4))
-        elif l_2[0] > 0:
-            return self.os_recursive(0, m, *self.os_gaussian_factory(0, g2, g1, g4, g3))
-        elif l_2[1] > 0:
-            return self.os_recursive(1, m, *self.os_gaussian_factory(1, g2, g1, g4, g3))
-        elif l_2[2] > 0:
-            return self.os_recursive(2, m, *self.os_gaussian_factory(2, g2, g1, g4, g3))
-        elif l_3[0] > 0:
-            return self.os_recursive(0, m, *self.os_gaussian_factory(0, g3, g4, g1, g2))
-        elif l_3[1] > 0:
-            return self.os_recursive(1, m, *self.os_gaussian_factory(1, g3, g4, g1, g2))
-        elif l_3[2] > 0:
-            return self.os_recursive(2, m, *self.os_gaussian_factory(2, g3, g4, g1, g2))
-        elif l_4[0] > 0:
-            return self.os_recursive(0, m, *self.os_gaussian_factory(0, g4, g3, g2, g1))
-        elif l_4[1] > 0:
-            return self.os_recursive(1, m, *self.os_gaussian_factory(1, g4, g3, g2, g1))
-        elif l_4[2] > 0:
-            return self.os_recursive(2, m, *self.os_gaussian_factory(2, g4, g3, g2, g1))
-        else:
-            return self.end_dict[m]
-
-    def os_recursive(self, r, m, g1, g2, g3, g4, g5, g6, g7, g8):
-        out1 = out2 = out3 = out4 = out5 = out6 = out7 = out8 = 0
+    def begin_primitive_quartet(self, l_total, g1, g2, g3, g4):
+        """Sets the exponents, centre shifts and auxiliary integrals [00|00]^(m) for m <= l_total of a primitive
+        quartet and empties the memo.
+
+        Parameters
+        ----------
+        l_total : int
+        g1 : PrimitiveBasis
+        g2 : PrimitiveBasis
+        g3 : PrimitiveBasis
+        g4 : PrimitiveBasis
 
+        """
         a_1 = g1.exponent
         a_2 = g2.exponent
         a_3 = g3.exponent
         a_4 = g4.exponent
         a_5 = a_1 + a_2
         a_6 = a_3 + a_4
-
-        r_1 = g1.coordinates
-        r_2 = g2.coordinates
-        r_5 = gaussian_product_coordinate(a_1, r_1, a_2, r_2)
-
-        if r_5[r] != r_1[r]:
-            out1 = (r_5[r] - r_1[r]) * self.os_begin(m, g1, g2, g3, g4)
-        if self.r_7[r] != r_5[r]:
-            out2 = (self.r_7[r] - r_5[r]) * self.os_begin(m+1, g1, g2, g3, g4)
-        if g5.integral_exponents[r] >= 0:
-            out3 = self.os_int(g1.integral_exponents[r]) * (1 / (2 * a_5)) * self.os_begin(m, g5, g2, g3, g4)
-            out4 = self.os_int(g1.integral_exponents[r]) * (self.a_7 / (2 * a_5 ** 2)) * self.os_begin(m+1, g5, g2, g3, g4)
-        if g6.integral_exponents[r] >= 0:
-            out5 = self.os_int(g2.integral_exponents[r]) * (1 / (2 * a_5)) * self.os_begin(m, g1, g6, g3, g4)
-            out6 = self.os_int(g2.integral_exponents[r]) * (self.a_7 / (2 * a_5 ** 2)) * self.os_begin(m+1, g1, g6, g3, g4)
-        if g7.integral_exponents[r] >= 0:
-            out7 = self.os_int(g3.integral_exponents[r]) * (1 / (2 * (a_5 + a_6))) * self.os_begin(m+1, g1, g2, g7, g4)
-        if g8.integral_exponents[r] >= 0:
-            out8 = self.os_int(g4.integral_exponents[r]) * (1 / (2 * (a_5 + a_6))) * self.os_begin(m+1, g1, g2, g3, g8)
-
-        return out1 + out2 + out3 - out4 + out5 - out6 + out7 + out8
-
-    def os_int(self, i):
-        if i == 0:
-            return 1
-        else:
-            return i
-
-    def os_gaussian_factory(self, r, g1, g2, g3, g4):
-        d_1 = g1.contraction
-        d_2 = g2.contraction
-        d_3 = g3.contraction
-        d_4 = g4.contraction
-
-        a_1 = g1.exponent
-        a_2 = g2.exponent
-        a_3 = g3.exponent
-        a_4 = g4.exponent
+        a_7 = (a_5 * a_6) / (a_5 + a_6)
+        self.exponents = (a_5, a_6, a_7)
 
         r_1 = g1.coordinates
         r_2 = g2.coordinates
         r_3 = g3.coordinates
         r_4 = g4.coordinates
-
-        l_1 = g1.integral_exponents
-        l_2 = g2.integral_exponents
-        l_3 = g3.integral_exponents
-        l_4 = g4.integral_exponents
-
-        if r == 0:
-            g1x1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0] - 1, l_1[1], l_1[2]))
-            g1x2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0] - 2, l_1[1], l_1[2]))
-            g2x1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0] - 1, l_2[1], l_2[2]))
-            g3x1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0] - 1, l_3[1], l_3[2]))
-            g4x1 = PrimitiveBasis(d_4, a_4, r_4, (l_4[0] - 1, l_4[1], l_4[2]))
-            return g1x1, g2, g3, g4, g1x2, g2x1, g3x1, g4x1
-        elif r == 1:
-            g1y1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1] - 1, l_1[2]))
-            g1y2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1] - 2, l_1[2]))
-            g2y1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0], l_2[1] - 1, l_2[2]))
-            g3y1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0], l_3[1] - 1, l_3[2]))
-            g4y1 = PrimitiveBasis(d_4, a_4, r_4, (l_4[0], l_4[1] - 1, l_4[2]))
-            return g1y1, g2, g3, g4, g1y2, g2y1, g3y1, g4y1
-        elif r == 2:
-            g1z1 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1], l_1[2] - 1))
-            g1z2 = PrimitiveBasis(d_1, a_1, r_1, (l_1[0], l_1[1], l_1[2] - 2))
-            g2z1 = PrimitiveBasis(d_2, a_2, r_2, (l_2[0], l_2[1], l_2[2] - 1))
-            g3z1 = PrimitiveBasis(d_3, a_3, r_3, (l_3[0], l_3[1], l_3[2] - 1))
-            g4z1 = PrimitiveBasis(d_4, a_4, r_4, (l_4[0], l_4[1], l_4[2] - 1))
-            return g1z1, g2, g3, g4, g1z2, g2z1, g3z1, g4z1
+        r_5 = gaussian_product_coordinate(a_1, r_1, a_2, r_2)
+        r_6 = gaussian_product_coordinate(a_3, r_3, a_4, r_4)
+        r_7 = gaussian_product_coordinate(a_5, r_5, a_6, r_6)
+
+        self.centre_shifts = (
+            vector_minus(r_5, r_1), vector_minus(r_5, r_2), vector_minus(r_6, r_3), vector_minus(r_6, r_4)
+        )
+        self.w_shifts = (vector_minus(r_7, r_5), vector_minus(r_7, r_6))
+
+        r_12 = coordinate_distance(r_1, r_2)
+        r_34 = coordinate_distance(r_3, r_4)
+        r_56 = coordinate_distance(r_5, r_6)
+
+        boys_x = (a_5 * a_6 * r_56**2) / (a_5 + a_6)
+        boys_out1 = (2 * pi**(5/2)) / (a_5 * a_6 * sqrt(a_5 + a_6))
+        boys_out2 = exp(((- a_1 * a_2 * r_12**2) / a_5) - ((a_3 * a_4 * r_34**2) / a_6))
+        boys_out3 = boys_function(l_total, boys_x)
+        self.end_dict = {l_total: boys_out1 * boys_out2 * boys_out3}
+
+        m = l_total
+        while m >= 1:
+            boys_out3 = boys_function_recursion(m, boys_x, boys_out3)
+            m -= 1
+            self.end_dict[m] = boys_out1 * boys_out2 * boys_out3
+
+        self.memo = {}
+
+    def os_vertical(self, m, l):
+        """Returns (ab|cd)^(m) of the primitive quartet, lowering the first non zero exponent of a, b, c then d.
+
+        Parameters
+        ----------
+        m : int
+        l : Tuple[Tuple[int, int, int], ...]
+            The integral exponents of a, b, c and d.
+
+        Returns
+        -------
+        : float
+
+        """
+        key = (m, l)
+        if key in self.memo:
+            return self.memo[key]
+
+        value = self.end_dict[m]
+        for i in range(4):
+            if l[i] != (0, 0, 0):
+                r = 0 if l[i][0] > 0 else 1 if l[i][1] > 0 else 2
+                value = self.os_recursive(i, r, m, lower(l, i, r))
+                break
+
+        self.memo[key] = value
+        return value
+
+    def os_recursive(self, i, r, m, l):
+        """Raises the exponent r of function i of (ab|cd)^(m) by one.
+
+        Parameters
+        ----------
+        i : int
+        r : int
+        m : int
+        l : Tuple[Tuple[int, int, int], ...]
+            The integral exponents before raising.
+
+        Returns
+        -------
+        : float
+
+        """
+        a_5, a_6, a_7 = self.exponents
+        zeta = a_5 if i < 2 else a_6
+        partner = i ^ 1
+        centre_shift = self.centre_shifts[i][r]
+        w_shift = self.w_shifts[i // 2][r]
+
+        out = 0.0
+        if centre_shift != 0:
+            out += centre_shift * self.os_vertical(m, l)
+        if w_shift != 0:
+            out += w_shift * self.os_vertical(m + 1, l)
+        for j in (i, partner):
+            if l[j][r] > 0:
+                l_j = lower(l, j, r)
+                out += (l[j][r] / (2 * zeta)) * (self.os_vertical(m, l_j) - (a_7 / zeta) * self.os_vertical(m + 1, l_j))
+        for j in (2 * (1 - i // 2), 2 * (1 - i // 2) + 1):
+            if l[j][r] > 0:
+                out += (l[j][r] / (2 * (a_5 + a_6))) * self.os_vertical(m + 1, lower(l, j, r))
+        return out
+
+
+def lower(l, i, r):
+    """Lowers the exponent r of function i by one.
+
+    Parameters
+    ----------
+    l : Tuple[Tuple[int, int, int], ...]
+    i : int
+    r : int
+
+    Returns
+    -------
+    : Tuple[Tuple[int, int, int], ...]
+
+    """
+    l_i = l[i][:r] + (l[i][r] - 1,) + l[i][r + 1:]
+    return l[:i] + (l_i,) + l[i + 1:]
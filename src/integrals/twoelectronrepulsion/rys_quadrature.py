@@ -0,0 +1,186 @@
+import itertools
+from math import comb, pi
+import numpy as np
+
+
+class RysQuadrature:
+    """Rys quadrature for the two electron repulsion integrals.
+
+    (ab|cd) = 2 pi^(5/2) / (pq sqrt(p + q)) K_AB K_CD sum_i w_i I_x(u_i) I_y(u_i) I_z(u_i), where u_i and w_i are the
+    roots and weights of the Rys polynomials of order n = L / 2 + 1 for the total angular momentum L and I_x, I_y and
+    I_z are the two dimensional integrals of each cartesian direction. Every primitive quartet and root of a contracted
+    quartet is handled at once as numpy arrays, so the cost grows far slower with the angular momentum than the
+    recursive schemes.
+
+    """
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        l_1 = basis_i.integral_exponents
+        l_2 = basis_j.integral_exponents
+        l_3 = basis_k.integral_exponents
+        l_4 = basis_l.integral_exponents
+        roots = (sum(l_1) + sum(l_2) + sum(l_3) + sum(l_4)) // 2 + 1
+
+        r_1 = np.array(basis_i.coordinates, dtype=float)
+        r_2 = np.array(basis_j.coordinates, dtype=float)
+        r_3 = np.array(basis_k.coordinates, dtype=float)
+        r_4 = np.array(basis_l.coordinates, dtype=float)
+
+        a_1, a_2, a_3, a_4 = (
+            np.array([g.exponent for g in basis.primitive_gaussian_array], dtype=float)
+            for basis in (basis_i, basis_j, basis_k, basis_l)
+        )
+        d_1, d_2, d_3, d_4 = (
+            np.array([g.contraction * g.normalisation for g in basis.primitive_gaussian_array], dtype=float)
+            for basis in (basis_i, basis_j, basis_k, basis_l)
+        )
+        a_1, a_2, a_3, a_4 = (x.ravel() for x in np.meshgrid(a_1, a_2, a_3, a_4, indexing='ij'))
+        d = np.einsum('i,j,k,l->ijkl', d_1, d_2, d_3, d_4).ravel()
+
+        a_5 = a_1 + a_2
+        a_6 = a_3 + a_4
+        a_7 = a_5 + a_6
+        r_5 = (np.outer(a_1, r_1) + np.outer(a_2, r_2)) / a_5[:, None]
+        r_6 = (np.outer(a_3, r_3) + np.outer(a_4, r_4)) / a_6[:, None]
+        r_56 = r_5 - r_6
+
+        prefactor = d * (2 * pi**(5/2)) / (a_5 * a_6 * np.sqrt(a_7)) \
+        * np.exp(- a_1 * a_2 * np.sum((r_1 - r_2)**2) / a_5 - a_3 * a_4 * np.sum((r_3 - r_4)**2) / a_6)
+        u, w = rys_roots_weights(roots, a_5 * a_6 * np.sum(r_56**2, axis=1) / a_7)
+
+        b_00 = u / (2 * a_7[:, None])
+        b_10 = 1 / (2 * a_5[:, None]) - a_6[:, None] * u / (2 * a_5[:, None] * a_7[:, None])
+        b_01 = 1 / (2 * a_6[:, None]) - a_5[:, None] * u / (2 * a_6[:, None] * a_7[:, None])
+
+        ans = prefactor[:, None] * w
+        for r in range(3):
+            c_00 = (r_5[:, r] - r_1[r])[:, None] - (a_6 / a_7 * r_56[:, r])[:, None] * u
+            d_00 = (r_6[:, r] - r_3[r])[:, None] + (a_5 / a_7 * r_56[:, r])[:, None] * u
+            g = two_dimensional_integrals(l_1[r] + l_2[r], l_3[r] + l_4[r], c_00, d_00, b_00, b_10, b_01)
+            ans = ans * transfer(g, l_1[r], l_2[r], r_1[r] - r_2[r], l_3[r], l_4[r], r_3[r] - r_4[r])
+
+        n = basis_i.normalisation * basis_j.normalisation * basis_k.normalisation * basis_l.normalisation
+        return n * float(np.sum(ans))
+
+
+def two_dimensional_integrals(n_max, m_max, c_00, d_00, b_00, b_10, b_01):
+    """Creates the two dimensional integrals I(n, 0, m, 0) of one cartesian direction for every root.
+
+    Parameters
+    ----------
+    n_max : int
+    m_max : int
+    c_00 : np.array
+    d_00 : np.array
+    b_00 : np.array
+    b_10 : np.array
+    b_01 : np.array
+
+    Returns
+    -------
+    g : List[List[np.array]]
+
+    """
+    g = [[None] * (m_max + 1) for _ in range(n_max + 1)]
+    g[0][0] = np.ones_like(c_00)
+    for n in range(n_max):
+        g[n + 1][0] = c_00 * g[n][0]
+        if n > 0:
+            g[n + 1][0] += n * b_10 * g[n - 1][0]
+    for m in range(m_max):
+        for n in range(n_max + 1):
+            g[n][m + 1] = d_00 * g[n][m]
+            if m > 0:
+                g[n][m + 1] += m * b_01 * g[n][m - 1]
+            if n > 0:
+                g[n][m + 1] += n * b_00 * g[n - 1][m]
+    return g
+
+
+def transfer(g, l_1, l_2, ab, l_3, l_4, cd):
+    """Transfers angular momentum to the second and fourth functions with I(a, b) = sum_t C(b, t) AB^(b - t) I(a + t).
+
+    Parameters
+    ----------
+    g : List[List[np.array]]
+    l_1 : int
+    l_2 : int
+    ab : float
+    l_3 : int
+    l_4 : int
+    cd : float
+
+    Returns
+    -------
+    : np.array
+
+    """
+    ans = 0.0
+    for t, s in itertools.product(range(l_2 + 1), range(l_4 + 1)):
+        ans = ans + comb(l_2, t) * ab**(l_2 - t) * comb(l_4, s) * cd**(l_4 - s) * g[l_1 + t][l_3 + s]
+    return ans
+
+
+legendre_points = 64
+large_x = 100.0
+
+
+def rys_roots_weights(n, x):
+    """Returns the roots and weights of the Rys quadrature of order n.
+
+    The weight function exp(-x t^2) on 0 <= t <= 1 is discretised with Gauss-Legendre points and the recurrence
+    coefficients of the orthogonal polynomials in u = t^2 are found with the Stieltjes procedure. The roots and weights
+    are then the eigenvalues and first eigenvector components of the Jacobi matrix. For large x the weight function is
+    a half gaussian and the roots and weights follow from the Gauss-Hermite quadrature.
+
+    Parameters
+    ----------
+    n : int
+    x : np.array
+
+    Returns
+    -------
+    u : np.array
+        The roots for each x, which satisfy sum_i w_i u_i^k = F_k(x) for k < 2n.
+    w : np.array
+
+    """
+    x = np.asarray(x, dtype=float)
+    u = np.zeros((x.size, n))
+    w = np.zeros((x.size, n))
+
+    large = x > large_x
+    if np.any(large):
+        s, h = np.polynomial.hermite.hermgauss(2 * n)
+        s, h = s[n:], h[n:]
+        u[large] = s**2 / x[large, None]
+        w[large] = h / np.sqrt(x[large, None])
+
+    small = ~large
+    if np.any(small):
+        t, v = np.polynomial.legendre.leggauss(legendre_points)
+        t = (t + 1) / 2
+        points = t**2
+        weights = (v / 2) * np.exp(- np.outer(x[small], points))
+
+        alpha = np.zeros((weights.shape[0], n))
+        beta = np.zeros((weights.shape[0], n))
+        p_previous = np.zeros_like(weights)
+        p = np.ones_like(weights)
+        norm = np.sum(weights, axis=1)
+        beta[:, 0] = norm
+        for j in range(n):
+            alpha[:, j] = np.sum(weights * points * p**2, axis=1) / norm
+            if j + 1 < n:
+                p_previous, p = p, (points - alpha[:, j, None]) * p - beta[:, j, None] * p_previous
+                norm_previous, norm = norm, np.sum(weights * p**2, axis=1)
+                beta[:, j + 1] = norm / norm_previous
+
+        jacobi = np.zeros((weights.shape[0], n, n))
+        index = np.arange(n)
+        jacobi[:, index, index] = alpha
+        jacobi[:, index[1:], index[:-1]] = jacobi[:, index[:-1], index[1:]] = np.sqrt(beta[:, 1:])
+        eigenvalues, eigenvectors = np.linalg.eigh(jacobi)
+        u[small] = eigenvalues
+        w[small] = beta[:, 0, None] * eigenvectors[:, 0, :]**2
+
+    return u, w
@@ -1,3 +1,4 @@
+from src.common import logger
 from src.kohnsham import ExchangeCorrelation
 from src.kohnsham import RestrictedKohnShamHamiltonian
 from src.kohnsham.exchange import ExchangePotential
@@ -10,8 +11,9 @@ from src.kohnsham.correlation import VoskoWilkNusair
 
 class RestrictedKohnSham(Restricted):
 
-    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, exchange, correlation):
-        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes)
+    def __init__(self, nuclei_array, basis_set_array, electrons, symmetry, processes, exchange, correlation, **kwargs):
+        super().__init__(nuclei_array, basis_set_array, electrons, symmetry, processes, **kwargs)
+        self.checkpoint_options += ['exchange {}'.format(exchange), 'correlation {}'.format(correlation)]
 
         if exchange == 'S':
             exchange = SlaterExchange(alpha=1.0)
@@ -34,4 +36,4 @@ class RestrictedKohnSham(Restricted):
             )
         )
 
-        print('\n\nBEGIN RESTRICTED KOHN SHAM\n')
+        logger.log('\n\nBEGIN RESTRICTED KOHN SHAM\n')
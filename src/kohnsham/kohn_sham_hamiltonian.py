@@ -1,4 +1,4 @@
-import itertools
+from src.hartreefock import coulomb_exchange
 from src.matrixelements import Matrix
 
 
@@ -13,10 +13,7 @@ class RestrictedKohnShamHamiltonian(Matrix):
     def create(self, density_matrix):
 
         def calculate_restricted(i, j):
-            g_ij = 0
-            for a, b in itertools.product(range(self.matrix_size), repeat=2):
-                g_ij += density_matrix.item(a, b) * self.repulsion_matrix.item(i, j, a, b)
-            g_ij += self.exchange_correlation.integrate(density_matrix, i, j)
-            return g_ij
+            return self.exchange_correlation.integrate(density_matrix, i, j)
 
-        return self.core_hamiltonian + self.create_matrix(calculate_restricted)
+        (coulomb,), _ = coulomb_exchange(self.repulsion_matrix, [density_matrix])
+        return self.core_hamiltonian + coulomb + self.create_matrix(calculate_restricted)
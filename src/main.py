@@ -1,14 +1,22 @@
-import os, sys
+import argparse, os, sys
+from contextlib import contextmanager
 sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + '/../')
 
+from src.common import basis_set_library
+from src.common import instrumentation
+from src.common import logger
+from src.common.logger import DEBUG
+from src.common.logger import QUIET
+from src.common.logger import SUMMARY
 from src.common import read_basis_set_file
 from src.common import read_mol_file
 from src.common import Symmetry
 from src.energy import Energy
 from src.factory import MoleculeFactory
-from src.geometryoptimization import NelderMead
-import numpy as np
-import time
+from src.integrals import integral_autotuner
+from src.matrixelements import checkpoint
+from src.matrixelements import repulsion_cache
+from src.matrixelements import scratch_space
 
 
 def menu():
@@ -24,13 +32,23 @@ def menu():
     # start('He.mol', '3-21G.gbs', 'RHF', 4) # -2.83567987364 a.u.
     # start('He.mol', '6-311G.gbs', 'RHF', 4) # -2.85989542457 a.u.
     # start('He.mol', 'cc-pVDZ.gbs', 'RHF', 4) # -2.85516047724192 a.u.
+    # start('Ne.mol', 'cc-pVDZ.gbs', 'RHF', 4, spherical=True)
+    # start('H2O.mol', 'STO-3G.gbs', 'MP2', 4, cache_directory='cache')  # reuses the integrals of an earlier run
+    # start('H2O.mol', 'cc-pVDZ.gbs', 'RHF', 4, integral_engine='auto')  # times the integral engines first
+    # start('H2O.mol', 'cc-pVDZ.gbs', 'CCSD', 4, scratch_directory='/tmp', memory_budget=2**28)  # out of core
 
     # start('H2O.mol', 'STO-3G.gbs', 'CCSD', 4)  # -0.0706800939192 a.u.
     # start('CH4.mol', 'STO-3G.gbs', 'CCSD', 4)  # -0.078469894846414 a.u.
     # start('H2O.mol', 'STO-3G.gbs', 'CCSD(T)', 4)  # -9.98772699528e-05 a.u.
+    # start('H2O.mol', 'STO-3G.gbs', 'CCSD', 4, instrumentation_file='timings.json')  # or timings.csv
+    # start('H2O.mol', 'STO-3G.gbs', 'RHF', 4, verbosity=DEBUG, results_file='results.jsonl')  # full matrices
+    # start('H2O.mol', 'cc-pVDZ.gbs', 'RHF', 4, auxiliary_basis='aug-pcJ-2.gbs')  # density fitted
+    # start('C2H4.mol', '3-21G.gbs', 'RHF', 4, fock_rebuild_interval=8)  # incremental Fock builds
+    # start('H2O.mol', 'STO-3G.gbs', 'CCSD', 4, checkpoint_file='H2O.npz', restart=True)  # resumes if interrupted
 
     # geometry optimization
     # start('H2O.mol', 'STO-3G.gbs', 'RHF', 4, geometry_optimization='NelderMead')  # -74.96588377357489 a.u.
+    # start('H2O.mol', 'STO-3G.gbs', 'RHF', 4, geometry_optimization='BFGS')
 
     # only worth doing DFT calculations on atoms at the moment
     # start('He.mol', 'STO-3G.gbs', ('DFT', 'S', ''), 4)  # -2.65731197167 a.u.
@@ -45,31 +63,176 @@ def menu():
     # start('He.mol', 'cc-pVDZ.gbs', ('DFT', 'S', 'VWN3'), 4) # -2.85516047724192 a.u.
 
 
-def start(mol_file, basis_file, method, processors, symmetry=False, geometry_optimization=None):
-    np.set_printoptions(linewidth=100000, threshold=np.inf)
-    start_time = time.clock()
+def start(mol_file, basis_file, method, processors, symmetry=False, geometry_optimization=None, spherical=False,
+cache_directory=None, scratch_directory=None, memory_budget=None, instrumentation_file=None, verbosity=None,
+results_file=None, checkpoint_file=None, restart=False, checkpoint_interval=None, auxiliary_basis=None,
+fock_rebuild_interval=None, integral_engine=None):
+    with overridden(logger, verbosity=verbosity, results_file=results_file), \
+    overridden(basis_set_library, cache_directory=cache_directory), \
+    overridden(integral_autotuner, cache_directory=cache_directory), \
+    overridden(repulsion_cache, cache_directory=cache_directory), \
+    overridden(scratch_space, scratch_directory=scratch_directory, memory_budget=memory_budget), \
+    overridden(checkpoint, checkpoint_file=checkpoint_file, restart=restart, interval=checkpoint_interval):
+        return run_calculation(
+            mol_file, basis_file, method, processors, symmetry, geometry_optimization, spherical, instrumentation_file,
+            auxiliary_basis, fock_rebuild_interval, integral_engine
+        )
+
+
+def run_calculation(mol_file, basis_file, method, processors, symmetry, geometry_optimization, spherical,
+instrumentation_file, auxiliary_basis, fock_rebuild_interval, integral_engine):
+    if instrumentation_file is not None:
+        instrumentation.enabled = True
+        instrumentation.reset()
+    with instrumentation.timer('calculation') as timer:
+        nuclei_list, electrons, multiplicity = read_mol_file(mol_file)
+        energy_object = Energy(
+            electrons, multiplicity, processors, method, spherical, auxiliary_basis, fock_rebuild_interval,
+            integral_engine
+        )
+
+        logger.separator()
+        logger.log('\nA BASIC QUANTUM CHEMICAL PROGRAM IN PYTHON\n\n\n{}'.format([x.element for x in nuclei_list]))
+
+        if geometry_optimization == 'BFGS':
+            from src.geometryoptimization import BFGS
+            bfgs = BFGS(basis_file, energy_object, nuclei_list, processes=processors)
+            energy = bfgs.optimize()
+        elif geometry_optimization is not None:
+            from src.geometryoptimization import NelderMead
+            nelder_mead = NelderMead(basis_file, energy_object, nuclei_list, processes=processors)
+            energy = nelder_mead.optimize()
+        else:
+            nuclei_list, point_group = MoleculeFactory(symmetry).create(nuclei_list)
+            basis_set = read_basis_set_file(basis_file, nuclei_list)
+            energy_object.symmetry_object = Symmetry(point_group, basis_set)
+            energy = energy_object.calculate_energy(nuclei_list, basis_set)
+
+    logger.separator()
+    logger.log('\nTIME TAKEN: ' + str(timer.seconds) + 's')
+    logger.record(
+        'calculation', mol_file=mol_file, basis_file=basis_file, method=method, energy=energy, seconds=timer.seconds
+    )
+    if instrumentation_file is not None:
+        instrumentation.write(instrumentation_file)
+        logger.log('TIMERS AND COUNTERS WRITTEN TO ' + instrumentation_file)
+        instrumentation.enabled = False
+    logger.log("\nWhat I cannot create I cannot understand - Richard Feynman\n")
 
-    nuclei_list, electrons, multiplicity = read_mol_file(mol_file)
-    energy_object = Energy(electrons, multiplicity, processors, method)
-
-    print('\n*************************************************************************************************')
-    print('\nA BASIC QUANTUM CHEMICAL PROGRAM IN PYTHON\n\n\n{}'.format([x.element for x in nuclei_list]))
-
-    if geometry_optimization is not None:
-        nelder_mead = NelderMead(basis_file, energy_object, nuclei_list)
-        energy = nelder_mead.optimize()
-    else:
-        nuclei_list, point_group = MoleculeFactory(symmetry).create(nuclei_list)
-        basis_set = read_basis_set_file(basis_file, nuclei_list)
-        energy_object.symmetry_object = Symmetry(point_group, basis_set)
-        energy = energy_object.calculate_energy(nuclei_list, basis_set)
+    return energy
 
-    print('\n*************************************************************************************************')
-    print('\nTIME TAKEN: ' + str(time.clock() - start_time) + 's')
-    print("\nWhat I cannot create I cannot understand - Richard Feynman\n")
 
-    return energy
+@contextmanager
+def overridden(target, **values):
+    """Sets attributes of a shared object inside the context and restores their previous values after it, so the
+    options of one calculation do not carry over to the next in the same process, e.g. in a batch worker.
+
+    Parameters
+    ----------
+    target : object
+    values : object
+        The value of each attribute, those that are None being left as they are.
+
+    """
+    previous = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        if value is not None:
+            setattr(target, name, value)
+    try:
+        yield target
+    finally:
+        for name, value in previous.items():
+            setattr(target, name, value)
+
+
+def positive_int(value):
+    """Parses a command line count that must be at least 1, e.g. an interval.
+
+    Parameters
+    ----------
+    value : str
+
+    Returns
+    -------
+    : int
+
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be at least 1, not {}'.format(number))
+    return number
+
+
+def main(arguments=None):
+    """Runs a single calculation or a batch manifest from the command line, or the menu if given no arguments.
+
+    A method of the form DFT:S:VWN3 is the Kohn-Sham method ('DFT', 'S', 'VWN3').
+
+    Parameters
+    ----------
+    arguments : {None, List[str]}
+        sys.argv[1:] if None.
+
+    """
+    parser = argparse.ArgumentParser(description='A basic quantum chemical program in python.')
+    parser.add_argument('mol_file', nargs='?', help='e.g. H2O.mol')
+    parser.add_argument('basis_file', nargs='?', help='e.g. STO-3G.gbs')
+    parser.add_argument('method', nargs='?', help='e.g. RHF, UHF, MP2, CCSD(T) or DFT:S:VWN3')
+    parser.add_argument('--batch', metavar='MANIFEST', help='a json file of jobs to run instead of one calculation')
+    parser.add_argument('--processes', type=int, default=1, help='the cores of the calculation')
+    parser.add_argument('--workers', type=int, default=1, help='the jobs of a batch run at the same time')
+    parser.add_argument('--cores', type=int, help='the total cores of a batch, by default all of them')
+    parser.add_argument('--symmetry', action='store_true')
+    parser.add_argument('--spherical', action='store_true')
+    parser.add_argument('--geometry-optimization', choices=['NelderMead', 'BFGS'])
+    parser.add_argument('--auxiliary-basis', help='a basis set file to density fit the RHF or UHF integrals in')
+    parser.add_argument(
+        '--fock-rebuild-interval', type=positive_int, help='build the RHF Fock matrix incrementally, in full this often'
+    )
+    parser.add_argument(
+        '--integral-engine', choices=['auto', 'OS', 'HGP', 'CHGP', 'Rys', 'Cook'],
+        help='the two electron integral engine, auto timing each on the basis set first'
+    )
+    parser.add_argument('--cache-directory')
+    parser.add_argument('--scratch-directory')
+    parser.add_argument('--memory-budget', type=int, help='the bytes of a four index tensor held in memory at once')
+    parser.add_argument('--instrumentation-file', help='a .json or .csv file of the stage timers and counters')
+    parser.add_argument('--results-file', help='a file of json lines to append the results to')
+    parser.add_argument('--checkpoint-file', help='a .npz file to save the state of the calculation to as it goes')
+    parser.add_argument('--restart', action='store_true', help='resume from the state in the checkpoint file')
+    parser.add_argument(
+        '--checkpoint-interval', type=positive_int, help='the iterations between saves of the checkpoint'
+    )
+    parser.add_argument('--verbosity', type=int, choices=[QUIET, SUMMARY, DEBUG])
+    arguments = parser.parse_args(arguments)
+
+    if arguments.batch is not None:
+        from src.batch import BatchRunner
+        from src.batch import read_manifest
+        if arguments.verbosity is not None:
+            logger.verbosity = arguments.verbosity
+        if arguments.results_file is not None:
+            logger.results_file = arguments.results_file
+        batch_runner = BatchRunner(arguments.workers, arguments.cores, arguments.cache_directory)
+        return batch_runner.run(read_manifest(arguments.batch))
+
+    if arguments.method is None:
+        if arguments.mol_file is not None:
+            parser.error('a calculation needs a mol file, a basis file and a method')
+        return menu()
+
+    method = tuple(arguments.method.split(':')) if arguments.method.startswith('DFT') else arguments.method
+    return start(
+        arguments.mol_file, arguments.basis_file, method, arguments.processes, symmetry=arguments.symmetry,
+        geometry_optimization=arguments.geometry_optimization, spherical=arguments.spherical,
+        cache_directory=arguments.cache_directory, scratch_directory=arguments.scratch_directory,
+        memory_budget=arguments.memory_budget, instrumentation_file=arguments.instrumentation_file,
+        verbosity=arguments.verbosity, results_file=arguments.results_file, checkpoint_file=arguments.checkpoint_file,
+        restart=arguments.restart, checkpoint_interval=arguments.checkpoint_interval,
+        auxiliary_basis=arguments.auxiliary_basis, fock_rebuild_interval=arguments.fock_rebuild_interval,
+        integral_engine=arguments.integral_engine
+    )
 
 
 if __name__ == "__main__":
-    menu()
+    main()
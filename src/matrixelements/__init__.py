@@ -2,15 +2,35 @@ from src.matrixelements.create_matrix import Matrix
 from src.matrixelements.density_matrix import blocked_density_matrix
 from src.matrixelements.density_matrix import density_matrix_restricted
 from src.matrixelements.density_matrix import density_matrix_unrestricted
+from src.matrixelements.density_fitting import DensityFitting
+from src.matrixelements.density_fitting import unit_function
 from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsion
+from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsionMatrixContractedHGP
 from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsionMatrixCook
 from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsionMatrixHGP
 from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsionMatrixOS
+from src.matrixelements.electron_repulsion_matrix import TwoElectronRepulsionMatrixRys
+from src.matrixelements.electron_repulsion_matrix import quartet_index
+from src.matrixelements.electron_repulsion_matrix import quartet_orbits
+from src.matrixelements.electron_repulsion_matrix import quartet_rows
+from src.matrixelements.electron_repulsion_matrix import unique_quartet_count
+from src.matrixelements.electron_repulsion_matrix import unique_quartets
+from src.matrixelements.electron_repulsion_matrix import unpack_repulsion
 from src.matrixelements.kinetic_energy_matrix import KineticEnergyMatrix
 from src.matrixelements.nuclear_attraction_matrix import NuclearAttractionMatrix
 from src.matrixelements.orbital_overlap_matrix import OrbitalOverlapMatrix
+from src.matrixelements.repulsion_cache import RepulsionCache
+from src.matrixelements.repulsion_cache import repulsion_cache
+from src.matrixelements.repulsion_cache import basis_set_hash
+from src.matrixelements.scratch_space import ScratchSpace
+from src.matrixelements.scratch_space import scratch_space
 from src.matrixelements.transformations import blocked_spin_basis_set
+from src.matrixelements.transformations import four_index_transform
 from src.matrixelements.transformations import molecular_orbitals
+from src.matrixelements.transformations import spherical_repulsion
+from src.matrixelements.transformations import spherical_transformation
 from src.matrixelements.transformations import spin_basis_set
 from src.matrixelements.transformations import spin_orbital_energies
 from src.matrixelements.transformations import spin_basis_anti_physicist
+from src.matrixelements.checkpoint import Checkpoint
+from src.matrixelements.checkpoint import checkpoint
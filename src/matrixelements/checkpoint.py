@@ -0,0 +1,113 @@
+import os
+import numpy as np
+from src.common import logger
+from src.matrixelements.repulsion_cache import RepulsionCache
+from src.matrixelements.repulsion_cache import basis_set_hash
+
+
+class Checkpoint:
+    """Saves the state of a long calculation to disk as it goes so an interrupted run can be restarted from it.
+
+    The state is a set of arrays for each stage, e.g. the converged orbitals under 'scf' or the current amplitudes
+    under 'ccsd', written together to a single uncompressed npz file. The file is replaced atomically so an
+    interruption while saving leaves the previous checkpoint intact. The two electron integrals are saved once to a
+    repulsion cache in the directory checkpoint_file + '.integrals' and the checkpoint only holds the key of the basis
+    set and method, so a restart of a different calculation ignores the checkpoint rather than using it.
+
+    Attributes
+    ----------
+    checkpoint_file : {None, str}
+        Checkpointing is disabled if None.
+    restart : bool
+        If True a stage resumes from its saved state.
+    interval : int
+        The number of iterations between saves of an unconverged stage.
+    key : {None, str}
+        The hash of the basis set and method of the calculation.
+    state : Dict[str, np.array]
+        The arrays of every stage keyed by 'stage.name'.
+
+    """
+    def __init__(self, checkpoint_file=None, restart=False, interval=1):
+        self.checkpoint_file = checkpoint_file
+        self.restart = restart
+        self.interval = interval
+        self.key = None
+        self.state = {}
+
+    @property
+    def enabled(self):
+        return self.checkpoint_file is not None
+
+    def open(self, basis_set_array, method):
+        """Starts the checkpoint of a calculation, reading the saved state if restarting the same calculation.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+        method : str
+            Anything else the saved state depends on, e.g. the class of the SCF and the number of electrons.
+
+        """
+        if not self.enabled:
+            return
+        self.key = basis_set_hash(basis_set_array, method)
+        self.state = {}
+        if self.restart and os.path.isfile(self.checkpoint_file):
+            with np.load(self.checkpoint_file) as arrays:
+                if str(arrays['key']) == self.key:
+                    self.state = {name: arrays[name] for name in arrays.files if name != 'key'}
+                else:
+                    logger.log('\nCHECKPOINT OF A CALCULATION WITH OTHER OPTIONS IGNORED')
+
+    def save(self, stage, **arrays):
+        """Replaces the saved state of a stage and writes the checkpoint file.
+
+        Parameters
+        ----------
+        stage : str
+        arrays : np.array
+
+        """
+        if not self.enabled:
+            return
+        self.state = {name: value for name, value in self.state.items() if not name.startswith(stage + '.')}
+        self.state.update({stage + '.' + name: np.asarray(value) for name, value in arrays.items()})
+        temporary_file = self.checkpoint_file + '.' + str(os.getpid()) + '.npz'
+        np.savez(temporary_file, key=self.key, **self.state)
+        os.replace(temporary_file, self.checkpoint_file)
+
+    def load(self, stage):
+        """Returns the saved state of a stage if restarting from a checkpoint file, otherwise None.
+
+        Parameters
+        ----------
+        stage : str
+
+        Returns
+        -------
+        : {None, Dict[str, np.array]}
+
+        """
+        if not self.enabled or not self.restart:
+            return None
+        arrays = {name[len(stage) + 1:]: value for name, value in self.state.items() if name.startswith(stage + '.')}
+        return arrays or None
+
+    def due(self, iteration):
+        return self.enabled and iteration % self.interval == 0
+
+    def repulsion_cache(self):
+        """Returns the repulsion cache holding the two electron integrals of the checkpoint.
+
+        Returns
+        -------
+        : RepulsionCache
+
+        """
+        if not self.enabled:
+            return RepulsionCache()
+        return RepulsionCache(self.checkpoint_file + '.integrals', max_bytes=0)
+
+
+checkpoint = Checkpoint()
@@ -0,0 +1,124 @@
+from multiprocessing import Pool
+import numpy as np
+from src.common import instrumentation
+from src.objects import Basis
+from src.objects import PrimitiveBasis
+
+
+class DensityFitting:
+    """Resolution of the identity approximation of the two electron integrals in an auxiliary basis set.
+
+    Each product of two basis functions is fitted to the auxiliary functions in the coulomb metric, so that
+    (ij|kl) ~ sum_PQ (ij|P) [J^-1]_PQ (Q|kl) with J_PQ = (P|Q). The three index integrals (ij|P) and the two index
+    integrals (P|Q) are calculated by the four index engines with a constant s function of exponent zero in place of
+    the missing function, and only i <= j is integrated. The fitted integrals B_Qij = sum_P [J^-1/2]_QP (P|ij) take
+    N^2 N_aux memory in place of the N^4 of the repulsion tensor. Directions of the metric with eigenvalues below
+    linear_dependence times the largest are dropped, as auxiliary basis sets are often nearly linearly dependent.
+
+    Attributes
+    ----------
+    basis_set_array : List[Basis]
+    auxiliary_basis_set_array : List[Basis]
+    integral : object
+        Any engine with an integrate method, e.g. ObaraSaika.
+    processes : int
+    linear_dependence : float
+
+    """
+    def __init__(self, basis_set_array, auxiliary_basis_set_array, integral, processes, linear_dependence=1e-10):
+        self.basis_set_array = basis_set_array
+        self.auxiliary_basis_set_array = auxiliary_basis_set_array
+        self.integral = integral
+        self.processes = processes
+        self.linear_dependence = linear_dependence
+
+    def integrate_three_index(self, i, j, p):
+        auxiliary = self.auxiliary_basis_set_array[p]
+        return self.integral.integrate(
+            self.basis_set_array[i], self.basis_set_array[j], auxiliary, unit_function(auxiliary.coordinates)
+        )
+
+    def integrate_two_index(self, p, q):
+        auxiliary_p = self.auxiliary_basis_set_array[p]
+        auxiliary_q = self.auxiliary_basis_set_array[q]
+        return self.integral.integrate(
+            auxiliary_p, unit_function(auxiliary_p.coordinates), auxiliary_q, unit_function(auxiliary_q.coordinates)
+        )
+
+    def integrate(self, function, keys):
+        if self.processes > 1:
+            pool = Pool(self.processes)
+            values = instrumentation.starmap(pool, function, keys)
+            pool.close()
+        else:
+            values = [function(*key) for key in keys]
+        return np.array(values, dtype=float)
+
+    def create_three_index(self):
+        """Calculates the three index integrals (P|ij).
+
+        Returns
+        -------
+        three_index : np.array
+            Of shape (N_aux, N, N).
+
+        """
+        matrix_size = len(self.basis_set_array)
+        auxiliary_size = len(self.auxiliary_basis_set_array)
+        i, j = np.triu_indices(matrix_size)
+        keys = [(int(a), int(b), p) for p in range(auxiliary_size) for a, b in zip(i, j)]
+        instrumentation.count('three_index_integrals', len(keys))
+        values = self.integrate(self.integrate_three_index, keys).reshape(auxiliary_size, len(i))
+
+        three_index = np.zeros((auxiliary_size, matrix_size, matrix_size))
+        three_index[:, i, j] = values
+        three_index[:, j, i] = values
+        return three_index
+
+    def create_two_index(self):
+        """Calculates the coulomb metric (P|Q) of the auxiliary basis set.
+
+        Returns
+        -------
+        two_index : np.array
+
+        """
+        auxiliary_size = len(self.auxiliary_basis_set_array)
+        p, q = np.triu_indices(auxiliary_size)
+        values = self.integrate(self.integrate_two_index, [(int(a), int(b)) for a, b in zip(p, q)])
+
+        two_index = np.zeros((auxiliary_size, auxiliary_size))
+        two_index[p, q] = values
+        two_index[q, p] = values
+        return two_index
+
+    def create_fitted_integrals(self):
+        """Calculates the fitted integrals B_Qij, the sum over Q of B_Qij B_Qkl being the fitted (ij|kl).
+
+        Returns
+        -------
+        : np.array
+            Of shape (N_fit, N, N), N_fit being the auxiliary functions less those dropped as linearly dependent.
+
+        """
+        eigenvalues, eigenvectors = np.linalg.eigh(self.create_two_index())
+        keep = eigenvalues > self.linear_dependence * eigenvalues[-1]
+        inverse_square_root = eigenvectors[:, keep] / np.sqrt(eigenvalues[keep])
+        return np.tensordot(inverse_square_root, self.create_three_index(), axes=([0], [0]))
+
+
+def unit_function(coordinates):
+    """Returns the constant function 1 as an s type basis function of exponent zero.
+
+    Parameters
+    ----------
+    coordinates : Tuple[float, float, float]
+
+    Returns
+    -------
+    : Basis
+
+    """
+    primitive = PrimitiveBasis(1.0, 0.0, coordinates, (0, 0, 0))
+    primitive.normalisation_memo = 1.0
+    return Basis([primitive], coordinates, (0, 0, 0))
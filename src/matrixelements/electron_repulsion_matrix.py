@@ -1,50 +1,217 @@
-import itertools
 from multiprocessing import Pool
 import numpy as np
+from src.common import instrumentation
+from src.integrals import ContractedHeadGordonPople
 from src.integrals import ElectronRepulsion
 from src.integrals import HeadGordonPople
 from src.integrals import ObaraSaika
+from src.integrals import RysQuadrature
+from src.matrixelements.scratch_space import scratch_space
 
 
 class TwoElectronRepulsion:
 
-    def __init__(self, basis_set_array, integral, symmetry, processes):
+    def __init__(self, basis_set_array, integral, symmetry, processes, orbits=True):
         self.basis_set_array = basis_set_array
         self.matrix_size = len(basis_set_array)
         self.integral = integral
         self.symmetry = symmetry
         self.processes = processes
+        self.orbits = orbits
 
     def calculate_integral(self, i, j, k, l):
         if self.symmetry.none_zero_integral((i, j, k, l)):
-            basis_i = self.basis_set_array[i]
-            basis_j = self.basis_set_array[j]
-            basis_k = self.basis_set_array[k]
-            basis_l = self.basis_set_array[l]
-            return self.integral.integrate(basis_i, basis_j, basis_k, basis_l)
+            return self.integrate_quartet(i, j, k, l)
         else:
             return 0.0
 
-    def create_repulsion_matrix(self):
-
-        keys = []
-        for a, b, c, d in itertools.product(range(self.matrix_size), repeat=4):
-            if not (a > b or c > d or a > c or (a == c and b > d)):
-                keys.append((a, b, c, d))
+    def integrate_quartet(self, i, j, k, l):
+        basis_i = self.basis_set_array[i]
+        basis_j = self.basis_set_array[j]
+        basis_k = self.basis_set_array[k]
+        basis_l = self.basis_set_array[l]
+        return self.integral.integrate(basis_i, basis_j, basis_k, basis_l)
 
-        if self.processes > 1:
-            pool = Pool(self.processes)
-            values = pool.starmap(self.calculate_integral, keys)
+    def create_repulsion_matrix(self):
+        return unpack_repulsion(self.unique_integrals(), self.matrix_size)
+
+    def unique_integrals(self):
+        """Calculates the integrals of the quartets of unique_quartets.
+
+        With orbits only one quartet of each orbit under the signed_permutations of the symmetry is integrated and the
+        rest are copied from it with their sign, otherwise only the quartets that are zero by symmetry are skipped. The
+        quartets are generated, sorted into orbits and integrated a block at a time, so only the integrals, created by
+        scratch_space, span every quartet.
+
+        Returns
+        -------
+        : np.array
+
+        """
+        count = unique_quartet_count(self.matrix_size)
+        group = self.symmetry.signed_permutations() if self.orbits else []
+        if not group or any(len(permutation) != self.matrix_size for permutation, _ in group):
+            # a symmetry of another basis set has no permutations of these basis functions
+            group = [(np.arange(self.matrix_size), np.ones(self.matrix_size, dtype=int))]
+        # each quartet of a block takes its row, orbit and key of about 32 floats
+        blocks = scratch_space.blocks(count, 32)
+
+        integrals = scratch_space.zeros((count,))
+        computed = 0
+        pool = Pool(self.processes) if self.processes > 1 else None
+        for block in blocks:
+            quartets = unique_quartets(self.matrix_size, block)
+            representatives, signs = quartet_orbits(quartets, group, self.matrix_size)
+            integrate = np.flatnonzero((representatives == np.arange(block.start, block.stop)) & (signs != 0))
+            integrate = integrate[self.symmetry.none_zero_integrals(quartets[integrate])]
+            keys = [tuple(int(x) for x in index) for index in quartets[integrate]]
+            if pool is not None:
+                values = instrumentation.starmap(pool, self.integrate_quartet, keys)
+            else:
+                values = [self.integrate_quartet(*index) for index in keys]
+            integrals[block.start + integrate] = values
+            computed += len(keys)
+        if pool is not None:
             pool.close()
-            repulsion_dictionary = dict(zip(keys, values))
-        else:
-            repulsion_dictionary = {index: self.calculate_integral(*index) for index in keys}
-
-        repulsion_matrix = np.zeros((self.matrix_size, self.matrix_size, self.matrix_size, self.matrix_size))
-        for a, b, c, d in itertools.product(range(self.matrix_size), repeat=4):
-            repulsion_matrix.itemset((a, b, c, d), repulsion_dictionary[self.symmetry.sort_index(a, b, c, d)])
-
-        return repulsion_matrix
+        instrumentation.count('eris_computed', computed)
+        instrumentation.count('eris_screened', count - computed)
+
+        # the representative of an orbit comes first in it and keeps its own integral, so the orbits are filled in
+        # place in order
+        for block in blocks:
+            representatives, signs = quartet_orbits(unique_quartets(self.matrix_size, block), group, self.matrix_size)
+            integrals[block] = signs * integrals[representatives]
+        return integrals
+
+
+def quartet_orbits(quartets, group, matrix_size):
+    """Finds the orbit of each quartet under a group of signed permutations of the basis functions.
+
+    The representative of an orbit is the image with the lowest position in unique_quartets. The sign is zero if the
+    quartet is sent to its own orbit with both signs, as the integral is then zero.
+
+    Parameters
+    ----------
+    quartets : np.array
+        One row (i, j, k, l) for each quartet.
+    group : List[Tuple[np.array, np.array]]
+        The index of the image of each basis function and the sign it takes under each element.
+    matrix_size : int
+
+    Returns
+    -------
+    representatives : np.array
+        The position in unique_quartets of the representative of each quartet.
+    signs : np.array
+        The integral of each quartet divided by the integral of its representative.
+
+    """
+    representatives = np.full(len(quartets), np.iinfo(int).max)
+    signs = np.zeros(len(quartets), dtype=int)
+    conflicts = np.zeros(len(quartets), dtype=bool)
+    i, j, k, l = np.asarray(quartets, dtype=int).T
+    for permutation, sign in group:
+        images = quartet_index(permutation[i], permutation[j], permutation[k], permutation[l], matrix_size)
+        image_signs = sign[i] * sign[j] * sign[k] * sign[l]
+        lower = images < representatives
+        conflicts |= (images == representatives) & (image_signs != signs)
+        conflicts[lower] = False
+        representatives[lower] = images[lower]
+        signs[lower] = image_signs[lower]
+    signs[conflicts] = 0
+    return representatives, signs
+
+
+def quartet_index(i, j, k, l, matrix_size):
+    """Returns the position in unique_quartets of the quartet equal to each (i, j, k, l) by permutational symmetry.
+
+    Parameters
+    ----------
+    i, j, k, l : np.array
+    matrix_size : int
+
+    Returns
+    -------
+    : np.array
+
+    """
+    bra = pair_index(np.minimum(i, j), np.maximum(i, j), matrix_size)
+    ket = pair_index(np.minimum(k, l), np.maximum(k, l), matrix_size)
+    return pair_index(np.minimum(bra, ket), np.maximum(bra, ket), matrix_size * (matrix_size + 1) // 2)
+
+
+def pair_index(a, b, size):
+    return a * size - a * (a - 1) // 2 + b - a
+
+
+def unique_quartets(matrix_size, block=slice(None)):
+    """Returns the quartets (a, b, c, d) with a <= b, c <= d and (a, b) <= (c, d) in lexicographic order, one from each
+    set of the eight quartets related by the permutational symmetry of the two electron integrals.
+
+    Parameters
+    ----------
+    matrix_size : int
+    block : slice
+        The positions of the quartets to return, all of them by default.
+
+    Returns
+    -------
+    : np.array
+        One row for each quartet.
+
+    """
+    start, stop, step = block.indices(unique_quartet_count(matrix_size))
+    return quartet_rows(np.arange(start, stop, step), matrix_size)
+
+
+def unique_quartet_count(matrix_size):
+    pairs = matrix_size * (matrix_size + 1) // 2
+    return pairs * (pairs + 1) // 2
+
+
+def quartet_rows(positions, matrix_size):
+    """Returns the quartets at positions of unique_quartets, the inverse of quartet_index.
+
+    Parameters
+    ----------
+    positions : np.array
+    matrix_size : int
+
+    Returns
+    -------
+    : np.array
+        One row (i, j, k, l) for each position.
+
+    """
+    a, b = np.triu_indices(matrix_size)
+    pair_starts = pair_index(np.arange(a.size), np.arange(a.size), a.size)
+    bra = np.searchsorted(pair_starts, positions, side='right') - 1
+    ket = positions - pair_starts[bra] + bra
+    return np.column_stack((a[bra], b[bra], a[ket], b[ket]))
+
+
+def unpack_repulsion(values, matrix_size):
+    """Expands the integrals of the unique quartets into the full repulsion tensor, created by scratch_space.
+
+    Parameters
+    ----------
+    values : np.array
+        The integrals of each quartet of unique_quartets.
+    matrix_size : int
+
+    Returns
+    -------
+    repulsion_matrix : np.array
+
+    """
+    repulsion_matrix = scratch_space.zeros((matrix_size, matrix_size, matrix_size, matrix_size))
+    for block in scratch_space.blocks(unique_quartet_count(matrix_size), 64):
+        a, b, c, d = unique_quartets(matrix_size, block).T
+        block_values = np.asarray(values[block])
+        for i, j, k, l in ((a, b, c, d), (b, a, c, d), (a, b, d, c), (b, a, d, c)):
+            repulsion_matrix[i, j, k, l] = block_values
+            repulsion_matrix[k, l, i, j] = block_values
+    return repulsion_matrix
 
 
 class TwoElectronRepulsionMatrixOS(TwoElectronRepulsion):
@@ -63,3 +230,15 @@ class TwoElectronRepulsionMatrixHGP(TwoElectronRepulsion):
 
     def __init__(self, basis_set_array, symmetry_matrix, processes):
         super().__init__(basis_set_array, HeadGordonPople(), symmetry_matrix, processes)
+
+
+class TwoElectronRepulsionMatrixContractedHGP(TwoElectronRepulsion):
+
+    def __init__(self, basis_set_array, symmetry_matrix, processes):
+        super().__init__(basis_set_array, ContractedHeadGordonPople(), symmetry_matrix, processes)
+
+
+class TwoElectronRepulsionMatrixRys(TwoElectronRepulsion):
+
+    def __init__(self, basis_set_array, symmetry_matrix, processes):
+        super().__init__(basis_set_array, RysQuadrature(), symmetry_matrix, processes)
@@ -0,0 +1,116 @@
+import hashlib, os
+import numpy as np
+from src.matrixelements.electron_repulsion_matrix import unique_quartet_count
+from src.matrixelements.electron_repulsion_matrix import unique_quartets
+from src.matrixelements.electron_repulsion_matrix import unpack_repulsion
+from src.matrixelements.scratch_space import scratch_space
+
+
+class RepulsionCache:
+    """Saves the unique two electron integrals of each basis set to disk so a later run can skip calculating them.
+
+    Each file holds the integrals of unique_quartets as a flat npy array, which is memory mapped when loaded. The files
+    are keyed by a hash of the centres, angular momenta, exponents, contractions and normalisations of every basis
+    function together with the integral engine, so a change of geometry or basis set is never served stale
+    integrals. Loading a file updates its modification time and the least recently used files are removed once the
+    cache is larger than max_bytes.
+
+    Attributes
+    ----------
+    cache_directory : {None, str}
+        The cache is disabled if None.
+    max_bytes : int
+
+    """
+    def __init__(self, cache_directory=None, max_bytes=2**30):
+        self.cache_directory = cache_directory
+        self.max_bytes = max_bytes
+
+    def load(self, basis_set_array, integral_engine):
+        """Returns the cached repulsion tensor of a basis set or None if it is not cached.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+        integral_engine : str
+
+        Returns
+        -------
+        : {None, np.array}
+
+        """
+        if self.cache_directory is None:
+            return None
+        cache_file = self.cache_file(basis_set_array, integral_engine)
+        if not os.path.isfile(cache_file):
+            return None
+        values = np.load(cache_file, mmap_mode='r')
+        if values.shape != (unique_quartet_count(len(basis_set_array)),):
+            return None
+        os.utime(cache_file)
+        return unpack_repulsion(values, len(basis_set_array))
+
+    def save(self, basis_set_array, integral_engine, repulsion_matrix):
+        """Saves the unique integrals of a repulsion tensor then evicts the least recently used files over the cap.
+
+        Parameters
+        ----------
+        basis_set_array : List[Basis]
+        integral_engine : str
+        repulsion_matrix : np.array
+
+        """
+        if self.cache_directory is None:
+            return
+        os.makedirs(self.cache_directory, exist_ok=True)
+        cache_file = self.cache_file(basis_set_array, integral_engine)
+        temporary_file = cache_file + '.' + str(os.getpid()) + '.npy'
+        matrix_size = len(basis_set_array)
+        values = np.lib.format.open_memmap(temporary_file, mode='w+', shape=(unique_quartet_count(matrix_size),))
+        for block in scratch_space.blocks(len(values), 64):
+            values[block] = repulsion_matrix[tuple(unique_quartets(matrix_size, block).T)]
+        values.flush()
+        del values
+        os.replace(temporary_file, cache_file)
+        self.evict()
+
+    def evict(self):
+        cache_files = [
+            os.path.join(self.cache_directory, name) for name in os.listdir(self.cache_directory)
+            if name.startswith('repulsion.') and name.endswith('.npy')
+        ]
+        cache_files.sort(key=os.path.getmtime)
+        total_bytes = sum(os.path.getsize(cache_file) for cache_file in cache_files)
+        while total_bytes > self.max_bytes and len(cache_files) > 1:
+            cache_file = cache_files.pop(0)
+            total_bytes -= os.path.getsize(cache_file)
+            os.remove(cache_file)
+
+    def cache_file(self, basis_set_array, integral_engine):
+        key = basis_set_hash(basis_set_array, integral_engine)
+        return os.path.join(self.cache_directory, 'repulsion.' + key + '.npy')
+
+
+def basis_set_hash(basis_set_array, integral_engine):
+    """Returns a hash of everything the two electron integrals of a basis set depend on.
+
+    Parameters
+    ----------
+    basis_set_array : List[Basis]
+    integral_engine : str
+
+    Returns
+    -------
+    : str
+
+    """
+    sha1 = hashlib.sha1(integral_engine.encode())
+    for basis in basis_set_array:
+        values = list(basis.coordinates) + list(basis.integral_exponents) + [basis.normalisation]
+        for primitive in basis.primitive_gaussian_array:
+            values += [primitive.exponent, primitive.contraction, primitive.normalisation]
+        sha1.update(np.array(values, dtype=float).tobytes())
+    return sha1.hexdigest()[:24]
+
+
+repulsion_cache = RepulsionCache()
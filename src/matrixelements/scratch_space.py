@@ -0,0 +1,57 @@
+import tempfile
+import numpy as np
+
+
+class ScratchSpace:
+    """Creates the four index tensors of a calculation and splits the work on them into blocks of rows.
+
+    Without a scratch directory the tensors are ordinary arrays. With one they are np.memmap files, unlinked as soon as
+    they are created so the disk space is returned once the array is garbage collected, and only the blocks being
+    worked on need to fit in memory. The blocks are sized so that each holds at most memory_budget bytes.
+
+    Attributes
+    ----------
+    scratch_directory : {None, str}
+    memory_budget : int
+        The bytes of a tensor to work on at once.
+
+    """
+    def __init__(self, scratch_directory=None, memory_budget=2**30):
+        self.scratch_directory = scratch_directory
+        self.memory_budget = memory_budget
+
+    def zeros(self, shape):
+        """Returns a tensor of zeros, memory mapped if there is a scratch directory.
+
+        Parameters
+        ----------
+        shape : Tuple[int, ...]
+
+        Returns
+        -------
+        : np.array
+
+        """
+        if self.scratch_directory is None or 0 in shape:
+            return np.zeros(shape)
+        return np.memmap(tempfile.TemporaryFile(dir=self.scratch_directory), dtype=float, mode='w+', shape=shape)
+
+    def blocks(self, rows, row_size):
+        """Splits a number of rows into consecutive blocks that each fit within the memory budget.
+
+        Parameters
+        ----------
+        rows : int
+        row_size : int
+            The number of floats in each row.
+
+        Returns
+        -------
+        : List[slice]
+
+        """
+        block_rows = max(1, self.memory_budget // max(1, 8 * row_size))
+        return [slice(start, min(start + block_rows, rows)) for start in range(0, rows, block_rows)]
+
+
+scratch_space = ScratchSpace()
@@ -1,5 +1,88 @@
 import numpy as np
-import itertools
+from src.common import double_factorial
+from src.matrixelements.scratch_space import scratch_space
+
+
+# real solid harmonics of the d and f shells in the order m = 0, 1, -1, 2, -2, 3, -3 as polynomials in x, y and z,
+# each normalised later against the overlap of its shell
+solid_harmonics = {
+    2: (
+        {(0, 0, 2): 2, (2, 0, 0): -1, (0, 2, 0): -1},
+        {(1, 0, 1): 1},
+        {(0, 1, 1): 1},
+        {(2, 0, 0): 1, (0, 2, 0): -1},
+        {(1, 1, 0): 1}
+    ),
+    3: (
+        {(0, 0, 3): 2, (2, 0, 1): -3, (0, 2, 1): -3},
+        {(1, 0, 2): 4, (3, 0, 0): -1, (1, 2, 0): -1},
+        {(0, 1, 2): 4, (2, 1, 0): -1, (0, 3, 0): -1},
+        {(2, 0, 1): 1, (0, 2, 1): -1},
+        {(1, 1, 1): 1},
+        {(3, 0, 0): 1, (1, 2, 0): -3},
+        {(2, 1, 0): 3, (0, 3, 0): -1}
+    )
+}
+
+
+def spherical_transformation(basis_set_array, orbital_overlap):
+    """Creates the matrix that transforms the cartesian basis set to spherical harmonics.
+
+    The 6 cartesian d and 10 cartesian f functions of each shell are replaced by 5 and 7 real solid harmonics, all
+    other functions are kept. The columns are the spherical basis functions expanded in the cartesian ones, so a
+    matrix M of the cartesian basis becomes T.T @ M @ T.
+
+    Parameters
+    ----------
+    basis_set_array : List[Basis]
+        Each d or f shell must be listed as consecutive functions, as made by expand_basis_set.
+    orbital_overlap : np.array
+        The overlap matrix of the cartesian basis set, used to normalise the spherical functions.
+
+    Returns
+    -------
+    transformation : np.array
+
+    """
+    columns = []
+    i = 0
+    while i < len(basis_set_array):
+        l = sum(basis_set_array[i].integral_exponents)
+        if l not in solid_harmonics:
+            column = np.zeros(len(basis_set_array))
+            column[i] = 1.0
+            columns.append(column)
+            i += 1
+            continue
+
+        shell_size = (l + 1) * (l + 2) // 2
+        shell = {basis_set_array[j].integral_exponents: j for j in range(i, i + shell_size)}
+        for harmonic in solid_harmonics[l]:
+            column = np.zeros(len(basis_set_array))
+            for (x, y, z), coefficient in harmonic.items():
+                # the normalised cartesian functions carry 1 / sqrt((2x - 1)!! (2y - 1)!! (2z - 1)!!)
+                column[shell[(x, y, z)]] = coefficient \
+                * np.sqrt(double_factorial(2 * x - 1) * double_factorial(2 * y - 1) * double_factorial(2 * z - 1))
+            columns.append(column / np.sqrt(column @ orbital_overlap @ column))
+        i += shell_size
+
+    return np.array(columns).T
+
+
+def spherical_repulsion(repulsion, transformation):
+    """Transforms the two electron repulsion integrals from the cartesian to the spherical basis set.
+
+    Parameters
+    ----------
+    repulsion : np.array
+    transformation : np.array
+
+    Returns
+    -------
+    repulsion : np.array
+
+    """
+    return four_index_transform(repulsion, transformation)
 
 
 def molecular_orbitals(repulsion, coefficients):
@@ -16,55 +99,61 @@ def molecular_orbitals(repulsion, coefficients):
     repulsion : np.array
 
     """
-    matrix_size = coefficients.shape[0]
-    for r, s in itertools.product(range(matrix_size), repeat=2):
-        repulsion[r, s, :, :] = np.transpose(coefficients) @ repulsion[r, s, :, :] @ coefficients
-    for t, u in itertools.product(range(matrix_size), repeat=2):
-        repulsion[:, :, t, u] = np.transpose(coefficients) @ repulsion[:, :, t, u] @ coefficients
-    return repulsion
+    return four_index_transform(repulsion, coefficients)
 
 
-def blocked_spin_basis_set(repulsion):
-    """Converts the two electron repusion integrals to spatial orbitals to spin orbitals in the blocked form.
+def four_index_transform(repulsion, transformation):
+    """Transforms every index of the two electron repulsion integrals, (pq|rs) = sum T_ip T_jq T_kr T_ls (ij|kl).
+
+    The last two indices are transformed in blocks of the first index into a half transformed tensor, then the first
+    two in blocks of its third index, so only one block of each tensor is in memory at a time.
 
     Parameters
     ----------
     repulsion : np.array
+    transformation : np.array
 
     Returns
     -------
     repulsion : np.array
 
     """
-    half_matrix_size = repulsion.shape[0]
-    matrix_size = half_matrix_size * 2
-    zero_matrix = np.zeros((half_matrix_size, half_matrix_size))
-    spin_orbital_repulsion = np.zeros((matrix_size, matrix_size, matrix_size, matrix_size))
+    transformation = np.asarray(transformation)
+    n, m = transformation.shape
+
+    half_transformed = scratch_space.zeros((n, n, m, m))
+    for block in scratch_space.blocks(n, n * n * max(n, m)):
+        half_transformed[block] = np.tensordot(
+            np.tensordot(repulsion[block], transformation, axes=([2], [0])), transformation, axes=([2], [0])
+        )
 
-    for r, s in itertools.product(range(matrix_size), repeat=2):
+    transformed = scratch_space.zeros((m, m, m, m))
+    for block in scratch_space.blocks(m, n * m * max(n, m)):
+        partial = np.tensordot(transformation, half_transformed[:, :, block], axes=([0], [0]))
+        transformed[:, :, block] = np.moveaxis(np.tensordot(partial, transformation, axes=([1], [0])), -1, 1)
+    return transformed
 
-        # r == alph spin and s == alph spin
-        if r < half_matrix_size and s < half_matrix_size:
-            spin_orbital_repulsion[r, s, :, :] = np.block([
-                    [repulsion[r, s, :, :], zero_matrix],
-                    [zero_matrix, repulsion[r, s, :, :]]
-            ])
 
-        # r == beta spin and s == beta spin
-        elif r >= half_matrix_size and s >= half_matrix_size:
-            spin_orbital_repulsion[r, s, :, :] = np.block([
-                    [repulsion[r - half_matrix_size, s - half_matrix_size, :, :], zero_matrix],
-                    [zero_matrix, repulsion[r - half_matrix_size, s - half_matrix_size, :, :]]
-            ])
+def blocked_spin_basis_set(repulsion):
+    """Converts the two electron repusion integrals to spatial orbitals to spin orbitals in the blocked form.
+
+    The first half of the spin orbitals have alpha spin and the second half beta spin, and (rs|tu) is non zero only if
+    r and s have the same spin and t and u have the same spin.
+
+    Parameters
+    ----------
+    repulsion : np.array
 
-        # r == alph and s == beta or r == beta and s == alph
-        else:
-            spin_orbital_repulsion[r, s, :, :] = np.block([
-                    [zero_matrix, zero_matrix],
-                    [zero_matrix, zero_matrix]
-            ])
+    Returns
+    -------
+    repulsion : np.array
 
-    return spin_orbital_repulsion
+    """
+    half_matrix_size = repulsion.shape[0]
+    spin_orbitals = np.arange(half_matrix_size * 2)
+    return spin_orbital_repulsion(
+        repulsion, spin_orbitals % half_matrix_size, spin_orbitals // half_matrix_size, (0, 1, 2, 3), None
+    )
 
 
 def spin_basis_set(repulsion):
@@ -79,14 +168,8 @@ def spin_basis_set(repulsion):
     repulsion : np.array
 
     """
-    matrix_size = repulsion.shape[0] * 2
-    spin_orbital_repulsion = np.zeros((matrix_size, matrix_size, matrix_size, matrix_size))
-
-    for r, s, t, u in itertools.product(range(matrix_size), repeat=4):
-        if r % 2 == s % 2 and t % 2 == u % 2:
-            spin_orbital_repulsion.itemset((r, s, t, u), repulsion.item(r // 2, s // 2, t // 2, u // 2))
-
-    return spin_orbital_repulsion
+    spin_orbitals = np.arange(repulsion.shape[0] * 2)
+    return spin_orbital_repulsion(repulsion, spin_orbitals // 2, spin_orbitals % 2, (0, 1, 2, 3), None)
 
 
 def spin_orbital_energies(orbital_energies):
@@ -121,12 +204,42 @@ def spin_basis_anti_physicist(repulsion):
     spin_orbital_repulsion : np.array
 
     """
-    matrix_size = repulsion.shape[0] * 2
-    spin_orbital_repulsion = np.zeros((matrix_size, matrix_size, matrix_size, matrix_size))
+    spin_orbitals = np.arange(repulsion.shape[0] * 2)
+    return spin_orbital_repulsion(repulsion, spin_orbitals // 2, spin_orbitals % 2, (0, 2, 1, 3), (0, 3, 1, 2))
+
 
-    for r, s, t, u in itertools.product(range(matrix_size), repeat=4):
-        out1 = (r % 2 == t % 2) * (s % 2 == u % 2) * repulsion.item(r // 2, t // 2, s // 2, u // 2)
-        out2 = (r % 2 == u % 2) * (s % 2 == t % 2) * repulsion.item(r // 2, u // 2, s // 2, t // 2)
-        spin_orbital_repulsion.itemset((r, s, t, u), out1 - out2)
+def spin_orbital_repulsion(repulsion, spatial, spin, first, second):
+    """Creates the two electron integrals <rs|tu> = (r s' t' u') - (r s'' t'' u'') of spin orbitals, where the primed
+    indices are the permutations first and second of (r, s, t, u), each pair of chemists notation must have the same
+    spin and the second term is left out if second is None. The tensor is filled in blocks of its first index.
 
-    return spin_orbital_repulsion
+    Parameters
+    ----------
+    repulsion : np.array
+    spatial : np.array
+        The spatial orbital of each spin orbital.
+    spin : np.array
+        The spin, 0 or 1, of each spin orbital.
+    first : Tuple[int, int, int, int]
+    second : {None, Tuple[int, int, int, int]}
+
+    Returns
+    -------
+    : np.array
+
+    """
+    matrix_size = len(spatial)
+    spin_repulsion = scratch_space.zeros((matrix_size, matrix_size, matrix_size, matrix_size))
+    same_spin = spin[:, None] == spin[None, :]
+
+    def term(block, permutation):
+        # element (r, s, t, u) of the block is (a b|c d) with (a, b, c, d) the indices (r, s, t, u) in permutation order
+        integrals = repulsion[np.ix_(spatial[block], spatial, spatial, spatial)]
+        integrals = integrals * same_spin[block, :, None, None] * same_spin[None, None, :, :]
+        return np.transpose(integrals, np.argsort(permutation))
+
+    for block in scratch_space.blocks(matrix_size, matrix_size**3):
+        spin_repulsion[block] = term(block, first)
+        if second is not None:
+            spin_repulsion[block] -= term(block, second)
+    return spin_repulsion
@@ -1,4 +1,5 @@
 from src.common import Indices
+from src.common import logger
 from src.matrixelements import molecular_orbitals
 
 
@@ -12,7 +13,7 @@ class MoellerPlesset(Indices):
         self.integrals = molecular_orbitals(hartree_fock.repulsion, orbital_coefficients)
 
     def second_order(self):
-        print('BEGIN MP2 CALCULATION\n')
+        logger.log('BEGIN MP2 CALCULATION\n')
         correlation = 0
         for i, j, a, b in self.restricted_doubles():
             out = self.orbital_energies.item(i) + self.orbital_energies.item(j) - self.orbital_energies.item(a) \
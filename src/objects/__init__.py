@@ -1,6 +1,7 @@
 from src.objects.nuclei import Nuclei
 from src.objects.basis_function import Basis
 from src.objects.primitive_basis_function import PrimitiveBasis
+from src.objects.basis_set import BasisSet
 from src.objects.reflection_symmetry import ReflectionSymmetry
 from src.objects.rotation_symmetry import RotationSymmetry
 from src.objects.improper_rotation_symmetry import ImproperRotationSymmetry
@@ -1,6 +1,6 @@
-from scipy.special import factorial2
 from math import sqrt, pi
 import itertools
+from src.common import double_factorial
 
 
 class Basis:
@@ -11,8 +11,12 @@ class Basis:
     primitive_gaussian_array : List[PrimitiveBasis]
     coordinates : Tuple[float, float, float]
     integral_exponents : Tuple[int, int, int]
+    normalisation_memo : {None, float}
+        Stores the normalisation constant once calculated.
 
     """
+    __slots__ = ('primitive_gaussian_array', 'coordinates', 'integral_exponents', 'normalisation_memo')
+
     def __init__(self, primitive_gaussian_array, coordinates, integral_exponents):
         self.primitive_gaussian_array = primitive_gaussian_array
         self.coordinates = coordinates
@@ -43,7 +47,7 @@ class Basis:
                     n_1 = primitive_a.normalisation
                     n_2 = primitive_b.normalisation
 
-                    out1 = factorial2(2 * l - 1) * factorial2(2 * m - 1) * factorial2(2 * n - 1)
+                    out1 = double_factorial(2 * l - 1) * double_factorial(2 * m - 1) * double_factorial(2 * n - 1)
                     out2 = (pi / (a_1 + a_2)) ** (3 / 2)
                     out3 = (2 * (a_1 + a_2)) ** (l + m + n)
                     ans += (c_1 * c_2 * n_1 * n_2 * out1 * out2) / out3
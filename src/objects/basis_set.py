@@ -0,0 +1,127 @@
+import os
+import numpy as np
+from src.objects.basis_function import Basis
+from src.objects.primitive_basis_function import PrimitiveBasis
+
+
+class BasisSet:
+    """Structure of arrays representation of a list of contracted gaussian basis functions.
+
+    The primitives of every basis function are stored back to back in contiguous arrays, with the primitives of basis
+    function i between offsets[i] and offsets[i + 1]. The normalisation constants are calculated once on creation.
+    Indexing or iterating returns Basis objects built from the arrays with their normalisations filled in, so the
+    basis set can be used anywhere a list of Basis objects is. The Basis objects are created on first use and are not
+    pickled, so sending a basis set to another process only copies the arrays.
+
+    Attributes
+    ----------
+    exponents : np.array
+    contractions : np.array
+    primitive_normalisations : np.array
+    offsets : np.array
+    centres : np.array
+        One row of x, y and z coordinates for each basis function.
+    angular_momenta : np.array
+        One row of integral exponents for each basis function.
+    normalisations : np.array
+    basis_memo : Dict[int, Basis]
+
+    """
+    array_names = (
+        'exponents', 'contractions', 'primitive_normalisations', 'offsets', 'centres', 'angular_momenta',
+        'normalisations'
+    )
+
+    def __init__(self, basis_set_array):
+        primitives = [primitive for basis in basis_set_array for primitive in basis.primitive_gaussian_array]
+        self.exponents = np.array([primitive.exponent for primitive in primitives], dtype=float)
+        self.contractions = np.array([primitive.contraction for primitive in primitives], dtype=float)
+        self.primitive_normalisations = np.array([primitive.normalisation for primitive in primitives], dtype=float)
+        self.offsets = np.cumsum([0] + [len(basis.primitive_gaussian_array) for basis in basis_set_array])
+        self.centres = np.array([basis.coordinates for basis in basis_set_array], dtype=float).reshape(-1, 3)
+        self.angular_momenta = np.array([basis.integral_exponents for basis in basis_set_array], dtype=int)\
+        .reshape(-1, 3)
+        self.normalisations = np.array([basis.normalisation for basis in basis_set_array], dtype=float)
+        self.basis_memo = {}
+
+    def __len__(self):
+        return len(self.normalisations)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('basis set index out of range')
+        if i not in self.basis_memo:
+            self.basis_memo[i] = self.create_basis(i)
+        return self.basis_memo[i]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.array_names}
+
+    def __setstate__(self, state):
+        for name in self.array_names:
+            setattr(self, name, state[name])
+        self.basis_memo = {}
+
+    def create_basis(self, i):
+        """Creates the Basis object of basis function i with the normalisation constants filled in.
+
+        Parameters
+        ----------
+        i : int
+
+        Returns
+        -------
+        basis : Basis
+
+        """
+        coordinates = tuple(float(x) for x in self.centres[i])
+        integral_exponents = tuple(int(l) for l in self.angular_momenta[i])
+        primitive_gaussian_array = []
+        for j in range(self.offsets[i], self.offsets[i + 1]):
+            primitive = PrimitiveBasis(float(self.contractions[j]), float(self.exponents[j]), coordinates,
+            integral_exponents)
+            primitive.normalisation_memo = float(self.primitive_normalisations[j])
+            primitive_gaussian_array.append(primitive)
+        basis = Basis(primitive_gaussian_array, coordinates, integral_exponents)
+        basis.normalisation_memo = float(self.normalisations[i])
+        return basis
+
+    def save(self, directory):
+        """Saves every array as a .npy file so the basis set can be loaded again with a memory map.
+
+        Parameters
+        ----------
+        directory : str
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self.array_names:
+            np.save(os.path.join(directory, name + '.npy'), getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Loads a basis set saved with save.
+
+        Parameters
+        ----------
+        directory : str
+        mmap_mode : {None, str}
+            Passed to np.load, by default the arrays are memory mapped read only.
+
+        Returns
+        -------
+        basis_set : BasisSet
+
+        """
+        basis_set = cls.__new__(cls)
+        basis_set.__setstate__({
+            name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode) for name in cls.array_names
+        })
+        return basis_set
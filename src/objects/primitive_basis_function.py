@@ -1,6 +1,6 @@
 from math import pi, sqrt
-from scipy.special import factorial2
 import numpy as np
+from src.common import double_factorial
 
 
 class PrimitiveBasis:
@@ -16,6 +16,8 @@ class PrimitiveBasis:
         Stores the normalisation constant once calculated.
 
     """
+    __slots__ = ('contraction', 'exponent', 'coordinates', 'integral_exponents', 'normalisation_memo')
+
     def __init__(self, contraction, exponent, coordinates, integral_exponents):
         self.contraction = contraction
         self.exponent = exponent
@@ -34,7 +36,7 @@ class PrimitiveBasis:
         """
         if self.normalisation_memo is None:
             l, m, n = self.integral_exponents
-            out1 = factorial2(2 * l - 1) * factorial2(2 * m - 1) * factorial2(2 * n - 1)
+            out1 = double_factorial(2 * l - 1) * double_factorial(2 * m - 1) * double_factorial(2 * n - 1)
             out2 = (pi / (2 * self.exponent))**(3/2)
             out3 = (4 * self.exponent)**(l + m + n)
             self.normalisation_memo = 1 / sqrt((out1 * out2) / out3)
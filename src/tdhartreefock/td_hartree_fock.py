@@ -1,5 +1,6 @@
 from math import sqrt
 import numpy as np
+from src.common import logger
 from src.matrixelements import molecular_orbitals
 from src.matrixelements import spin_basis_set
 from src.matrixelements import spin_orbital_energies
@@ -21,7 +22,7 @@ class TimeDependentHartreeFock:
         singlet_a_matrix, triplet_a_matrix = self.tdhf.create_a_matrices()
         singlet_b_matrix, triplet_b_matrix = self.tdhf.create_b_matrices()
 
-        print('BEGIN TDHF EXCITED STATE CALCULATION\n')
+        logger.log('BEGIN TDHF EXCITED STATE CALCULATION\n')
         singlet_tdhf_matrix = (singlet_a_matrix + singlet_b_matrix) * (singlet_a_matrix - singlet_b_matrix)
         singlet_excitation_energies = np.linalg.eig(singlet_tdhf_matrix)[0]
         singlet_excitation_energies = [sqrt(x) for x in singlet_excitation_energies]
@@ -30,8 +31,9 @@ class TimeDependentHartreeFock:
         triplet_excitation_energies = np.linalg.eig(triplet_tdhf_matrix)[0]
         triplet_excitation_energies = [sqrt(x) for x in triplet_excitation_energies]
         triplet_excitation_energies.sort()
-        print('SINGLET EXCITATION ENERGIES\n{}\n'.format(singlet_excitation_energies))
-        print('TRIPLET EXCITATION ENERGIES\n{}\n\n'.format(triplet_excitation_energies))
+        logger.log('SINGLET EXCITATION ENERGIES\n{}\n', singlet_excitation_energies)
+        logger.log('TRIPLET EXCITATION ENERGIES\n{}\n\n', triplet_excitation_energies)
+        logger.record('excitations', singlet=singlet_excitation_energies, triplet=triplet_excitation_energies)
 
         return self.electron_energy, 0.0
 
@@ -41,10 +43,11 @@ class TammDancoffApproximation(TimeDependentHartreeFock):
     def calculate(self):
         singlet_a_matrix, triplet_a_matrix = self.tdhf.create_a_matrices()
 
-        print('BEGIN CIS EXCITED STATE CALCULATION\n')
+        logger.log('BEGIN CIS EXCITED STATE CALCULATION\n')
         singlet_excitation_energies = np.linalg.eigh(singlet_a_matrix)[0]
         triplet_excitation_energies = np.linalg.eigh(triplet_a_matrix)[0]
-        print('SINGLET EXCITATION ENERGIES\n{}\n'.format(singlet_excitation_energies))
-        print('TRIPLET EXCITATION ENERGIES\n{}\n\n'.format(triplet_excitation_energies))
+        logger.log('SINGLET EXCITATION ENERGIES\n{}\n', singlet_excitation_energies)
+        logger.log('TRIPLET EXCITATION ENERGIES\n{}\n\n', triplet_excitation_energies)
+        logger.record('excitations', singlet=singlet_excitation_energies, triplet=triplet_excitation_energies)
 
         return self.electron_energy, 0.0
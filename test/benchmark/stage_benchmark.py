@@ -0,0 +1,292 @@
+import os, sys
+sys.path.insert(1, os.path.dirname(os.path.realpath(__file__)) + '/../../')
+
+import argparse, contextlib, json, platform, subprocess, time, tracemalloc
+from types import SimpleNamespace
+import numpy as np
+from src.common import Symmetry
+from src.common import read_basis_set_file
+from src.common import read_mol_file
+from src.coupledcluster import CoupledClusterPerturbativeTriples
+from src.coupledcluster import CoupledClusterSinglesDoubles
+from src.hartreefock import FockMatrixRestricted
+from src.hartreefock import LinearAlgebra
+from src.hartreefock import RestrictedSCF
+from src.matrixelements import KineticEnergyMatrix
+from src.matrixelements import NuclearAttractionMatrix
+from src.matrixelements import OrbitalOverlapMatrix
+from src.matrixelements import TwoElectronRepulsionMatrixOS
+from src.objects import PointGroup
+
+
+# each case runs the stages up to and including its last stage
+CASES = [
+    ('HeH+.mol', 'STO-3G.gbs', 'triples'),
+    ('H2O.mol', 'STO-3G.gbs', 'triples'),
+    ('C2H4.mol', '3-21G.gbs', 'ao_to_mo'),
+    ('H2O.mol', 'cc-pVDZ.gbs', 'ao_to_mo'),
+]
+STAGES = ['one_electron', 'two_electron', 'scf', 'ao_to_mo', 'ccsd', 'triples']
+# the entry points whose import is timed in a fresh interpreter, as every batch job and spawned worker pays for it
+IMPORTS = ['src.main', 'src.energy', 'src.hartreefock']
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baseline.json')
+
+
+class StageBenchmark:
+    """Times each stage of a restricted Hartree-Fock and coupled cluster calculation and measures its peak memory.
+
+    The stages are the one electron integrals, the two electron integrals, the SCF iterations, the transformation of
+    the integrals to the spin orbital basis, the CCSD iterations and the perturbative triples. Each stage is timed
+    with perf_counter and, if memory is True, run a second time under tracemalloc for the peak bytes it allocates, so
+    the tracing does not slow down the timing. Tracing slows the python loops of a stage many times over, so stages
+    slower than memory_seconds are not traced. The output of the program is discarded.
+
+    Attributes
+    ----------
+    memory : bool
+    repeats : int
+        The number of times each stage is timed, the fastest of which is kept.
+    memory_seconds : float
+
+    """
+    def __init__(self, memory=True, repeats=1, memory_seconds=10.0):
+        self.memory = memory
+        self.repeats = repeats
+        self.memory_seconds = memory_seconds
+
+    def run(self, mol_file, basis_file, last_stage='triples'):
+        """Runs the stages of a case up to and including last_stage.
+
+        Parameters
+        ----------
+        mol_file : str
+        basis_file : str
+        last_stage : str
+
+        Returns
+        -------
+        results : Dict[str, Dict[str, float]]
+            The seconds and peak bytes of each stage.
+
+        """
+        nuclei_array, electrons, _ = read_mol_file(mol_file)
+        basis_set = read_basis_set_file(basis_file, nuclei_array)
+        symmetry = Symmetry(PointGroup([], [], [], [], 'C_{1}'), basis_set)
+        stages = STAGES[:STAGES.index(last_stage) + 1]
+        results = {}
+        state = {}
+
+        def one_electron():
+            overlap = OrbitalOverlapMatrix(basis_set).create()
+            core_hamiltonian = KineticEnergyMatrix(basis_set).create() \
+            + NuclearAttractionMatrix(basis_set, nuclei_array).create()
+            return overlap, core_hamiltonian
+
+        def two_electron():
+            return TwoElectronRepulsionMatrixOS(basis_set, symmetry, 1).create_repulsion_matrix()
+
+        def scf():
+            overlap, core_hamiltonian = state['one_electron']
+            linear_algebra = LinearAlgebra(overlap)
+            fock_matrix = FockMatrixRestricted(core_hamiltonian, state['two_electron'])
+            initial_coefficients = linear_algebra.diagonalize(core_hamiltonian)[1]
+            return RestrictedSCF(linear_algebra, electrons, overlap, fock_matrix).begin_iterations(initial_coefficients)
+
+        def hartree_fock():
+            return SimpleNamespace(begin_scf=lambda: state['scf'], repulsion=state['two_electron'], electrons=electrons)
+
+        def ao_to_mo():
+            return CoupledClusterSinglesDoubles(hartree_fock())
+
+        def ccsd():
+            return state['ao_to_mo'].calculate_singles_doubles()
+
+        def prepare_triples():
+            # the triples need the ccsd amplitudes, which CoupledClusterPerturbativeTriples calculates when created
+            state['prepare_triples'] = CoupledClusterPerturbativeTriples(hartree_fock())
+
+        def triples():
+            return state['prepare_triples'].calculate_perturbative_triples()
+
+        functions = {
+            'one_electron': one_electron, 'two_electron': two_electron, 'scf': scf, 'ao_to_mo': ao_to_mo,
+            'ccsd': ccsd, 'triples': triples
+        }
+        for stage in stages:
+            if stage == 'triples':
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    prepare_triples()
+            state[stage], results[stage] = self.measure(functions[stage])
+        return results
+
+    def measure(self, function):
+        """Calls a function, returning its result with its seconds and peak bytes.
+
+        Parameters
+        ----------
+        function : Callable
+
+        Returns
+        -------
+        result : object
+        measurement : Dict[str, float]
+
+        """
+        seconds = float('inf')
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                result = function()
+                seconds = min(seconds, time.perf_counter() - start)
+            measurement = {'seconds': seconds}
+            if self.memory and seconds < self.memory_seconds:
+                tracemalloc.start()
+                function()
+                measurement['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        return result, measurement
+
+
+def import_times(modules=IMPORTS, repeats=5):
+    """Times the import of each module in a fresh interpreter.
+
+    Parameters
+    ----------
+    modules : List[str]
+    repeats : int
+        The number of interpreters started for each module, the fastest of which is kept.
+
+    Returns
+    -------
+    results : Dict[str, Dict[str, float]]
+        The seconds of each module.
+
+    """
+    root = os.path.dirname(os.path.realpath(__file__)) + '/../../'
+    results = {}
+    for module in modules:
+        script = 'import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)'
+        script = script.format(module)
+        seconds = min(
+            float(subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, check=True).stdout)
+            for _ in range(repeats)
+        )
+        results[module] = {'seconds': seconds}
+    return results
+
+
+def case_name(mol_file, basis_file):
+    return mol_file[:-4] + '/' + basis_file[:-4]
+
+
+def run_cases(cases=CASES, memory=True, repeats=1):
+    """Runs the stage benchmark of every case.
+
+    Parameters
+    ----------
+    cases : List[Tuple[str, str, str]]
+        The mol file, basis file and last stage of each case.
+    memory : bool
+    repeats : int
+
+    Returns
+    -------
+    : Dict[str, object]
+        The results of each case keyed by case_name, the import_times under 'imports' and a description of the
+        machine under 'machine'.
+
+    """
+    benchmark = StageBenchmark(memory, repeats)
+    results = {
+        'machine': {
+            'platform': platform.platform(), 'processor': platform.processor(), 'python': platform.python_version(),
+            'numpy': np.__version__
+        }
+    }
+    results['imports'] = import_times(repeats=max(5, repeats))
+    for mol_file, basis_file, last_stage in cases:
+        results[case_name(mol_file, basis_file)] = benchmark.run(mol_file, basis_file, last_stage)
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, memory_tolerance=0.1, minimum_seconds=0.05):
+    """Finds the stages that are slower or use more memory than the baseline by more than a tolerance.
+
+    Stages faster than minimum_seconds in both are not compared on time as their timings are mostly noise.
+
+    Parameters
+    ----------
+    results : Dict[str, object]
+    baseline : Dict[str, object]
+    tolerance : float
+        The fraction of the baseline time a stage may take on top of it.
+    memory_tolerance : float
+        The fraction of the baseline peak bytes a stage may use on top of it.
+    minimum_seconds : float
+
+    Returns
+    -------
+    regressions : List[str]
+
+    """
+    regressions = []
+    for case, stages in results.items():
+        if case == 'machine' or case not in baseline:
+            continue
+        for stage, measurement in stages.items():
+            reference = baseline[case].get(stage)
+            if reference is None:
+                continue
+            seconds, reference_seconds = measurement['seconds'], reference['seconds']
+            if max(seconds, reference_seconds) >= minimum_seconds and seconds > (1 + tolerance) * reference_seconds:
+                regressions.append('{} {}: {:.3f}s against {:.3f}s'.format(case, stage, seconds, reference_seconds))
+            if 'peak_bytes' in measurement and 'peak_bytes' in reference \
+            and measurement['peak_bytes'] > (1 + memory_tolerance) * reference['peak_bytes']:
+                regressions.append('{} {}: {} bytes against {} bytes'.format(
+                    case, stage, measurement['peak_bytes'], reference['peak_bytes']
+                ))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print('{:<20}{:<15}{:>12}{:>12}{:>15}'.format('CASE', 'STAGE', 'SECONDS', 'BASELINE', 'PEAK MB'))
+    for case, stages in results.items():
+        if case == 'machine':
+            continue
+        for stage, measurement in stages.items():
+            reference = (baseline or {}).get(case, {}).get(stage, {}).get('seconds', float('nan'))
+            seconds, peak = measurement['seconds'], measurement.get('peak_bytes', float('nan')) / 2**20
+            print('{:<20}{:<15}{:>12.3f}{:>12.3f}{:>15.2f}'.format(case, stage, seconds, reference, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times each stage of a fixed set of calculations.')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='the json file of the baseline results')
+    parser.add_argument('--save', action='store_true', help='save the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='the fraction slower a stage may be')
+    parser.add_argument('--repeats', type=int, default=1, help='the number of timings of each stage')
+    parser.add_argument('--no-memory', action='store_true', help='skip measuring the peak memory')
+    parser.add_argument('--cases', nargs='*', help='the cases to run, e.g. H2O/STO-3G')
+    arguments = parser.parse_args()
+
+    cases = [case for case in CASES if arguments.cases is None or case_name(*case[:2]) in arguments.cases]
+    results = run_cases(cases, not arguments.no_memory, arguments.repeats)
+
+    baseline = None
+    if os.path.isfile(arguments.baseline):
+        with open(arguments.baseline, 'r') as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+
+    if arguments.save:
+        with open(arguments.baseline, 'w') as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+        print('\nSAVED THE BASELINE TO ' + arguments.baseline)
+    elif baseline is not None:
+        regressions = compare(results, baseline, arguments.tolerance)
+        print('\nREGRESSIONS\n' + '\n'.join(regressions) if regressions else '\nNO REGRESSIONS')
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
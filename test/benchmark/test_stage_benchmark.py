@@ -0,0 +1,59 @@
+import json, os
+from unittest import TestCase, skipUnless
+from stage_benchmark import BASELINE_FILE
+from stage_benchmark import CASES
+from stage_benchmark import StageBenchmark
+from stage_benchmark import compare
+from stage_benchmark import import_times
+from stage_benchmark import run_cases
+
+
+class TestCompare(TestCase):
+
+    def setUp(self):
+        self.baseline = {
+            'machine': {}, 'H2O/STO-3G': {
+                'scf': {'seconds': 1.0, 'peak_bytes': 1000}, 'one_electron': {'seconds': 0.01, 'peak_bytes': 10}
+            }
+        }
+
+    def test_compare_returns_no_regressions_within_the_tolerance(self):
+        results = {'H2O/STO-3G': {'scf': {'seconds': 1.2, 'peak_bytes': 1050}}}
+        self.assertEqual(compare(results, self.baseline), [])
+
+    def test_compare_flags_a_stage_slower_than_the_tolerance(self):
+        results = {'H2O/STO-3G': {'scf': {'seconds': 1.3, 'peak_bytes': 1000}}}
+        self.assertEqual(len(compare(results, self.baseline)), 1)
+
+    def test_compare_flags_a_stage_using_more_memory_than_the_tolerance(self):
+        results = {'H2O/STO-3G': {'scf': {'seconds': 1.0, 'peak_bytes': 1200}}}
+        self.assertEqual(len(compare(results, self.baseline)), 1)
+
+    def test_compare_ignores_the_time_of_stages_faster_than_the_minimum(self):
+        results = {'H2O/STO-3G': {'one_electron': {'seconds': 0.02, 'peak_bytes': 10}}}
+        self.assertEqual(compare(results, self.baseline), [])
+
+
+class TestStageBenchmark(TestCase):
+
+    def test_run_measures_every_stage_up_to_the_last(self):
+        results = StageBenchmark().run('HeH+.mol', 'STO-3G.gbs', 'ao_to_mo')
+        self.assertEqual(list(results), ['one_electron', 'two_electron', 'scf', 'ao_to_mo'])
+        for measurement in results.values():
+            self.assertGreater(measurement['seconds'], 0.0)
+            self.assertGreater(measurement['peak_bytes'], 0)
+
+    def test_run_does_not_trace_the_memory_of_stages_slower_than_memory_seconds(self):
+        results = StageBenchmark(memory_seconds=0.0).run('HeH+.mol', 'STO-3G.gbs', 'one_electron')
+        self.assertNotIn('peak_bytes', results['one_electron'])
+
+    def test_import_times_measures_each_module_in_a_fresh_interpreter(self):
+        results = import_times(['src.common'], repeats=1)
+        self.assertGreater(results['src.common']['seconds'], 0.0)
+
+    @skipUnless(os.path.isfile(BASELINE_FILE), 'no baseline saved with stage_benchmark.py --save')
+    def test_stages_are_no_slower_than_the_baseline(self):
+        with open(BASELINE_FILE, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare(run_cases(CASES), baseline)
+        self.assertEqual(regressions, [], '\n'.join(regressions))
@@ -0,0 +1,40 @@
+import json, os, tempfile
+from unittest import TestCase
+from numpy import testing
+from src.batch import BatchRunner
+from src.batch import read_manifest
+from src.batch import run_job
+
+
+class TestBatchRunner(TestCase):
+
+    def setUp(self):
+        self.jobs = [
+            {'mol_file': 'HeH+.mol', 'basis_file': 'STO-3G.gbs', 'method': 'RHF'},
+            {'mol_file': 'HeH+.mol', 'basis_file': 'STO-3G.gbs', 'method': 'RHF', 'processes': 2},
+            {'mol_file': 'HeH+.mol', 'basis_file': '3-21G.gbs', 'method': 'UHF', 'options': {'symmetry': True}}
+        ]
+
+    def test_read_manifest_reads_a_json_list_or_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            list_file = os.path.join(directory, 'jobs.json')
+            lines_file = os.path.join(directory, 'jobs.jsonl')
+            with open(list_file, 'w') as file:
+                json.dump(self.jobs, file)
+            with open(lines_file, 'w') as file:
+                file.write('\n'.join(json.dumps(job) for job in self.jobs) + '\n\n')
+            self.assertEqual(read_manifest(list_file), self.jobs)
+            self.assertEqual(read_manifest(lines_file), self.jobs)
+
+    def test_run_job_records_the_error_of_a_failed_job(self):
+        record = run_job({'mol_file': 'missing.mol', 'basis_file': 'STO-3G.gbs', 'method': 'RHF'}, 1)
+        self.assertIn('FileNotFoundError', record['error'])
+        self.assertNotIn('energy', record)
+
+    def test_run_returns_the_record_of_every_job_in_order(self):
+        records = BatchRunner(workers=2, cores=2).run(self.jobs)
+        self.assertEqual([record['job'] for record in records], [0, 1, 2])
+        self.assertEqual([record['processes'] for record in records], [1, 2, 1])
+        testing.assert_approx_equal(records[0]['energy'], -2.84183608212, 6)
+        testing.assert_approx_equal(records[1]['energy'], -2.84183608212, 6)
+        self.assertLess(records[2]['energy'], records[0]['energy'])
@@ -0,0 +1,51 @@
+import os, tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from src.common import BasisSetLibrary
+from src.common.basis_set_library import basis_set_path, parse_basis_set_file
+
+
+class TestBasisSetLibrary(TestCase):
+
+    def setUp(self):
+        self.helium = MagicMock(element='HELIUM', charge=2, mass=4, coordinates=(0.000000, 0.000000, 0.7316))
+        self.hydrogen = MagicMock(element='HYDROGEN', charge=1, mass=1, coordinates=(0.000000, 0.000000, -0.7316))
+
+    def test_parse_basis_set_file_returns_the_shells_of_each_element(self):
+        shells = parse_basis_set_file(basis_set_path('STO-3G.gbs'))
+        self.assertEqual(shells['HYDROGEN'], [
+            ['S', [0.15432897, 3.42525091], [0.53532814, 0.62391373], [0.44463454, 0.16885540]]
+        ])
+        self.assertEqual([shell[0] for shell in shells['CARBON']], ['S', 'L'])
+
+    def test_parse_basis_set_file_reads_fortran_exponents(self):
+        shells = parse_basis_set_file(basis_set_path('cc-pVDZ.gbs'))
+        self.assertEqual(shells['SODIUM'][0][1], [0.458878e-03, 31700.0000000])
+
+    def test_create_places_the_shells_on_every_nuclei(self):
+        basis_array = BasisSetLibrary().create('STO-3G.gbs', [self.helium, self.hydrogen])
+        self.assertEqual(len(basis_array), 2)
+        self.assertEqual(basis_array[0].coordinates, (0.000000, 0.000000, 0.7316))
+        self.assertEqual(basis_array[1].primitive_gaussian_array[2].exponent, 0.16885540)
+
+    def test_shells_parses_each_file_once(self):
+        library = BasisSetLibrary()
+        with patch('src.common.basis_set_library.parse_basis_set_file', wraps=parse_basis_set_file) as parse:
+            library.create('STO-3G.gbs', [self.helium, self.hydrogen])
+            library.create('STO-3G.gbs', [self.hydrogen, self.hydrogen, self.helium])
+        self.assertEqual(parse.call_count, 1)
+
+    def test_shells_are_loaded_from_the_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            shells = BasisSetLibrary(cache_directory).shells('STO-3G.gbs')
+            self.assertEqual(len(os.listdir(cache_directory)), 1)
+            with patch('src.common.basis_set_library.parse_basis_set_file') as parse:
+                self.assertEqual(BasisSetLibrary(cache_directory).shells('STO-3G.gbs'), shells)
+            parse.assert_not_called()
+
+    def test_shells_are_parsed_again_when_the_file_is_modified(self):
+        library = BasisSetLibrary()
+        library.shells('STO-3G.gbs')
+        path = basis_set_path('STO-3G.gbs')
+        library.shells_memo[path] = (library.shells_memo[path][0] - 1, {})
+        self.assertIn('HYDROGEN', library.shells('STO-3G.gbs'))
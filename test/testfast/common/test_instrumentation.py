@@ -0,0 +1,69 @@
+import csv, json, os, tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pool
+from unittest import TestCase
+from src.common import Instrumentation
+from src.common import instrumentation
+
+
+def counted_square(x):
+    if instrumentation.enabled:
+        instrumentation.count('squares')
+    return x * x
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        self.instrumentation = Instrumentation(enabled=True)
+
+    def test_nested_timers_are_keyed_by_their_path(self):
+        with self.instrumentation.timer('calculation'):
+            for _ in range(2):
+                with self.instrumentation.timer('scf'):
+                    pass
+        self.assertEqual(sorted(self.instrumentation.timers), ['calculation', 'calculation/scf'])
+        self.assertEqual(self.instrumentation.timers['calculation/scf']['calls'], 2)
+        self.assertGreaterEqual(
+            self.instrumentation.timers['calculation']['seconds'],
+            self.instrumentation.timers['calculation/scf']['seconds']
+        )
+
+    def test_count_adds_up_the_amounts(self):
+        self.instrumentation.count('fock_builds')
+        self.instrumentation.count('fock_builds', 2)
+        self.assertEqual(self.instrumentation.counters, {'fock_builds': 3})
+
+    def test_nothing_is_recorded_when_disabled_but_the_timer_still_measures(self):
+        instrumentation = Instrumentation()
+        with instrumentation.timer('scf') as timer:
+            instrumentation.count('scf_iterations')
+        self.assertEqual(instrumentation.report(), {'timers': {}, 'counters': {}})
+        self.assertGreater(timer.seconds, 0.0)
+
+    def test_write_json_and_csv(self):
+        with self.instrumentation.timer('scf'):
+            self.instrumentation.count('scf_iterations', 5)
+        with tempfile.TemporaryDirectory() as directory:
+            self.instrumentation.write(os.path.join(directory, 'timings.json'))
+            with open(os.path.join(directory, 'timings.json')) as file:
+                self.assertEqual(json.load(file), self.instrumentation.report())
+            self.instrumentation.write(os.path.join(directory, 'timings.csv'))
+            with open(os.path.join(directory, 'timings.csv')) as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['kind', 'name', 'calls', 'value'])
+        self.assertEqual(rows[1][:3], ['timer', 'scf', '1'])
+        self.assertEqual(rows[2], ['counter', 'scf_iterations', '', '5'])
+
+    def test_starmap_adds_the_counters_of_the_workers(self):
+        enabled, counters = instrumentation.enabled, instrumentation.counters
+        instrumentation.enabled, instrumentation.counters = True, {}
+        try:
+            arguments, squares = [(x,) for x in range(10)], [x * x for x in range(10)]
+            with Pool(2) as pool:
+                self.assertEqual(instrumentation.starmap(pool, counted_square, arguments, 3), squares)
+            with ProcessPoolExecutor(2) as executor:
+                self.assertEqual(instrumentation.starmap(executor, counted_square, arguments), squares)
+            self.assertEqual(instrumentation.counters, {'squares': 20})
+        finally:
+            instrumentation.enabled, instrumentation.counters = enabled, counters
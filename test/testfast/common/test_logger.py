@@ -0,0 +1,56 @@
+import io, json, os, tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from src.common import Logger
+from src.common.logger import DEBUG
+from src.common.logger import QUIET
+from src.common.logger import SUMMARY
+
+
+class TestLogger(TestCase):
+
+    def printed(self, logger, function):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            function(logger)
+        return stdout.getvalue()
+
+    def test_log_prints_only_at_or_above_its_level(self):
+        printed = self.printed(Logger(SUMMARY), lambda logger: logger.log('SCF ENERGY: {}', 1.5))
+        self.assertEqual(printed, 'SCF ENERGY: 1.5\n')
+        self.assertEqual(self.printed(Logger(SUMMARY), lambda logger: logger.log('DETAIL', level=DEBUG)), '')
+
+    def test_arguments_are_not_formatted_when_not_printed(self):
+        argument = MagicMock()
+        argument.__str__ = MagicMock(return_value='ARGUMENT')
+        self.printed(Logger(QUIET), lambda logger: logger.log('{}', argument))
+        argument.__str__.assert_not_called()
+        self.printed(Logger(SUMMARY), lambda logger: logger.log('{}', argument))
+        argument.__str__.assert_called_once_with()
+
+    def test_matrix_is_printed_in_full_at_debug_only(self):
+        matrix = np.arange(2000.0)
+        self.assertEqual(self.printed(Logger(SUMMARY), lambda logger: logger.matrix('MATRIX', matrix)), '')
+        self.assertNotIn('...', self.printed(Logger(DEBUG), lambda logger: logger.matrix('MATRIX', matrix)))
+        self.assertIn('...', str(matrix))
+
+    def test_quiet_silences_then_restores_the_verbosity(self):
+        logger = Logger(SUMMARY)
+        with logger.quiet():
+            self.assertEqual(self.printed(logger, lambda logger: logger.log('SCF ENERGY')), '')
+        self.assertEqual(logger.verbosity, SUMMARY)
+
+    def test_record_appends_one_json_line_for_each_result(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.jsonl')
+            logger = Logger(results_file=results_file)
+            logger.record('scf', electron_energy=np.float64(-1.5), orbital_energies=np.array([-0.5, 0.5]))
+            logger.record('energy', total_energy=-1.0)
+            with open(results_file) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(records, [
+            {'record': 'scf', 'electron_energy': -1.5, 'orbital_energies': [-0.5, 0.5]},
+            {'record': 'energy', 'total_energy': -1.0}
+        ])
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from numpy import testing
+from src.common import coulomb_gradient
 from src.common import coulomb_matrix
 from src.objects import Nuclei
 
@@ -19,3 +20,13 @@ class TestCoulomb(TestCase):
         nuclei_array = [nuclei_a, nuclei_b]
         energy = coulomb_matrix(nuclei_array)
         testing.assert_approx_equal(energy.item(0, 1), 1.366867, 7)
+
+    def test_coulomb_gradient_matches_finite_difference_of_the_repulsion_energy(self):
+        nuclei_array = [Nuclei('HYDROGEN', 1, 1, (0.1, 0.2, 0.7316)), Nuclei('HELIUM', 2, 4, (0, 0, -0.7316))]
+        gradient = coulomb_gradient(nuclei_array)
+        nuclei_array[0].coordinates = (0.1, 0.2, 0.7317)
+        energy_forward = coulomb_matrix(nuclei_array).sum() / 2
+        nuclei_array[0].coordinates = (0.1, 0.2, 0.7315)
+        energy_backward = coulomb_matrix(nuclei_array).sum() / 2
+        testing.assert_almost_equal(gradient.item(0, 2), (energy_forward - energy_backward) / 0.0002, 6)
+        testing.assert_array_almost_equal(gradient.sum(axis=0), (0, 0, 0), 10)
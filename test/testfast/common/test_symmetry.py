@@ -1,7 +1,17 @@
+import itertools
 from unittest import TestCase
 from unittest.mock import MagicMock
+import numpy as np
 from numpy import testing
 from src.common import Symmetry
+from src.common import read_basis_set_file
+from src.common import read_mol_file
+from src.factory import MoleculeFactory
+from src.hartreefock import SymmetryAdaptedLinearAlgebra
+from src.integrals import ObaraSaika
+from src.matrixelements import OrbitalOverlapMatrix
+from src.matrixelements import TwoElectronRepulsion
+from src.matrixelements import unique_quartets
 
 
 class TestSymmetrySort(TestCase):
@@ -46,3 +56,78 @@ class TestSymmetrySort(TestCase):
     def test_sort_indices_9(self):
         out = self.symmetry.sort_index(1, 1, 0, 2)
         testing.assert_array_equal(out, (0, 2, 1, 1))
+
+
+class TestSymmetryAdaptedBasis(TestCase):
+
+    def setUp(self):
+        nuclei_array, self.electrons, _ = read_mol_file('H2O.mol')
+        nuclei_array, point_group = MoleculeFactory(symmetry=True).create(nuclei_array)
+        self.basis_set_array = read_basis_set_file('STO-3G.gbs', nuclei_array)
+        self.symmetry = Symmetry(point_group, self.basis_set_array)
+        self.orbital_overlap = OrbitalOverlapMatrix(self.basis_set_array).create()
+
+    def test_symmetry_adapted_basis_spans_the_basis_set_with_orthonormal_combinations(self):
+        salc, irreps = self.symmetry.symmetry_adapted_basis()
+        self.assertEqual(len(irreps), 4)
+        self.assertEqual(sorted(columns.stop - columns.start for _, columns in irreps), [0, 1, 2, 4])
+        testing.assert_allclose(salc.T @ salc, np.identity(7), atol=1e-12)
+
+    def test_overlap_matrix_is_block_diagonal_in_the_symmetry_adapted_basis(self):
+        salc, irreps = self.symmetry.symmetry_adapted_basis()
+        overlap = salc.T @ self.orbital_overlap @ salc
+        for (_, columns_i), (_, columns_j) in itertools.product(irreps, repeat=2):
+            if columns_i != columns_j:
+                testing.assert_allclose(overlap[columns_i, columns_j], 0.0, atol=1e-10)
+
+    def test_symmetry_adapted_linear_algebra_agrees_with_the_dense_eigenproblem(self):
+        salc, irreps = self.symmetry.symmetry_adapted_basis()
+        linear_algebra = SymmetryAdaptedLinearAlgebra(self.orbital_overlap, salc, irreps)
+        energies = linear_algebra.diagonalize(self.orbital_overlap @ self.orbital_overlap)[0]
+        testing.assert_allclose(energies, np.sort(np.linalg.eigvalsh(self.orbital_overlap)), atol=1e-10)
+
+    def test_occupied_orbitals_of_each_irreducible_representation_come_first(self):
+        salc, irreps = self.symmetry.symmetry_adapted_basis()
+        occupations = [1 if columns.stop > columns.start else 0 for _, columns in irreps]
+        linear_algebra = SymmetryAdaptedLinearAlgebra(self.orbital_overlap, salc, irreps, occupations)
+        energies, coefficients = linear_algebra.diagonalize(self.orbital_overlap @ self.orbital_overlap)
+        occupied = coefficients[:, :sum(occupations)]
+        for _, columns in irreps:
+            if columns.stop > columns.start:
+                self.assertEqual(np.count_nonzero(np.abs(salc[:, columns].T @ self.orbital_overlap @ occupied)
+                .max(axis=0) > 1e-8), 1)
+
+
+class TestNoneZeroIntegrals(TestCase):
+
+    def setUp(self):
+        nuclei_array, _, _ = read_mol_file('C2H4.mol')
+        nuclei_array, point_group = MoleculeFactory(symmetry=True).create(nuclei_array)
+        self.symmetry = Symmetry(point_group, read_basis_set_file('STO-3G.gbs', nuclei_array))
+
+    def test_none_zero_integrals_agrees_with_none_zero_integral_for_every_quartet(self):
+        quartets = unique_quartets(len(self.symmetry.basis_set))
+        expected = [self.symmetry.none_zero_integral(tuple(quartet)) for quartet in quartets]
+        testing.assert_array_equal(self.symmetry.none_zero_integrals(quartets), expected)
+        self.assertLess(sum(expected), len(quartets))
+
+
+class TestSignedPermutations(TestCase):
+
+    def setUp(self):
+        nuclei_array, _, _ = read_mol_file('H2O.mol')
+        nuclei_array, point_group = MoleculeFactory(symmetry=True).create(nuclei_array)
+        self.symmetry = Symmetry(point_group, read_basis_set_file('STO-3G.gbs', nuclei_array))
+
+    def test_signed_permutations_are_the_group_of_the_point_group(self):
+        group = self.symmetry.signed_permutations()
+        self.assertEqual(len(group), 4)
+        testing.assert_array_equal(group[0][0], np.arange(len(self.symmetry.basis_set)))
+        for permutation, signs in group:
+            testing.assert_array_equal(np.sort(permutation), np.arange(len(self.symmetry.basis_set)))
+
+    def test_repulsion_matrix_from_the_orbits_of_the_quartets_is_unchanged(self):
+        basis_set = self.symmetry.basis_set
+        repulsion = TwoElectronRepulsion(basis_set, ObaraSaika(), self.symmetry, 1, orbits=False)
+        orbits = TwoElectronRepulsion(basis_set, ObaraSaika(), self.symmetry, 1, orbits=True)
+        testing.assert_allclose(orbits.create_repulsion_matrix(), repulsion.create_repulsion_matrix(), atol=1e-12)
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from numpy import testing
+import numpy as np
+from src.common import Symmetry
+from src.common import logger
+from src.common import read_basis_set_file
+from src.common import read_mol_file
+from src.energy import Energy
+from src.factory import MoleculeFactory
+from src.objects import Nuclei
+
+
+def displaced(nuclei_array, displacement):
+    return [Nuclei(nuclei.element, nuclei.charge, nuclei.mass, tuple(np.add(nuclei.coordinates, vector)))
+            for nuclei, vector in zip(nuclei_array, displacement)]
+
+
+class TestEnergy(TestCase):
+
+    def setUp(self):
+        self.nuclei_array, electrons, multiplicity = read_mol_file('HeH+.mol')
+        self.energy_object = Energy(electrons, multiplicity, 1, 'RHF')
+
+    def test_calculate_energy_with_the_default_symmetry_object(self):
+        basis_set = read_basis_set_file('STO-3G.gbs', self.nuclei_array)
+        with logger.quiet():
+            total_energy = self.energy_object.calculate_energy(self.nuclei_array, basis_set)
+        testing.assert_approx_equal(total_energy, -2.84183608212, 6)
+        self.assertEqual(len(self.energy_object.symmetry_object.basis_set), len(basis_set))
+
+    def test_symmetry_of_the_initial_geometry_is_dropped_once_a_displacement_breaks_it(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('H2O.mol')
+        nuclei_array, point_group = MoleculeFactory(True).create(nuclei_array)
+        energy_object = Energy(electrons, multiplicity, 1, 'RHF')
+        energy_object.symmetry_object = Symmetry(point_group, read_basis_set_file('STO-3G.gbs', nuclei_array))
+        geometry = displaced(nuclei_array, [[0.0, 0.0, 0.0], [0.1, 0.05, 0.0], [0.0, 0.0, 0.0]])
+        basis_set = read_basis_set_file('STO-3G.gbs', geometry)
+        with logger.quiet():
+            total_energy = energy_object.calculate_energy(geometry, basis_set)
+            expected = Energy(electrons, multiplicity, 1, 'RHF').calculate_energy(geometry, basis_set)
+        testing.assert_approx_equal(total_energy, expected, 10)
+        self.assertEqual(energy_object.symmetry_object.point_group.label, 'C_{1}')
+
+    def test_symmetry_is_kept_for_a_displacement_that_keeps_it(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('H2O.mol')
+        nuclei_array, point_group = MoleculeFactory(True).create(nuclei_array)
+        energy_object = Energy(electrons, multiplicity, 1, 'RHF')
+        energy_object.symmetry_object = Symmetry(point_group, read_basis_set_file('STO-3G.gbs', nuclei_array))
+        # the operations all fix the origin, so scaling the molecule keeps its point group
+        geometry = displaced(nuclei_array, [0.01 * np.array(nuclei.coordinates) for nuclei in nuclei_array])
+        energy_object.match_symmetry(read_basis_set_file('STO-3G.gbs', geometry))
+        self.assertEqual(energy_object.symmetry_object.point_group.label, point_group.label)
+        self.assertEqual(point_group.label, 'C_{2v}')
+
+    def test_calculate_gradient_matches_central_differences_of_the_energy(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('H2O.mol')
+        nuclei_array = displaced(nuclei_array, [[0.0, 0.05, 0.02], [0.1, -0.05, 0.0], [-0.02, 0.08, 0.03]])
+        energy_object = Energy(electrons, multiplicity, 1, 'RHF')
+        step = 1e-4
+
+        def energy(geometry):
+            return energy_object.calculate_energy(geometry, read_basis_set_file('STO-3G.gbs', geometry))
+
+        with logger.quiet():
+            basis_set = read_basis_set_file('STO-3G.gbs', nuclei_array)
+            gradient = energy_object.calculate_gradient(nuclei_array, basis_set)[1]
+            # directional derivatives along a few generic directions check every component at once
+            for direction in np.random.RandomState(0).standard_normal((3, 3, 3)):
+                difference = energy(displaced(nuclei_array, step * direction)) \
+                    - energy(displaced(nuclei_array, -step * direction))
+                testing.assert_allclose(difference / (2 * step), np.sum(gradient * direction), atol=1e-6)
@@ -0,0 +1,25 @@
+from unittest import TestCase
+from numpy import testing
+from src.common import read_mol_file
+from src.energy import Energy
+from src.energy import EnergyPool
+from src.objects import Nuclei
+
+
+class TestEnergyPool(TestCase):
+
+    def setUp(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('HeH+.mol')
+        self.energy_object = Energy(electrons, multiplicity, 2, 'RHF')
+        self.nuclei_arrays = [
+            [Nuclei(nuclei.element, nuclei.charge, nuclei.mass, (0.0, 0.0, scale * nuclei.coordinates[2]))
+             for nuclei in nuclei_array] for scale in (0.9, 1.0, 1.1, 1.2)
+        ]
+
+    def test_parallel_energies_equal_the_serial_energies_in_the_same_order(self):
+        serial = EnergyPool(self.energy_object, 'STO-3G.gbs', 1).calculate(self.nuclei_arrays)
+        parallel = EnergyPool(self.energy_object, 'STO-3G.gbs', 2).calculate(self.nuclei_arrays)
+        energies = [energy for energy, orbital_guess in serial]
+        testing.assert_allclose([energy for energy, orbital_guess in parallel], energies, rtol=0, atol=1e-10)
+        self.assertEqual(len(set(energies)), 4)
+        self.assertTrue(all(orbital_guess is not None for energy, orbital_guess in parallel))
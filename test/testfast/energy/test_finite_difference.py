@@ -0,0 +1,98 @@
+import itertools
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from numpy import testing
+from src.energy import FiniteDifference
+from src.energy.finite_difference import internal_coordinates
+from src.objects import Nuclei
+
+
+def spring_energy(nuclei_array):
+    energy = 0.0
+    for nuclei_a, nuclei_b in itertools.combinations(nuclei_array, 2):
+        r_ab = np.linalg.norm(np.array(nuclei_a.coordinates) - np.array(nuclei_b.coordinates))
+        energy += nuclei_a.charge * nuclei_b.charge * (r_ab - 1.5)**2
+    return energy
+
+
+def spring_gradient(nuclei_array):
+    gradient = np.zeros((len(nuclei_array), 3))
+    for (a, nuclei_a), (b, nuclei_b) in itertools.combinations(enumerate(nuclei_array), 2):
+        r_ab = np.array(nuclei_a.coordinates) - np.array(nuclei_b.coordinates)
+        force = 2 * nuclei_a.charge * nuclei_b.charge * (np.linalg.norm(r_ab) - 1.5) * r_ab / np.linalg.norm(r_ab)
+        gradient[a] += force
+        gradient[b] -= force
+    return gradient
+
+
+class TestFiniteDifference(TestCase):
+
+    def setUp(self):
+        self.water = [
+            Nuclei('OXYGEN', 8, 16, (0.000000000000, -0.143225816552, 0.000000000000)),
+            Nuclei('HYDROGEN', 1, 1, (1.638036840407, 1.136548822547, -0.000000000000)),
+            Nuclei('HYDROGEN', 1, 1, (-1.638036840407, 1.136548822547, -0.000000000000))
+        ]
+        self.methane = [
+            Nuclei('CARBON', 6, 12, (0.000000000000, 0.000000000000, 0.000000000000)),
+            Nuclei('HYDROGEN', 1, 1, (1.186, 1.186, 1.186)),
+            Nuclei('HYDROGEN', 1, 1, (-1.186, -1.186, 1.186)),
+            Nuclei('HYDROGEN', 1, 1, (-1.186, 1.186, -1.186)),
+            Nuclei('HYDROGEN', 1, 1, (1.186, -1.186, -1.186))
+        ]
+        self.energy_pool = MagicMock()
+        self.energy_pool.calculate.side_effect = lambda nuclei_arrays, orbital_guesses: [
+            (spring_energy(nuclei_array), None) for nuclei_array in nuclei_arrays
+        ]
+
+    def finite_difference(self, symmetry=True):
+        finite_difference = FiniteDifference('STO-3G.gbs', MagicMock(), symmetry=symmetry)
+        finite_difference.energy_pool = self.energy_pool
+        return finite_difference
+
+    def energy_count(self):
+        return sum(len(call[0][0]) for call in self.energy_pool.calculate.call_args_list)
+
+    def test_internal_coordinates_are_orthogonal_to_translations(self):
+        internal = internal_coordinates(self.water)
+        self.assertEqual(internal.shape, (9, 3))
+        testing.assert_array_almost_equal(internal.T @ np.tile((1.0, 0.0, 0.0), 3), np.zeros(3))
+
+    def test_symmetry_operations_of_water_form_c2v(self):
+        operations = self.finite_difference().symmetry_operations(self.water)
+        self.assertEqual(len(operations), 4)
+
+    def test_add_operation_rejects_an_operation_broken_by_less_than_the_step(self):
+        rotation = np.diag([-1.0, 1.0, -1.0])
+        center = np.mean([nuclei.coordinates for nuclei in self.water], axis=0)
+        group = []
+        FiniteDifference.add_operation(group, self.water, center, rotation)
+        self.assertEqual(len(group), 1)
+        water = self.water[:2] + [Nuclei('HYDROGEN', 1, 1, (-1.638036840407 + 5e-3, 1.136548822547, 0.0))]
+        group = []
+        FiniteDifference.add_operation(group, water, center, rotation)
+        self.assertEqual(group, [])
+
+    def test_coordinate_blocks_of_methane_are_a1_e_and_two_t2(self):
+        finite_difference = self.finite_difference()
+        operations = finite_difference.symmetry_operations(self.methane)
+        blocks = finite_difference.coordinate_blocks(self.methane, operations)
+        self.assertEqual(len(operations), 24)
+        self.assertEqual(sorted(block.shape[1] for characters, block in blocks), [1, 2, 3, 3])
+
+    def test_gradient_of_water_matches_the_analytic_gradient(self):
+        energy, gradient = self.finite_difference().gradient(self.water)
+        testing.assert_allclose(gradient, spring_gradient(self.water), rtol=1e-4, atol=1e-8)
+        self.assertEqual(self.energy_count(), 5)
+
+    def test_gradient_of_methane_only_displaces_the_totally_symmetric_coordinate(self):
+        energy, gradient = self.finite_difference().gradient(self.methane)
+        testing.assert_allclose(gradient, spring_gradient(self.methane), rtol=1e-4, atol=1e-8)
+        self.assertEqual(self.energy_count(), 3)
+
+    def test_hessian_with_symmetry_matches_the_hessian_without_symmetry(self):
+        energy, gradient, hessian = self.finite_difference().hessian(self.water)
+        energy, gradient, hessian_c1 = self.finite_difference(symmetry=False).hessian(self.water)
+        testing.assert_array_almost_equal(hessian, hessian_c1, 4)
+        testing.assert_array_almost_equal(hessian, hessian.T, 10)
@@ -14,6 +14,12 @@ class TestPrimitiveBasisFactory(TestCase):
         self.assertEqual(array[0].primitive_gaussian_array[0].contraction, 0.15432897)
         self.assertEqual(array[0].primitive_gaussian_array[0].exponent, 3.42525091)
 
+    def test_expand_basis_returns_ten_cartesian_functions_for_a_f_shell(self):
+        array = expand_basis_set([['F', [1.0, 0.855]]], (0, 0, 0))
+        self.assertEqual(len(array), 10)
+        self.assertEqual(len(set(basis.integral_exponents for basis in array)), 10)
+        self.assertTrue(all(sum(basis.integral_exponents) == 3 for basis in array))
+
     def test_del_operate_on_s_gaussian_returns_four_gaussians(self):
         primitive_gaussian = PrimitiveBasis(0.15432897, 3.42525091, (0, 0, 0.7316), (0, 0, 0))
         array = del_operator(primitive_gaussian)
@@ -0,0 +1,35 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from numpy import testing
+from src.common import logger
+from src.common import read_mol_file
+from src.energy import Energy
+from src.geometryoptimization import BFGS
+
+
+class TestBFGS(TestCase):
+
+    def test_optimize_finds_the_minimum_of_heh_plus(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('HeH+.mol')
+        bfgs = BFGS('STO-3G.gbs', Energy(electrons, multiplicity, 1, 'RHF'), nuclei_array)
+        with logger.quiet():
+            energy = bfgs.optimize()
+        testing.assert_approx_equal(energy, -2.85436865, 7)
+
+    def test_optimize_stops_after_max_iterations(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('HeH+.mol')
+        bfgs = BFGS('STO-3G.gbs', Energy(electrons, multiplicity, 1, 'RHF'), nuclei_array, max_iterations=0)
+        with logger.quiet():
+            energy = bfgs.optimize()
+        testing.assert_approx_equal(energy, -2.84183608212, 6)
+
+    def test_gradient_falls_back_to_finite_differences_without_an_analytic_gradient(self):
+        nuclei_array, electrons, multiplicity = read_mol_file('HeH+.mol')
+        energy_object = Energy(electrons, multiplicity, 1, 'RHF', auxiliary_basis='STO-3G.gbs')
+        bfgs = BFGS('STO-3G.gbs', energy_object, nuclei_array)
+        bfgs.finite_difference = MagicMock()
+        bfgs.finite_difference.gradient.return_value = (-2.8, np.zeros((2, 3)))
+        energy, gradient = bfgs.calculate_gradient(np.array(bfgs.initial_points()))
+        self.assertEqual(energy, -2.8)
+        bfgs.finite_difference.gradient.assert_called_once()
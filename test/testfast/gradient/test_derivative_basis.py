@@ -0,0 +1,61 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from numpy import testing
+from src.common import read_basis_set_file
+from src.gradient import derivative_basis
+from src.matrixelements import KineticEnergyMatrix
+from src.matrixelements import NuclearAttractionMatrix
+from src.matrixelements import OrbitalOverlapMatrix
+
+
+class TestDerivativeBasis(TestCase):
+
+    def setUp(self):
+        self.hydrogen = MagicMock(element='HYDROGEN', charge=1, mass=1, coordinates=(0.3000, 1.4300, 1.1000))
+        self.step = 1e-5
+
+    def basis_set(self, coordinates):
+        oxygen = MagicMock(element='OXYGEN', charge=8, mass=16, coordinates=coordinates)
+        return read_basis_set_file('STO-3G.gbs', [oxygen, self.hydrogen])
+
+    def finite_difference(self, matrix, i, j, axis):
+        forward = [0.0, 0.0, 0.0]
+        forward[axis] += self.step
+        backward = [0.0, 0.0, 0.0]
+        backward[axis] -= self.step
+        value_forward = matrix(self.basis_set(tuple(forward))).calculate(i, j)
+        value_backward = matrix(self.basis_set(tuple(backward))).calculate(i, j)
+        return (value_forward - value_backward) / (2 * self.step)
+
+    def analytic(self, matrix, i, j, axis):
+        basis_set = self.basis_set((0.0, 0.0, 0.0))
+        return sum(matrix([derivative, basis_set[j]]).calculate(0, 1)
+                   for derivative in derivative_basis(basis_set[i], axis))
+
+    def test_derivative_of_a_p_function_has_a_raised_and_a_lowered_function(self):
+        derivative_array = derivative_basis(self.basis_set((0.0, 0.0, 0.0))[2], 0)
+        self.assertEqual([derivative.integral_exponents for derivative in derivative_array], [(2, 0, 0), (0, 0, 0)])
+
+    def test_derivative_of_an_s_function_only_has_a_raised_function(self):
+        derivative_array = derivative_basis(self.basis_set((0.0, 0.0, 0.0))[0], 1)
+        self.assertEqual([derivative.integral_exponents for derivative in derivative_array], [(0, 1, 0)])
+
+    def test_overlap_derivative_matches_finite_difference(self):
+        for i, axis in [(1, 2), (2, 0), (4, 2)]:
+            analytic = self.analytic(OrbitalOverlapMatrix, i, 5, axis)
+            testing.assert_almost_equal(analytic, self.finite_difference(OrbitalOverlapMatrix, i, 5, axis), 7)
+
+    def test_kinetic_energy_derivative_matches_finite_difference(self):
+        for i, axis in [(1, 2), (3, 1), (4, 2)]:
+            analytic = self.analytic(KineticEnergyMatrix, i, 5, axis)
+            testing.assert_almost_equal(analytic, self.finite_difference(KineticEnergyMatrix, i, 5, axis), 7)
+
+    def test_nuclear_attraction_derivative_of_the_bra_matches_finite_difference_with_a_fixed_operator(self):
+        nuclei = MagicMock(element='HYDROGEN', charge=1, mass=1, coordinates=(0.3000, 1.4300, 1.1000))
+
+        def matrix(basis_set_array):
+            return NuclearAttractionMatrix(basis_set_array, [nuclei])
+
+        for i, axis in [(1, 2), (2, 0), (4, 1)]:
+            analytic = self.analytic(matrix, i, 5, axis)
+            testing.assert_almost_equal(analytic, self.finite_difference(matrix, i, 5, axis), 7)
@@ -0,0 +1,95 @@
+from unittest import TestCase
+from numpy import testing
+import numpy as np
+from src.hartreefock import DensityFittedFockMatrixRestricted
+from src.hartreefock import DensityFittedFockMatrixUnrestricted
+from src.hartreefock import FockMatrixRestricted
+from src.hartreefock import FockMatrixUnrestricted
+from src.hartreefock import IncrementalFockMatrixRestricted
+from src.hartreefock import coulomb_exchange
+from src.hartreefock import fitted_coulomb_exchange
+from src.hartreefock import screened_coulomb_exchange
+
+
+class TestFockMatrix(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.repulsion = random_state.rand(3, 3, 3, 3)
+        self.density_matrix = random_state.rand(3, 3)
+        self.core_hamiltonian = random_state.rand(3, 3)
+
+    def test_coulomb_exchange_contracts_the_repulsion_with_the_density(self):
+        (coulomb,), (exchange,) = coulomb_exchange(self.repulsion, [self.density_matrix])
+        testing.assert_allclose(coulomb, np.einsum('ijab,ab->ij', self.repulsion, self.density_matrix))
+        testing.assert_allclose(exchange, np.einsum('ibaj,ab->ij', self.repulsion, self.density_matrix))
+
+    def test_unrestricted_fock_matrices_equal_the_restricted_for_equal_spin_densities(self):
+        fock_matrix = FockMatrixRestricted(self.core_hamiltonian, self.repulsion).create(self.density_matrix)
+        fock_matrix_alph, fock_matrix_beta = FockMatrixUnrestricted(self.core_hamiltonian, self.repulsion)\
+            .create(self.density_matrix / 2, self.density_matrix / 2)
+        testing.assert_allclose(fock_matrix_alph, fock_matrix)
+        testing.assert_allclose(fock_matrix_beta, fock_matrix)
+
+    def test_fitted_coulomb_exchange_equals_coulomb_exchange_of_the_fitted_repulsion(self):
+        fitted_integrals = np.random.RandomState(1).rand(5, 3, 3)
+        fitted_integrals += fitted_integrals.transpose(0, 2, 1)
+        repulsion = np.einsum('qij,qkl->ijkl', fitted_integrals, fitted_integrals)
+        (coulomb,), (exchange,) = fitted_coulomb_exchange(fitted_integrals, [self.density_matrix])
+        (coulomb_exact,), (exchange_exact,) = coulomb_exchange(repulsion, [self.density_matrix])
+        testing.assert_allclose(coulomb, coulomb_exact)
+        testing.assert_allclose(exchange, exchange_exact)
+
+    def test_density_fitted_fock_matrices_equal_the_fock_matrices_of_the_fitted_repulsion(self):
+        fitted_integrals = np.random.RandomState(1).rand(5, 3, 3)
+        fitted_integrals += fitted_integrals.transpose(0, 2, 1)
+        repulsion = np.einsum('qij,qkl->ijkl', fitted_integrals, fitted_integrals)
+        testing.assert_allclose(
+            DensityFittedFockMatrixRestricted(self.core_hamiltonian, fitted_integrals).create(self.density_matrix),
+            FockMatrixRestricted(self.core_hamiltonian, repulsion).create(self.density_matrix)
+        )
+        fock_matrices = DensityFittedFockMatrixUnrestricted(self.core_hamiltonian, fitted_integrals)\
+            .create(self.density_matrix, self.density_matrix.T)
+        fock_matrices_exact = FockMatrixUnrestricted(self.core_hamiltonian, repulsion)\
+            .create(self.density_matrix, self.density_matrix.T)
+        testing.assert_allclose(fock_matrices, fock_matrices_exact)
+
+    def test_screened_coulomb_exchange_skips_only_the_pairs_under_the_screening(self):
+        schwarz = np.sqrt(np.einsum('abab->ab', self.repulsion))
+        (coulomb,), (exchange,) = coulomb_exchange(self.repulsion, [self.density_matrix])
+        coulomb_screened, exchange_screened = screened_coulomb_exchange(self.repulsion, self.density_matrix, schwarz, 0)
+        testing.assert_allclose(coulomb_screened, coulomb)
+        testing.assert_allclose(exchange_screened, exchange)
+        coulomb_screened, exchange_screened = screened_coulomb_exchange(
+            self.repulsion, self.density_matrix, schwarz, 10
+        )
+        testing.assert_array_equal(coulomb_screened, np.zeros((3, 3)))
+        testing.assert_array_equal(exchange_screened, np.zeros((3, 3)))
+
+    def test_screened_coulomb_exchange_screens_the_exchange_with_its_own_bound(self):
+        repulsion = self.repulsion.copy()
+        repulsion[0, 0, 0, 0] = repulsion[2, 2, 2, 2] = 100
+        schwarz = np.sqrt(np.einsum('abab->ab', repulsion))
+        screening = 50
+        coulomb_pairs = schwarz.max() * schwarz * np.abs(self.density_matrix) > screening
+        exchange_pairs = np.outer(schwarz.max(axis=0), schwarz.max(axis=0)) * np.abs(self.density_matrix) > screening
+        self.assertTrue(np.any(coulomb_pairs != exchange_pairs))
+        (coulomb,), _ = coulomb_exchange(repulsion, [self.density_matrix * coulomb_pairs])
+        _, (exchange,) = coulomb_exchange(repulsion, [self.density_matrix * exchange_pairs])
+        coulomb_screened, exchange_screened = screened_coulomb_exchange(
+            repulsion, self.density_matrix, schwarz, screening
+        )
+        testing.assert_allclose(coulomb_screened, coulomb)
+        testing.assert_allclose(exchange_screened, exchange)
+
+    def test_incremental_fock_matrix_equals_the_fock_matrix_of_each_density(self):
+        fock_matrix = FockMatrixRestricted(self.core_hamiltonian, self.repulsion)
+        incremental_fock_matrix = IncrementalFockMatrixRestricted(self.core_hamiltonian, self.repulsion, 2)
+        for density_matrix in np.random.RandomState(1).rand(5, 3, 3):
+            testing.assert_allclose(incremental_fock_matrix.create(density_matrix), fock_matrix.create(density_matrix))
+        self.assertEqual(incremental_fock_matrix.builds, 5)
+
+    def test_incremental_fock_matrix_needs_a_rebuild_interval_of_at_least_one(self):
+        for rebuild_interval in (0, -1):
+            with self.assertRaises(ValueError):
+                IncrementalFockMatrixRestricted(self.core_hamiltonian, self.repulsion, rebuild_interval)
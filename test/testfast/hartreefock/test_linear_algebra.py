@@ -1,5 +1,5 @@
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, patch
 import numpy as np
 from numpy import testing
 from src.hartreefock import LinearAlgebra
@@ -17,9 +17,10 @@ class TestLinearAlgebra(TestCase):
         )
 
     def test_diagonalize_returns_orbital_energy_eigenvalues_and_orbital_coefficients(self):
-        LinearAlgebra.create_transformation_matrix = Mock(return_value=np.array([[-0.9541, 0.5871], [0.9541, 0.5871]]))
+        transformation_matrix = np.array([[-0.9541, 0.5871], [0.9541, 0.5871]])
         mock_orbital_overlap = MagicMock()
-        linear_algebra = LinearAlgebra(mock_orbital_overlap)
+        with patch.object(LinearAlgebra, 'create_transformation_matrix', return_value=transformation_matrix):
+            linear_algebra = LinearAlgebra(mock_orbital_overlap)
         core_hamiltonian = np.array([[-2.6527, -1.3472], [-1.3472, -1.7318]])
         orbital_energies, orbital_coefficients = linear_algebra.diagonalize(core_hamiltonian)
 
@@ -0,0 +1,39 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from numpy import testing
+from src.common import read_basis_set_file
+from src.hartreefock import OrbitalGuess
+from src.hartreefock.orbital_guess import mixed_overlap_matrix
+from src.matrixelements import OrbitalOverlapMatrix
+
+
+class TestOrbitalGuess(TestCase):
+
+    def setUp(self):
+        helium = MagicMock(element='HELIUM', charge=2, mass=4, coordinates=(0.000000, 0.000000, 0.7316))
+        hydrogen = MagicMock(element='HYDROGEN', charge=1, mass=1, coordinates=(0.000000, 0.000000, -0.7316))
+        self.basis_set = read_basis_set_file('STO-3G.gbs', [helium, hydrogen])
+        self.overlap = OrbitalOverlapMatrix(self.basis_set).create()
+        eigenvalues, eigenvectors = np.linalg.eigh(self.overlap)
+        self.coefficients = eigenvectors @ np.diag(eigenvalues ** (-1/2))
+
+        helium_displaced = MagicMock(element='HELIUM', charge=2, mass=4, coordinates=(0.000000, 0.000000, 0.8316))
+        self.basis_set_displaced = read_basis_set_file('STO-3G.gbs', [helium_displaced, hydrogen])
+        self.overlap_displaced = OrbitalOverlapMatrix(self.basis_set_displaced).create()
+
+    def test_mixed_overlap_matrix_of_the_same_basis_set_is_the_overlap_matrix(self):
+        mixed_overlap = mixed_overlap_matrix(self.basis_set, self.basis_set)
+        testing.assert_array_almost_equal(mixed_overlap, self.overlap, 10)
+
+    def test_project_onto_the_same_basis_set_preserves_the_occupied_density(self):
+        coefficients = OrbitalGuess(self.basis_set, self.coefficients).project(self.basis_set, self.overlap)
+        density_i = np.outer(self.coefficients[:, 0], self.coefficients[:, 0])
+        density_j = np.outer(coefficients[:, 0], coefficients[:, 0])
+        testing.assert_array_almost_equal(density_i, density_j, 10)
+
+    def test_project_onto_a_displaced_basis_set_returns_orthonormal_orbitals(self):
+        coefficients = OrbitalGuess(self.basis_set, self.coefficients).project(
+            self.basis_set_displaced, self.overlap_displaced
+        )
+        testing.assert_array_almost_equal(coefficients.T @ self.overlap_displaced @ coefficients, np.identity(2), 10)
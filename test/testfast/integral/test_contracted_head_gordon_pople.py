@@ -0,0 +1,33 @@
+import itertools
+from unittest import TestCase
+from numpy import testing
+from src.factory import expand_basis_set
+from src.integrals import ContractedHeadGordonPople
+from src.integrals import ObaraSaika
+
+
+class TestContractedHeadGordonPople(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([
+            ['P', [0.6, 1.2], [0.4, 0.4]], ['D', [1.0, 0.8]]
+        ], (0.0, 0.2, -0.1)) + expand_basis_set([
+            ['S', [0.4, 3.4], [0.6, 0.6]], ['P', [1.0, 0.5]]
+        ], (0.3, -0.4, 1.2))
+
+    def test_horizontal_expansion_of_a_s_function_is_the_function_itself(self):
+        exponents, coefficients = ContractedHeadGordonPople.horizontal_expansion(
+            self.basis_set_array[3], self.basis_set_array[9]
+        )
+        self.assertEqual(exponents, [(2, 0, 0)])
+        testing.assert_array_equal(coefficients, [1.0])
+
+    def test_integrate_agrees_with_obara_saika(self):
+        contracted_head_gordon_pople = ContractedHeadGordonPople()
+        obara_saika = ObaraSaika()
+        for i, j, k, l in itertools.product([0, 4, 8, 9, 11], [1, 6, 10], [3, 12], [2, 7]):
+            quartet = [self.basis_set_array[x] for x in (i, j, k, l)]
+            testing.assert_allclose(
+                contracted_head_gordon_pople.integrate(*quartet), obara_saika.integrate(*quartet), rtol=1e-10,
+                atol=1e-14
+            )
@@ -0,0 +1,78 @@
+import os, tempfile, time
+from unittest import TestCase
+from numpy import testing
+from src.factory import expand_basis_set
+from src.integrals import IntegralAutotuner
+from src.integrals import ObaraSaika
+from src.integrals.twoelectronrepulsion.integral_autotuner import representative_quartets
+
+
+class SlowEngine:
+
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        time.sleep(0.002)
+        return 1.0
+
+
+class FastEngine:
+
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        return 2.0
+
+
+class UntimedEngine:
+
+    def integrate(self, basis_i, basis_j, basis_k, basis_l):
+        raise AssertionError('cached timings should not be timed again')
+
+
+class TestIntegralAutotuner(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([
+            ['S', [0.5, 2.0], [0.5, 0.6]], ['P', [0.9, 0.3]]
+        ], (0.0, 0.0, 0.0)) + expand_basis_set([
+            ['S', [1.2, 0.4]]
+        ], (0.0, 0.0, 1.4))
+
+    def test_representative_quartets_covers_every_angular_momentum_class(self):
+        quartets = representative_quartets(self.basis_set_array, 3)
+        self.assertEqual(len(quartets), 16)
+        for key, samples in quartets.items():
+            self.assertEqual(len(samples), 3)
+            for quartet in samples:
+                self.assertEqual(tuple(sum(basis.integral_exponents) for basis in quartet), key)
+
+    def test_tune_routes_every_class_to_the_fastest_engine(self):
+        integral_autotuner = IntegralAutotuner({'slow': SlowEngine, 'fast': FastEngine}, samples=1)
+        dispatch = integral_autotuner.tune(self.basis_set_array)
+        self.assertEqual(len(dispatch.engines), 16)
+        self.assertEqual(dispatch.integrate(*self.basis_set_array[:4]), 2.0)
+
+    def test_tune_keeps_the_default_engine_unless_another_is_faster_by_the_margin(self):
+        integral_autotuner = IntegralAutotuner({'slow': SlowEngine, 'fast': FastEngine}, samples=1, margin=1.0)
+        dispatch = integral_autotuner.tune(self.basis_set_array)
+        self.assertEqual(dispatch.integrate(*self.basis_set_array[:4]), 1.0)
+
+    def test_tuned_dispatch_agrees_with_obara_saika(self):
+        dispatch = IntegralAutotuner(samples=1).tune(self.basis_set_array)
+        quartet = [self.basis_set_array[i] for i in (1, 4, 2, 3)]
+        testing.assert_allclose(dispatch.integrate(*quartet), ObaraSaika().integrate(*quartet), rtol=1e-9)
+
+    def test_timings_are_loaded_from_the_cache_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            timings = IntegralAutotuner({'slow': SlowEngine, 'fast': FastEngine}, samples=1, cache_directory=directory)\
+                .timings(self.basis_set_array)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            cached = IntegralAutotuner({'slow': UntimedEngine, 'fast': UntimedEngine}, cache_directory=directory)
+            self.assertEqual(cached.timings(self.basis_set_array), timings)
+
+    def test_cached_only_once_the_basis_set_is_timed_or_its_timings_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            integral_autotuner = IntegralAutotuner({'slow': SlowEngine, 'fast': FastEngine}, samples=1,
+            cache_directory=directory)
+            self.assertFalse(integral_autotuner.cached(self.basis_set_array))
+            integral_autotuner.timings(self.basis_set_array)
+            self.assertTrue(integral_autotuner.cached(self.basis_set_array))
+            cached = IntegralAutotuner({'slow': UntimedEngine, 'fast': UntimedEngine}, cache_directory=directory)
+            self.assertTrue(cached.cached(self.basis_set_array))
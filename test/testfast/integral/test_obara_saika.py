@@ -0,0 +1,36 @@
+import itertools
+from unittest import TestCase
+from numpy import testing
+from src.factory import expand_basis_set
+from src.integrals import ElectronRepulsion
+from src.integrals import HeadGordonPople
+from src.integrals import ObaraSaika
+from src.integrals.twoelectronrepulsion.obara_saika_scheme import lower
+
+
+class TestObaraSaika(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([
+            ['D', [0.6, 1.2], [0.4, 0.4]]
+        ], (0.0, 0.2, -0.1)) + expand_basis_set([
+            ['S', [0.4, 3.4], [0.6, 0.6]], ['P', [1.0, 0.5]]
+        ], (0.3, -0.4, 1.2))
+
+    def test_lower_reduces_one_exponent_of_one_function(self):
+        l = ((1, 0, 0), (0, 2, 1), (0, 0, 0), (0, 0, 1))
+        self.assertEqual(lower(l, 1, 1), ((1, 0, 0), (0, 1, 1), (0, 0, 0), (0, 0, 1)))
+
+    def test_obara_saika_and_head_gordon_pople_agree_with_cook(self):
+        cook = ElectronRepulsion()
+        for i, j, k, l in itertools.product([0, 3], [6, 8], [4, 7], [1]):
+            quartet = [self.basis_set_array[x] for x in (i, j, k, l)]
+            expected = cook.integrate(*quartet)
+            testing.assert_allclose(ObaraSaika().integrate(*quartet), expected, rtol=1e-8, atol=1e-12)
+            testing.assert_allclose(HeadGordonPople().integrate(*quartet), expected, rtol=1e-8, atol=1e-12)
+
+    def test_intermediates_are_memoised_within_a_primitive_quartet(self):
+        obara_saika = ObaraSaika()
+        quartet = [self.basis_set_array[x] for x in (0, 0, 3, 3)]
+        obara_saika.integrate(*quartet)
+        self.assertIn((0, ((2, 0, 0), (2, 0, 0), (1, 1, 0), (1, 1, 0))), obara_saika.memo)
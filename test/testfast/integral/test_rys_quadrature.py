@@ -0,0 +1,51 @@
+import itertools
+from unittest import TestCase
+from unittest.mock import MagicMock
+import numpy as np
+from numpy import testing
+from src.factory import expand_basis_set
+from src.integrals import AngularMomentumDispatch
+from src.integrals import ObaraSaika
+from src.integrals import RysQuadrature
+from src.integrals import boys_function
+from src.integrals.twoelectronrepulsion.rys_quadrature import rys_roots_weights
+
+
+class TestRysQuadrature(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([
+            ['F', [0.6, 1.2], [0.4, 0.4]]
+        ], (0.0, 0.2, -0.1)) + expand_basis_set([
+            ['L', [0.2, 3.4, 0.1], [0.8, 0.6, 0.9]], ['D', [1.0, 0.5]]
+        ], (0.3, -0.4, 1.2))
+
+    def test_rys_roots_and_weights_reproduce_the_boys_function(self):
+        x = np.array([0.0, 0.5, 12.0, 90.0, 150.0])
+        for n in range(1, 5):
+            u, w = rys_roots_weights(n, x)
+            for i, k in itertools.product(range(len(x)), range(2 * n)):
+                testing.assert_allclose(np.sum(w[i] * u[i]**k), boys_function(k, x[i]), rtol=1e-8)
+
+    def test_integrate_agrees_with_obara_saika(self):
+        rys_quadrature = RysQuadrature()
+        obara_saika = ObaraSaika()
+        for i, j, k, l in itertools.product([0, 9], [3, 10, 12], [11, 15], [14, 19]):
+            quartet = [self.basis_set_array[x] for x in (i, j, k, l)]
+            testing.assert_allclose(
+                rys_quadrature.integrate(*quartet), obara_saika.integrate(*quartet), rtol=1e-9, atol=1e-14
+            )
+
+
+class TestAngularMomentumDispatch(TestCase):
+
+    def test_integrate_uses_the_engine_of_the_angular_momentum_class(self):
+        s = MagicMock(integral_exponents=(0, 0, 0))
+        p = MagicMock(integral_exponents=(0, 1, 0))
+        engine = MagicMock()
+        default = MagicMock()
+        dispatch = AngularMomentumDispatch({(1, 0, 0, 0): engine}, default)
+        dispatch.integrate(p, s, s, s)
+        dispatch.integrate(s, p, s, s)
+        engine.integrate.assert_called_once_with(p, s, s, s)
+        default.integrate.assert_called_once_with(s, p, s, s)
@@ -0,0 +1,59 @@
+import os, tempfile
+from unittest import TestCase
+from numpy import testing
+import numpy as np
+from src.factory import expand_basis_set
+from src.matrixelements import Checkpoint
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([['S', [0.5, 2.0], [0.5, 0.6]], ['P', [0.9, 0.3]]], (0.0, 0.0, 0.0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_file = os.path.join(self.directory.name, 'checkpoint.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save(self):
+        checkpoint = Checkpoint(self.checkpoint_file)
+        checkpoint.open(self.basis_set_array, 'RHF 2')
+        checkpoint.save('scf', orbital_energies=np.array([-1.0, 0.5]), electron_energy=-2.5)
+        checkpoint.save('ccsd', iterations=3)
+        return checkpoint
+
+    def test_load_returns_the_saved_state_of_a_stage_on_restart(self):
+        self.save()
+        checkpoint = Checkpoint(self.checkpoint_file, restart=True)
+        checkpoint.open(self.basis_set_array, 'RHF 2')
+        state = checkpoint.load('scf')
+        testing.assert_array_equal(state['orbital_energies'], [-1.0, 0.5])
+        self.assertEqual(float(state['electron_energy']), -2.5)
+        self.assertEqual(int(checkpoint.load('ccsd')['iterations']), 3)
+        self.assertIsNone(checkpoint.load('triples'))
+
+    def test_load_returns_none_without_restart(self):
+        self.assertIsNone(self.save().load('scf'))
+        self.assertIsNone(Checkpoint().load('scf'))
+
+    def test_a_different_calculation_ignores_the_checkpoint(self):
+        self.save()
+        checkpoint = Checkpoint(self.checkpoint_file, restart=True)
+        checkpoint.open(self.basis_set_array, 'UHF 2')
+        self.assertIsNone(checkpoint.load('scf'))
+
+    def test_save_replaces_only_the_state_of_its_stage(self):
+        checkpoint = self.save()
+        checkpoint.save('scf', electron_energy=-3.0)
+        self.assertEqual(sorted(checkpoint.state), ['ccsd.iterations', 'scf.electron_energy'])
+
+    def test_due_every_interval_only_when_enabled(self):
+        self.assertEqual([Checkpoint(self.checkpoint_file, interval=2).due(i) for i in range(1, 5)],
+        [False, True, False, True])
+        self.assertFalse(Checkpoint().due(2))
+
+    def test_repulsion_cache_is_next_to_the_checkpoint_file(self):
+        self.assertIsNone(Checkpoint().repulsion_cache().cache_directory)
+        repulsion_cache = Checkpoint(self.checkpoint_file).repulsion_cache()
+        self.assertEqual(repulsion_cache.cache_directory, self.checkpoint_file + '.integrals')
@@ -0,0 +1,50 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from numpy import testing
+import numpy as np
+from src.factory import expand_basis_set
+from src.integrals import ObaraSaika
+from src.matrixelements import DensityFitting
+from src.matrixelements import TwoElectronRepulsionMatrixOS
+from src.matrixelements import unit_function
+
+
+class TestDensityFitting(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([['S', [1.0, 0.8]], ['P', [1.0, 0.6]]], (0.0, 0.0, 0.0))
+        # the products of the basis functions are s, p and d functions of exponents 1.6, 1.4 and 1.2
+        self.auxiliary_basis_set_array = expand_basis_set(
+            [['S', [1.0, 1.6]], ['S', [1.0, 1.4]], ['S', [1.0, 1.2]], ['P', [1.0, 1.4]], ['D', [1.0, 1.2]]],
+            (0.0, 0.0, 0.0)
+        )
+        mock_symmetry = MagicMock()
+        mock_symmetry.none_zero_integrals = MagicMock(side_effect=lambda quartets: np.ones(len(quartets), dtype=bool))
+        mock_symmetry.signed_permutations = MagicMock(return_value=[(np.arange(4), np.ones(4, dtype=int))])
+        self.repulsion = TwoElectronRepulsionMatrixOS(self.basis_set_array, mock_symmetry, 1).create_repulsion_matrix()
+        self.density_fitting = DensityFitting(self.basis_set_array, self.auxiliary_basis_set_array, ObaraSaika(), 1)
+
+    def test_unit_function_is_one_everywhere(self):
+        self.assertEqual(unit_function((0.0, 1.0, 2.0)).value(3.0, -1.0, 0.5), 1.0)
+
+    def test_three_index_integrals_are_symmetric_in_the_orbital_basis_functions(self):
+        three_index = self.density_fitting.create_three_index()
+        self.assertEqual(three_index.shape, (len(self.auxiliary_basis_set_array), 4, 4))
+        testing.assert_array_equal(three_index, three_index.transpose(0, 2, 1))
+
+    def test_two_index_integrals_are_positive_definite(self):
+        self.assertTrue(np.all(np.linalg.eigvalsh(self.density_fitting.create_two_index()) > 0))
+
+    def test_fit_is_exact_when_the_auxiliary_basis_spans_the_products(self):
+        fitted_integrals = self.density_fitting.create_fitted_integrals()
+        testing.assert_allclose(
+            np.einsum('qij,qkl->ijkl', fitted_integrals, fitted_integrals), self.repulsion, atol=1e-12
+        )
+
+    def test_linearly_dependent_auxiliary_functions_are_dropped(self):
+        self.density_fitting.auxiliary_basis_set_array = list(self.auxiliary_basis_set_array) * 2
+        fitted_integrals = self.density_fitting.create_fitted_integrals()
+        self.assertEqual(fitted_integrals.shape[0], len(self.auxiliary_basis_set_array))
+        testing.assert_allclose(
+            np.einsum('qij,qkl->ijkl', fitted_integrals, fitted_integrals), self.repulsion, atol=1e-8
+        )
@@ -1,9 +1,20 @@
+import itertools
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import numpy as np
 from numpy import testing
+from src.matrixelements import TwoElectronRepulsion
+from src.matrixelements import TwoElectronRepulsionMatrixContractedHGP
 from src.matrixelements import TwoElectronRepulsionMatrixCook
 from src.matrixelements import TwoElectronRepulsionMatrixHGP
 from src.matrixelements import TwoElectronRepulsionMatrixOS
+from src.matrixelements import TwoElectronRepulsionMatrixRys
+from src.matrixelements import quartet_index
+from src.matrixelements import quartet_orbits
+from src.matrixelements import quartet_rows
+from src.matrixelements import scratch_space
+from src.matrixelements import unique_quartet_count
+from src.matrixelements import unique_quartets
 
 
 class TestTwoElectronRepulsionElementCook(TestCase):
@@ -214,3 +225,199 @@ class TestTwoElectronRepulsionElementHGP(TestCase):
     def test_method_calculate_returns_element_for_1111(self):
         element = self.two_electron_repulsion.calculate_integral(1, 1, 1, 1)
         testing.assert_approx_equal(element, 0.7746, 4)
+
+
+class TestTwoElectronRepulsionElementContractedHGP(TestCase):
+
+    def setUp(self):
+        hydrogen_basis_1 = MagicMock(
+            contraction=0.15432897, exponent=3.42525091, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=1.794441832218435
+        )
+        hydrogen_basis_2 = MagicMock(
+            contraction=0.53532814, exponent=0.62391373, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.5003264923314032
+        )
+        hydrogen_basis_3 = MagicMock(
+            contraction=0.44463454, exponent=0.16885540, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.18773545851092535
+        )
+
+        helium_basis_1 = MagicMock(
+            contraction=0.15432897, exponent=9.75393461, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=3.9336432656254527
+        )
+        helium_basis_2 = MagicMock(
+            contraction=0.53532814, exponent=1.77669115, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=1.0967787981767012
+        )
+        helium_basis_3 = MagicMock(
+            contraction=0.44463454, exponent=0.48084429, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.41154131374122654
+        )
+
+        helium = MagicMock(
+            primitive_gaussian_array=[helium_basis_1, helium_basis_2, helium_basis_3], coordinates=(0, 0, 0.7316),
+            integral_exponents=(0, 0, 0), normalisation=1
+        )
+        hydrogen = MagicMock(
+            primitive_gaussian_array=[hydrogen_basis_1, hydrogen_basis_2, hydrogen_basis_3],
+            coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0), normalisation=1
+        )
+
+        basis_set_array = [helium, hydrogen]
+
+        mock_symmetry = MagicMock(nuclei_array=None, point_group=None, symmetry_matrix=None)
+        mock_symmetry.non_zero_integral = MagicMock(return_value=True)
+
+        self.two_electron_repulsion = TwoElectronRepulsionMatrixContractedHGP(basis_set_array, mock_symmetry, 4)
+
+    def test_method_calculate_returns_element_for_0000(self):
+        element = self.two_electron_repulsion.calculate_integral(0, 0, 0, 0)
+        testing.assert_approx_equal(element, 1.3072, 4)
+
+    def test_method_calculate_returns_element_for_1000(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 0, 0, 0)
+        testing.assert_approx_equal(element, 0.4373, 4)
+
+    def test_method_calculate_returns_element_for_1010(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 0, 1, 0)
+        testing.assert_approx_equal(element, 0.1773, 4)
+
+    def test_method_calculate_returns_element_for_1100(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 0, 0)
+        testing.assert_approx_equal(element, 0.6057, 4)
+
+    def test_method_calculate_returns_element_for_1110(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 1, 0)
+        testing.assert_approx_equal(element, 0.3118, 4)
+
+    def test_method_calculate_returns_element_for_1111(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 1, 1)
+        testing.assert_approx_equal(element, 0.7746, 4)
+
+
+class TestTwoElectronRepulsionElementRys(TestCase):
+
+    def setUp(self):
+        hydrogen_basis_1 = MagicMock(
+            contraction=0.15432897, exponent=3.42525091, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=1.794441832218435
+        )
+        hydrogen_basis_2 = MagicMock(
+            contraction=0.53532814, exponent=0.62391373, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.5003264923314032
+        )
+        hydrogen_basis_3 = MagicMock(
+            contraction=0.44463454, exponent=0.16885540, coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.18773545851092535
+        )
+
+        helium_basis_1 = MagicMock(
+            contraction=0.15432897, exponent=9.75393461, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=3.9336432656254527
+        )
+        helium_basis_2 = MagicMock(
+            contraction=0.53532814, exponent=1.77669115, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=1.0967787981767012
+        )
+        helium_basis_3 = MagicMock(
+            contraction=0.44463454, exponent=0.48084429, coordinates=(0, 0, 0.7316), integral_exponents=(0, 0, 0),
+            normalisation=0.41154131374122654
+        )
+
+        helium = MagicMock(
+            primitive_gaussian_array=[helium_basis_1, helium_basis_2, helium_basis_3], coordinates=(0, 0, 0.7316),
+            integral_exponents=(0, 0, 0), normalisation=1
+        )
+        hydrogen = MagicMock(
+            primitive_gaussian_array=[hydrogen_basis_1, hydrogen_basis_2, hydrogen_basis_3],
+            coordinates=(0, 0, -0.7316), integral_exponents=(0, 0, 0), normalisation=1
+        )
+
+        basis_set_array = [helium, hydrogen]
+
+        mock_symmetry = MagicMock(nuclei_array=None, point_group=None, symmetry_matrix=None)
+        mock_symmetry.non_zero_integral = MagicMock(return_value=True)
+
+        self.two_electron_repulsion = TwoElectronRepulsionMatrixRys(basis_set_array, mock_symmetry, 4)
+
+    def test_method_calculate_returns_element_for_0000(self):
+        element = self.two_electron_repulsion.calculate_integral(0, 0, 0, 0)
+        testing.assert_approx_equal(element, 1.3072, 4)
+
+    def test_method_calculate_returns_element_for_1000(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 0, 0, 0)
+        testing.assert_approx_equal(element, 0.4373, 4)
+
+    def test_method_calculate_returns_element_for_1010(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 0, 1, 0)
+        testing.assert_approx_equal(element, 0.1773, 4)
+
+    def test_method_calculate_returns_element_for_1100(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 0, 0)
+        testing.assert_approx_equal(element, 0.6057, 4)
+
+    def test_method_calculate_returns_element_for_1110(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 1, 0)
+        testing.assert_approx_equal(element, 0.3118, 4)
+
+    def test_method_calculate_returns_element_for_1111(self):
+        element = self.two_electron_repulsion.calculate_integral(1, 1, 1, 1)
+        testing.assert_approx_equal(element, 0.7746, 4)
+
+
+class TestQuartetOrbits(TestCase):
+
+    def setUp(self):
+        self.quartets = unique_quartets(3)
+        # swaps the first two basis functions and changes the sign of the third
+        self.group = [
+            (np.array([0, 1, 2]), np.array([1, 1, 1])), (np.array([1, 0, 2]), np.array([1, 1, -1]))
+        ]
+
+    def test_quartet_index_is_the_position_in_unique_quartets_of_any_permutation(self):
+        i, j, k, l = self.quartets.T
+        positions = np.arange(len(self.quartets))
+        testing.assert_array_equal(quartet_index(i, j, k, l, 3), positions)
+        testing.assert_array_equal(quartet_index(l, k, j, i, 3), positions)
+        testing.assert_array_equal(quartet_index(j, i, l, k, 3), positions)
+
+    def test_quartet_orbits_of_the_identity_are_the_quartets_themselves(self):
+        representatives, signs = quartet_orbits(self.quartets, self.group[:1], 3)
+        testing.assert_array_equal(representatives, np.arange(len(self.quartets)))
+        testing.assert_array_equal(signs, 1)
+
+    def test_quartet_orbits_sends_each_quartet_to_its_lowest_image_with_its_sign(self):
+        quartets = np.array([[1, 1, 1, 2], [0, 0, 1, 1], [1, 2, 1, 2]])
+        representatives, signs = quartet_orbits(quartets, self.group, 3)
+        expected = np.array([[0, 0, 0, 2], [0, 0, 1, 1], [0, 2, 0, 2]])
+        testing.assert_array_equal(representatives, quartet_index(*expected.T, 3))
+        testing.assert_array_equal(signs, [-1, 1, 1])
+
+    def test_quartet_orbits_gives_a_zero_sign_to_a_quartet_sent_to_minus_itself(self):
+        group = [self.group[0], (np.array([0, 1, 2]), np.array([1, 1, -1]))]
+        representatives, signs = quartet_orbits(np.array([[0, 0, 0, 2], [0, 0, 1, 1]]), group, 3)
+        testing.assert_array_equal(signs, [0, 1])
+
+    def test_unique_quartets_of_a_block_are_the_rows_of_the_block(self):
+        pairs = [(a, b) for a, b in itertools.product(range(4), repeat=2) if a <= b]
+        quartets = [bra + ket for bra, ket in itertools.product(pairs, repeat=2) if bra <= ket]
+        testing.assert_array_equal(unique_quartets(4), quartets)
+        self.assertEqual(unique_quartet_count(4), len(quartets))
+        testing.assert_array_equal(unique_quartets(4, slice(5, 17)), quartets[5:17])
+        testing.assert_array_equal(quartet_rows(quartet_index(*np.array(quartets[5:17]).T, 4), 4), quartets[5:17])
+
+    def test_unique_integrals_do_not_depend_on_the_block_size(self):
+        symmetry = MagicMock()
+        symmetry.none_zero_integrals.side_effect = lambda quartets: np.ones(len(quartets), dtype=bool)
+        two_electron_repulsion = TwoElectronRepulsion([MagicMock()] * 3, MagicMock(), symmetry, 1)
+        two_electron_repulsion.integrate_quartet = lambda i, j, k, l: 1 + i + 2 * j + 3 * k + 5 * l
+        for group in ([], self.group):
+            symmetry.signed_permutations.return_value = group
+            integrals = two_electron_repulsion.unique_integrals()
+            with patch.object(scratch_space, 'memory_budget', 8 * 32 * 5):
+                testing.assert_array_equal(two_electron_repulsion.unique_integrals(), integrals)
+            if not group:
+                expected = [two_electron_repulsion.integrate_quartet(*quartet) for quartet in self.quartets]
+                testing.assert_array_equal(integrals, expected)
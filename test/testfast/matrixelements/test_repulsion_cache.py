@@ -0,0 +1,53 @@
+import os, tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock
+from numpy import testing
+import numpy as np
+from src.factory import expand_basis_set
+from src.matrixelements import RepulsionCache
+from src.matrixelements import TwoElectronRepulsionMatrixOS
+from src.matrixelements import unique_quartets
+from src.matrixelements import unpack_repulsion
+
+
+class TestRepulsionCache(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([['S', [0.5, 2.0], [0.5, 0.6]], ['P', [0.9, 0.3]]], (0.0, 0.0, 0.0))
+        mock_symmetry = MagicMock()
+        mock_symmetry.none_zero_integrals = MagicMock(side_effect=lambda quartets: np.ones(len(quartets), dtype=bool))
+        mock_symmetry.signed_permutations = MagicMock(return_value=[(np.arange(4), np.ones(4, dtype=int))])
+        self.repulsion = TwoElectronRepulsionMatrixOS(self.basis_set_array, mock_symmetry, 1).create_repulsion_matrix()
+
+    def test_unpack_repulsion_has_the_permutational_symmetry_of_the_integrals(self):
+        values = np.arange(len(unique_quartets(3)), dtype=float)
+        repulsion = unpack_repulsion(values, 3)
+        testing.assert_array_equal(repulsion, repulsion.transpose(1, 0, 2, 3))
+        testing.assert_array_equal(repulsion, repulsion.transpose(0, 1, 3, 2))
+        testing.assert_array_equal(repulsion, repulsion.transpose(2, 3, 0, 1))
+        testing.assert_array_equal(repulsion[tuple(unique_quartets(3).T)], values)
+
+    def test_load_returns_none_when_disabled_or_not_cached(self):
+        self.assertIsNone(RepulsionCache().load(self.basis_set_array, 'OS'))
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsNone(RepulsionCache(directory).load(self.basis_set_array, 'OS'))
+
+    def test_load_returns_the_saved_repulsion_matrix(self):
+        with tempfile.TemporaryDirectory() as directory:
+            RepulsionCache(directory).save(self.basis_set_array, 'OS', self.repulsion)
+            testing.assert_array_equal(RepulsionCache(directory).load(self.basis_set_array, 'OS'), self.repulsion)
+            self.assertIsNone(RepulsionCache(directory).load(self.basis_set_array, 'HGP'))
+
+    def test_a_new_geometry_is_not_served_the_integrals_of_another(self):
+        moved = expand_basis_set([['S', [0.5, 2.0], [0.5, 0.6]], ['P', [0.9, 0.3]]], (0.0, 0.0, 0.1))
+        with tempfile.TemporaryDirectory() as directory:
+            RepulsionCache(directory).save(self.basis_set_array, 'OS', self.repulsion)
+            self.assertIsNone(RepulsionCache(directory).load(moved, 'OS'))
+
+    def test_save_evicts_the_least_recently_used_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repulsion_cache = RepulsionCache(directory, max_bytes=1000)
+            repulsion_cache.save(self.basis_set_array, 'OS', self.repulsion)
+            repulsion_cache.save(self.basis_set_array, 'HGP', self.repulsion)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertIsNotNone(repulsion_cache.load(self.basis_set_array, 'HGP'))
@@ -0,0 +1,33 @@
+import tempfile
+from unittest import TestCase
+from numpy import testing
+import numpy as np
+from src.matrixelements import ScratchSpace
+from src.matrixelements import scratch_space
+from src.matrixelements import spin_basis_anti_physicist
+
+
+class TestScratchSpace(TestCase):
+
+    def test_zeros_is_memory_mapped_only_with_a_scratch_directory(self):
+        self.assertNotIsInstance(ScratchSpace().zeros((2, 2)), np.memmap)
+        with tempfile.TemporaryDirectory() as directory:
+            tensor = ScratchSpace(directory).zeros((2, 2, 2, 2))
+            self.assertIsInstance(tensor, np.memmap)
+            testing.assert_array_equal(tensor, np.zeros((2, 2, 2, 2)))
+
+    def test_blocks_cover_every_row_within_the_memory_budget(self):
+        blocks = ScratchSpace(memory_budget=8 * 30).blocks(7, 10)
+        self.assertEqual(blocks, [slice(0, 3), slice(3, 6), slice(6, 7)])
+        self.assertEqual(ScratchSpace(memory_budget=1).blocks(2, 10), [slice(0, 1), slice(1, 2)])
+
+    def test_spin_orbital_integrals_do_not_depend_on_the_memory_budget(self):
+        repulsion = np.random.RandomState(0).rand(3, 3, 3, 3)
+        expected = spin_basis_anti_physicist(repulsion)
+        memory_budget = scratch_space.memory_budget
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                scratch_space.scratch_directory, scratch_space.memory_budget = directory, 8 * 36
+                testing.assert_allclose(spin_basis_anti_physicist(repulsion), expected)
+        finally:
+            scratch_space.scratch_directory, scratch_space.memory_budget = None, memory_budget
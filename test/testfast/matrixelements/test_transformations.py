@@ -0,0 +1,34 @@
+from unittest import TestCase
+from numpy import testing
+import numpy as np
+from src.factory import expand_basis_set
+from src.matrixelements import OrbitalOverlapMatrix
+from src.matrixelements import spherical_repulsion
+from src.matrixelements import spherical_transformation
+
+
+class TestSphericalTransformation(TestCase):
+
+    def setUp(self):
+        self.basis_set_array = expand_basis_set([
+            ['S', [1.0, 0.3]], ['P', [1.0, 0.5]], ['D', [0.6, 1.2], [0.4, 0.4]], ['F', [1.0, 0.855]]
+        ], (0.0, 0.0, 0.0))
+        self.orbital_overlap = OrbitalOverlapMatrix(self.basis_set_array).create()
+
+    def test_spherical_transformation_keeps_s_and_p_and_makes_five_d_and_seven_f_functions(self):
+        transformation = spherical_transformation(self.basis_set_array, self.orbital_overlap)
+        self.assertEqual(transformation.shape, (20, 16))
+        testing.assert_array_equal(transformation[:4, :4], np.identity(4))
+
+    def test_spherical_functions_are_orthonormal_within_each_shell(self):
+        transformation = spherical_transformation(self.basis_set_array, self.orbital_overlap)
+        overlap = transformation.T @ self.orbital_overlap @ transformation
+        testing.assert_allclose(overlap[4:9, 4:9], np.identity(5), atol=1e-12)
+        testing.assert_allclose(overlap[9:, 9:], np.identity(7), atol=1e-12)
+
+    def test_spherical_repulsion_transforms_every_index(self):
+        repulsion = np.random.RandomState(0).rand(3, 3, 3, 3)
+        transformation = np.random.RandomState(1).rand(3, 2)
+        expected = np.einsum('pqrs,pi,qj,rk,sl->ijkl', repulsion, transformation, transformation, transformation,
+        transformation)
+        testing.assert_allclose(spherical_repulsion(repulsion, transformation), expected)
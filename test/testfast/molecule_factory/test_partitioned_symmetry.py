@@ -0,0 +1,43 @@
+from unittest import TestCase
+from numpy import testing
+from src.common import read_mol_file
+from src.factory import MoleculeFactory
+from src.factory import SymmetryFactory
+
+
+class TestPartitionedSymmetry(TestCase):
+
+    def setUp(self):
+        self.molecule_factory = MoleculeFactory(symmetry=True)
+        self.symmetry_factory = SymmetryFactory()
+
+    def symmetry_operations(self, mol_file):
+        nuclei_array = self.molecule_factory.center_molecule(read_mol_file(mol_file)[0])
+        brute_force = self.symmetry_factory.brute_force_symmetry(nuclei_array)
+        partitioned = self.symmetry_factory.partitioned_symmetry(nuclei_array)
+        return brute_force, partitioned
+
+    def test_equivalent_sets_split_the_nuclei_by_charge_and_distance_from_the_centre(self):
+        nuclei_array = self.molecule_factory.center_molecule(read_mol_file('CH4.mol')[0])
+        equivalent_sets = self.symmetry_factory.equivalent_sets(nuclei_array)
+        self.assertEqual(sorted(len(indices) for indices in equivalent_sets), [1, 4])
+
+    def test_partitioned_symmetry_finds_the_rotations_of_brute_force_symmetry(self):
+        for mol_file in ('H2O.mol', 'C2H4.mol', 'CH4.mol', 'N2O.mol'):
+            brute_force, partitioned = self.symmetry_operations(mol_file)
+            testing.assert_array_equal(
+                sorted(rotation.fold for rotation in partitioned[0]), sorted(rotation.fold for rotation in brute_force[0])
+            )
+
+    def test_partitioned_symmetry_finds_the_reflections_and_inversion_of_brute_force_symmetry(self):
+        for mol_file in ('H2O.mol', 'C2H4.mol', 'CH4.mol', 'HOF.mol'):
+            brute_force, partitioned = self.symmetry_operations(mol_file)
+            self.assertEqual(len(partitioned[1]), len(brute_force[1]))
+            self.assertEqual(len(partitioned[3]), len(brute_force[3]))
+
+    def test_partitioned_symmetry_finds_the_icosahedral_operations_of_c60(self):
+        nuclei_array = self.molecule_factory.center_molecule(read_mol_file('C60.mol')[0])
+        rotation, reflection, improper, inversion = self.symmetry_factory.partitioned_symmetry(nuclei_array)
+        self.assertEqual(sorted(r.fold for r in rotation), [2] * 15 + [3] * 10 + [5] * 6)
+        self.assertEqual(len(reflection), 15)
+        self.assertEqual(len(inversion), 1)
@@ -0,0 +1,57 @@
+import pickle, tempfile
+from unittest import TestCase
+from src.objects import Basis, BasisSet, PrimitiveBasis
+
+
+class TestBasisSet(TestCase):
+
+    def setUp(self):
+        s = Basis([
+            PrimitiveBasis(0.15432897, 3.42525091, (0.0, 0.0, 0.7316), (0, 0, 0)),
+            PrimitiveBasis(0.53532814, 0.62391373, (0.0, 0.0, 0.7316), (0, 0, 0)),
+            PrimitiveBasis(0.44463454, 0.16885540, (0.0, 0.0, 0.7316), (0, 0, 0))
+        ], (0.0, 0.0, 0.7316), (0, 0, 0))
+        p = Basis([
+            PrimitiveBasis(0.15591627, 2.9412494, (0.0, 0.0, -0.7316), (0, 1, 0)),
+            PrimitiveBasis(0.60768372, 0.6834831, (0.0, 0.0, -0.7316), (0, 1, 0))
+        ], (0.0, 0.0, -0.7316), (0, 1, 0))
+        self.basis_array = [s, p]
+        self.basis_set = BasisSet(self.basis_array)
+
+    def assert_same_basis(self, basis, expected):
+        self.assertEqual(basis.coordinates, expected.coordinates)
+        self.assertEqual(basis.integral_exponents, expected.integral_exponents)
+        self.assertAlmostEqual(basis.normalisation, expected.normalisation)
+        self.assertEqual(len(basis.primitive_gaussian_array), len(expected.primitive_gaussian_array))
+        for primitive, expected_primitive in zip(basis.primitive_gaussian_array, expected.primitive_gaussian_array):
+            self.assertEqual(primitive.exponent, expected_primitive.exponent)
+            self.assertEqual(primitive.contraction, expected_primitive.contraction)
+            self.assertAlmostEqual(primitive.normalisation, expected_primitive.normalisation)
+
+    def test_basis_set_returns_the_same_basis_functions(self):
+        self.assertEqual(len(self.basis_set), 2)
+        for basis, expected in zip(self.basis_set, self.basis_array):
+            self.assert_same_basis(basis, expected)
+        self.assert_same_basis(self.basis_set[-1], self.basis_array[1])
+
+    def test_basis_set_stores_the_primitives_contiguously(self):
+        self.assertEqual(list(self.basis_set.offsets), [0, 3, 5])
+        self.assertEqual(self.basis_set.exponents.shape, (5,))
+        self.assertEqual(self.basis_set.centres.shape, (2, 3))
+
+    def test_basis_set_pickles_without_the_basis_objects(self):
+        self.basis_set[0]
+        basis_set = pickle.loads(pickle.dumps(self.basis_set))
+        self.assertEqual(basis_set.basis_memo, {})
+        self.assert_same_basis(basis_set[0], self.basis_array[0])
+
+    def test_basis_set_can_be_loaded_as_a_memory_map(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.basis_set.save(directory)
+            basis_set = BasisSet.load(directory)
+            for basis, expected in zip(basis_set, self.basis_array):
+                self.assert_same_basis(basis, expected)
+            del basis_set
+
+    def test_basis_set_raises_index_error_out_of_range(self):
+        self.assertRaises(IndexError, self.basis_set.__getitem__, 2)
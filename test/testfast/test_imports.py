@@ -0,0 +1,22 @@
+import json, os, subprocess, sys
+from unittest import TestCase
+
+
+class TestImports(TestCase):
+
+    def imported_modules(self, module):
+        script = 'import json, sys; import {}; print(json.dumps(sorted(sys.modules)))'.format(module)
+        root = os.path.dirname(os.path.realpath(__file__)) + '/../../'
+        output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, check=True).stdout
+        return json.loads(output)
+
+    def test_importing_main_does_not_load_the_method_specific_modules(self):
+        lazy = [
+            'quadpy', 'scipy', 'concurrent.futures', 'src.batch', 'src.coupledcluster', 'src.geometryoptimization',
+            'src.gradient', 'src.kohnsham', 'src.moellerplesset', 'src.tdhartreefock'
+        ]
+        loaded = [
+            module for module in self.imported_modules('src.main')
+            if any(module == name or module.startswith(name + '.') for name in lazy)
+        ]
+        self.assertEqual(loaded, [])
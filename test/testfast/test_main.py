@@ -1,8 +1,20 @@
+import os, tempfile
 from unittest import TestCase
+from unittest.mock import patch
 
 from numpy import testing
 
+from src.common import logger
+from src.common.logger import QUIET
+from src.common.logger import SUMMARY
+from src.geometryoptimization import NelderMead
+from src.hartreefock import RestrictedSCF
+from src.integrals import integral_autotuner
+from src.main import main
 from src.main import start
+from src.matrixelements import checkpoint
+from src.matrixelements import repulsion_cache
+from src.matrixelements import scratch_space
 
 
 class TestMain(TestCase):
@@ -14,3 +26,68 @@ class TestMain(TestCase):
     def test_total_rhf_energy_of_heh_cation_for_the_6_311_plus_g_star_star_basis_set(self):
         total_energy = start('HeH+.mol', '6-311+GPP.gbs', 'RHF', 1)
         testing.assert_approx_equal(total_energy, -2.92922773384, 6)
+
+    def test_checkpoint_options_do_not_carry_over_to_the_next_calculation(self):
+        with tempfile.TemporaryDirectory() as directory, logger.quiet():
+            checkpoint_file = os.path.join(directory, 'HeH+.npz')
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, checkpoint_file=checkpoint_file, checkpoint_interval=2)
+            self.assertTrue(os.path.isfile(checkpoint_file))
+            self.assertIsNone(checkpoint.checkpoint_file)
+            self.assertEqual((checkpoint.restart, checkpoint.interval), (False, 1))
+            total_energy = start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, restart=True)
+            testing.assert_approx_equal(total_energy, -2.84183608212, 6)
+            self.assertIsNone(checkpoint.load('scf'))
+
+    def test_checkpoint_of_a_calculation_with_other_options_is_not_resumed(self):
+        begin_iterations = RestrictedSCF.begin_iterations
+        with tempfile.TemporaryDirectory() as directory, logger.quiet(), \
+        patch.object(RestrictedSCF, 'begin_iterations', autospec=True, side_effect=begin_iterations) as iterations:
+            checkpoint_file = os.path.join(directory, 'HeH+.npz')
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, checkpoint_file=checkpoint_file)
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, checkpoint_file=checkpoint_file, restart=True)
+            self.assertEqual(iterations.call_count, 1)
+            for options in ({'spherical': True}, {'fock_rebuild_interval': 4}):
+                total_energy = start(
+                    'HeH+.mol', 'STO-3G.gbs', 'RHF', 1, checkpoint_file=checkpoint_file, restart=True, **options
+                )
+                testing.assert_approx_equal(total_energy, -2.84183608212, 6)
+            self.assertEqual(iterations.call_count, 3)
+
+    def test_cache_directory_does_not_carry_over_to_the_next_calculation(self):
+        with tempfile.TemporaryDirectory() as directory, logger.quiet():
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, cache_directory=directory)
+            self.assertTrue(os.listdir(directory))
+        self.assertIsNone(repulsion_cache.cache_directory)
+
+    def test_scratch_space_options_do_not_carry_over_to_the_next_calculation(self):
+        memory_budget = scratch_space.memory_budget
+        with tempfile.TemporaryDirectory() as directory, logger.quiet():
+            total_energy = start('H2O.mol', 'STO-3G.gbs', 'MP2', 1, scratch_directory=directory, memory_budget=2**10)
+        testing.assert_approx_equal(total_energy, -74.9912295644, 8)
+        self.assertIsNone(scratch_space.scratch_directory)
+        self.assertEqual(scratch_space.memory_budget, memory_budget)
+
+    def test_logger_options_do_not_carry_over_to_the_next_calculation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results_file = os.path.join(directory, 'results.jsonl')
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, verbosity=QUIET, results_file=results_file)
+            self.assertTrue(os.path.isfile(results_file))
+        self.assertEqual(logger.verbosity, SUMMARY)
+        self.assertIsNone(logger.results_file)
+
+    def test_integral_engines_are_only_tuned_when_asked(self):
+        with patch.object(integral_autotuner, 'tune', wraps=integral_autotuner.tune) as tune, logger.quiet():
+            start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1)
+            tune.assert_not_called()
+            total_energy = start('HeH+.mol', 'STO-3G.gbs', 'RHF', 1, integral_engine='auto')
+            tune.assert_called_once()
+        testing.assert_approx_equal(total_energy, -2.84183608212, 6)
+
+    def test_geometry_optimization_evaluates_the_simplex_on_the_processors(self):
+        with patch.object(NelderMead, 'optimize', autospec=True, side_effect=lambda self: self.energy_pool.processes):
+            self.assertEqual(start('HeH+.mol', 'STO-3G.gbs', 'RHF', 2, geometry_optimization='NelderMead'), 2)
+
+    def test_intervals_of_less_than_one_are_rejected_on_the_command_line(self):
+        for option in ('--fock-rebuild-interval', '--checkpoint-interval'):
+            with self.assertRaises(SystemExit), patch('sys.stderr'):
+                main(['HeH+.mol', 'STO-3G.gbs', 'RHF', option, '0'])